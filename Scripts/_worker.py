@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Script runner kept alive by photo_manager.py.
+Reads {"script": ..., "args": [...]} lines from the command pipe and runs each script
+as __main__ in a forked copy of this process, so the interpreter and the modules most
+scripts import are already loaded. Each run gets a fresh copy, so scripts can't leave
+state behind for the next one. Replies {"rc": exit code} on the reply pipe.
+
+Usage: _worker.py COMMAND_FD REPLY_FD
+"""
+
+import json
+import os
+import runpy
+import signal
+import sys
+
+# Imported here once rather than by every script
+import argparse
+import sqlite3
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+current_child = None
+
+def stop(signum, frame):
+    """Take the running script down with the worker."""
+    if current_child is not None:
+        os.kill(current_child, signal.SIGTERM)
+    os._exit(1)
+
+def main():
+    global current_child
+    commands = os.fdopen(int(sys.argv[1]))
+    replies = os.fdopen(int(sys.argv[2]), 'w')
+
+    # Ctrl+C is for the running script, which gets it from the terminal too
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, stop)
+
+    for line in commands:
+        msg = json.loads(line)
+        pid = os.fork()
+        if pid == 0:
+            # The child is the script's process: it runs it the way `python script
+            # args` would, and exits the same way, exceptions and sys.exit included
+            commands.close()
+            replies.close()
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            sys.argv = [msg["script"]] + msg["args"]
+            sys.path[0] = os.path.dirname(os.path.abspath(msg["script"]))
+            runpy.run_path(msg["script"], run_name="__main__")
+            sys.exit(0)
+
+        current_child = pid
+        _, status = os.waitpid(pid, 0)
+        current_child = None
+        replies.write(json.dumps({"rc": os.waitstatus_to_exitcode(status)}) + "\n")
+        replies.flush()
+
+if __name__ == "__main__":
+    main()
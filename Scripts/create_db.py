@@ -28,6 +28,7 @@ def create_database(db_path=None):
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             path TEXT UNIQUE NOT NULL,
             filename TEXT NOT NULL,
+            file_ext TEXT,  -- Lowercase extension without the dot, e.g. 'nef'
             file_size INTEGER,
             file_hash TEXT,
             last_modified DATETIME,
@@ -80,6 +81,9 @@ def create_database(db_path=None):
             -- RAW file proxy tracking
             raw_proxy_type TEXT,  -- 'original_jpg', 'custom_generated', 'none'
             raw_processing_settings TEXT,  -- JSON blob for RawTherapee settings
+            raw_proxy_src_mtime REAL,  -- Source RAW mtime when the custom proxy was rendered
+            raw_proxy_src_size INTEGER,  -- Source RAW size when the custom proxy was rendered
+            raw_proxy_preset_hash TEXT,  -- Hash of presets/quality used for the custom proxy
             
             -- File type and video-specific fields
             file_type TEXT DEFAULT 'image',  -- 'image' or 'video'
@@ -177,6 +181,31 @@ def create_database(db_path=None):
         )
     ''')
     
+    # Last generated thumbnail per image, so up-to-date checks need a single stat
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS thumbnails (
+            image_id INTEGER PRIMARY KEY,
+            source_path TEXT,
+            source_mtime REAL,
+            thumb_mtime REAL,
+            source_key TEXT
+        )
+    ''')
+    
+    # Last generated video proxy per video, so up-to-date checks and stats need no directory scan
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS video_proxies (
+            image_id INTEGER PRIMARY KEY,
+            source_mtime REAL,
+            proxy_mtime REAL,
+            proxy_size INTEGER,
+            lut_fingerprint TEXT,
+            probe_info TEXT,
+            correction_lut TEXT,
+            style_lut TEXT
+        )
+    ''')
+    
     # Create indexes for performance
     indexes = [
         "CREATE INDEX IF NOT EXISTS idx_images_path ON images(path)",
@@ -194,6 +223,14 @@ def create_database(db_path=None):
     for index_sql in indexes:
         cursor.execute(index_sql)
     
+    # Add file extension column (indexed for RAW file lookups)
+    try:
+        cursor.execute("ALTER TABLE images ADD COLUMN file_ext TEXT")
+        print("Added file_ext column to existing database")
+    except sqlite3.OperationalError:
+        pass
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_file_ext ON images(file_ext)")
+    
     # Add column migration for existing databases
     try:
         cursor.execute("ALTER TABLE images ADD COLUMN film_mode TEXT")
@@ -215,6 +252,15 @@ def create_database(db_path=None):
     except sqlite3.OperationalError:
         pass
     
+    for column_name, column_type in [("raw_proxy_src_mtime", "REAL"),
+                                     ("raw_proxy_src_size", "INTEGER"),
+                                     ("raw_proxy_preset_hash", "TEXT")]:
+        try:
+            cursor.execute(f"ALTER TABLE images ADD COLUMN {column_name} {column_type}")
+            print(f"Added {column_name} column to existing database")
+        except sqlite3.OperationalError:
+            pass
+    
     # Add ignored column to faces table for existing databases
     try:
         cursor.execute("ALTER TABLE faces ADD COLUMN ignored INTEGER DEFAULT 0")
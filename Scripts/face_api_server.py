@@ -935,8 +935,9 @@ class FaceAPIHandler(BaseHTTPRequestHandler):
                 script_path = "Scripts/generate_raw_proxies.py"
                 working_dir = "."
             
-            # Build command to generate custom proxy for specific image
-            cmd = [sys.executable, script_path, "--image-id", str(image_id), "--force", "--quality", str(quality), "--exposure", str(exposure)]
+            # Build command to generate custom proxy for specific image. No --force: the
+            # script re-renders unless the RAW and the preset stack match the current proxy
+            cmd = [sys.executable, script_path, "--image-id", str(image_id), "--quality", str(quality), "--exposure", str(exposure)]
             
             # Add camera standard - always pass one to ensure our modified presets are used
             if camera_standard:
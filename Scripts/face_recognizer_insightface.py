@@ -8,6 +8,9 @@ import numpy as np
 import cv2
 import os
 import argparse
+import io
+import sys
+from contextlib import redirect_stdout
 from datetime import datetime
 import json
 from pathlib import Path
@@ -23,7 +26,7 @@ except ImportError as e:
     INSIGHTFACE_AVAILABLE = False
 
 class InsightFaceRecognizer:
-    def __init__(self, db_path=None):
+    def __init__(self, db_path=None, device="cpu"):
         if db_path is None:
             # Auto-detect database location
             from pathlib import Path
@@ -34,12 +37,18 @@ class InsightFaceRecognizer:
                 db_path = "Scripts/image_metadata.db"  # Scripts subdirectory
         
         self.db_path = db_path
+        self.device = device
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
         
         if INSIGHTFACE_AVAILABLE:
-            # Initialize InsightFace model
-            self.app = insightface.app.FaceAnalysis(providers=['CPUExecutionProvider'])
+            # Initialize InsightFace model; with CUDA, onnxruntime still falls back to
+            # the CPU for anything the GPU provider can't run
+            if device == "cuda":
+                providers = ['CUDAExecutionProvider', 'CPUExecutionProvider']
+            else:
+                providers = ['CPUExecutionProvider']
+            self.app = insightface.app.FaceAnalysis(providers=providers)
             self.app.prepare(ctx_id=0, det_size=(640, 640))
         else:
             self.app = None
@@ -582,7 +591,19 @@ class InsightFaceRecognizer:
         print(f"📝 {faces_to_clear} faces unassigned (detection data preserved)")
         print("✅ Face embeddings kept for future clustering")
 
-def main():
+def saved_settings():
+    """Clustering settings saved by photo_manager.py, as defaults for the parser."""
+    base = ".." if Path.cwd().name == "Scripts" else "."
+    try:
+        with open(Path(base) / "JSON" / "face_clustering.json") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    names = {'eps': 'eps', 'min_samples': 'min_samples', 'similarity_threshold': 'similarity',
+             'min_samples_new': 'min_samples_new', 'max_iterations': 'max_iterations'}
+    return {dest: saved[key] for key, dest in names.items() if key in saved}
+
+def build_parser():
     parser = argparse.ArgumentParser(description='Face recognition using InsightFace')
     parser.add_argument('--db', help='Database file path (auto-detected if not specified)')
     parser.add_argument('--clear', action='store_true', help='Clear all MediaPipe face data to start fresh')
@@ -598,16 +619,14 @@ def main():
     parser.add_argument('--similarity', type=float, default=0.6, help='Similarity threshold for incremental clustering')
     parser.add_argument('--min-samples-new', type=int, default=30, help='Minimum faces required to create new people in incremental clustering')
     parser.add_argument('--max-iterations', type=int, default=10, help='Maximum iterations for cluster-new-loop')
-    
-    args = parser.parse_args()
-    
-    if not INSIGHTFACE_AVAILABLE:
-        print("❌ InsightFace libraries are required")
-        print("Install with: python3 -m pip install insightface")
-        return 1
-    
-    recognizer = InsightFaceRecognizer(args.db)
-    
+    parser.add_argument('--device', choices=['cpu', 'cuda'], default='cpu', help='Run face detection and embedding on the CPU or an NVIDIA GPU (needs onnxruntime-gpu)')
+    parser.add_argument('--daemon', action='store_true', help='Keep the model loaded and run commands read from stdin (used by photo_manager.py)')
+    # Options not given on the command line take the saved settings, if any
+    parser.set_defaults(**saved_settings())
+    return parser
+
+def run_command(recognizer, args, parser):
+    """Run the action selected by parsed command-line args; returns an exit code."""
     if args.clear:
         recognizer.clear_mediapipe_data()
     elif args.extract:
@@ -644,6 +663,58 @@ def main():
         recognizer.delete_unconfirmed_people()
     else:
         parser.print_help()
+    return 0
+
+def serve(parser):
+    """Daemon mode: answer {"args": [...]} lines on stdin with {"rc": N} lines on stdout.
+    
+    The recognizer, and with it the InsightFace model, stays loaded between commands;
+    it is only recreated when a command asks for a different database or device.
+    Output goes to stderr so stdout carries nothing but replies. A request with
+    "capture": true gets the command's own output back as the reply's "output" instead.
+    """
+    replies = sys.stdout
+    recognizer = None
+    for line in sys.stdin:
+        request = json.loads(line)
+        out = io.StringIO() if request.get("capture") else sys.stderr
+        with redirect_stdout(sys.stderr):
+            try:
+                # Settings may have been saved since the last command
+                parser.set_defaults(**saved_settings())
+                args = parser.parse_args(request["args"])
+                if recognizer is None or (recognizer.db_path, recognizer.device) != (args.db or recognizer.db_path, args.device):
+                    recognizer = None  # Close the old connection before opening another
+                    recognizer = InsightFaceRecognizer(args.db, device=args.device)
+                with redirect_stdout(out):
+                    rc = run_command(recognizer, args, parser)
+            except SystemExit as e:
+                # argparse rejected the arguments
+                rc = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                print(f"❌ {e}")
+                rc = 1
+        reply = {"rc": rc or 0}
+        if out is not sys.stderr:
+            reply["output"] = out.getvalue()
+        replies.write(json.dumps(reply) + "\n")
+        replies.flush()
+    return 0
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    
+    if not INSIGHTFACE_AVAILABLE:
+        print("❌ InsightFace libraries are required")
+        print("Install with: python3 -m pip install insightface")
+        return 1
+    
+    if args.daemon:
+        return serve(parser)
+    
+    recognizer = InsightFaceRecognizer(args.db, device=args.device)
+    return run_command(recognizer, args, parser)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -9,6 +9,7 @@ import sqlite3
 import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import subprocess
 from PIL import Image
@@ -55,8 +56,11 @@ def proxy_exists(image_id, proxy_dir):
     proxy_path = proxy_dir / f"{image_id}.webp"
     return proxy_path.exists()
 
-def convert_heic_to_webp(source_path, output_path):
-    """Convert HEIC file to WebP using ImageMagick (magick) or fallback to sips+PIL."""
+def convert_heic_to_webp(source_path, output_path, log=print):
+    """Convert HEIC file to WebP using ImageMagick (magick) or fallback to sips+PIL.
+    
+    Warnings go to log, so parallel conversions can collect them per file.
+    """
     try:
         # Try ImageMagick first (better quality and EXIF handling)
         result = subprocess.run([
@@ -69,10 +73,10 @@ def convert_heic_to_webp(source_path, output_path):
         if result.returncode == 0:
             return True, "ImageMagick"
         else:
-            print(f"   ⚠️ ImageMagick failed: {result.stderr}")
+            log(f"   ⚠️ ImageMagick failed: {result.stderr}")
             
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        print(f"   ⚠️ ImageMagick not available or timeout")
+        log(f"   ⚠️ ImageMagick not available or timeout")
     
     try:
         # Fallback to macOS sips command -> temp JPEG -> PIL -> WebP
@@ -127,10 +131,10 @@ def convert_heic_to_webp(source_path, output_path):
         else:
             if os.path.exists(temp_jpg_path):
                 os.unlink(temp_jpg_path)
-            print(f"   ⚠️ sips failed: {result.stderr}")
+            log(f"   ⚠️ sips failed: {result.stderr}")
             
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        print(f"   ⚠️ sips not available or timeout")
+        log(f"   ⚠️ sips not available or timeout")
     
     try:
         # Final fallback to Python PIL (may have orientation issues)
@@ -165,11 +169,28 @@ def convert_heic_to_webp(source_path, output_path):
             return True, "PIL"
             
     except Exception as e:
-        print(f"   ❌ PIL conversion failed: {e}")
+        log(f"   ❌ PIL conversion failed: {e}")
         return False, str(e)
     
     return False, "All conversion methods failed"
 
+def convert_one(source_path, output_path):
+    """Convert one HEIC file; returns (converted, message lines) for the caller to print."""
+    lines = [f"   🔄 Converting to {output_path.name}..."]
+    success, method = convert_heic_to_webp(source_path, output_path, log=lines.append)
+    
+    if success:
+        # Verify the output file was created and has reasonable size
+        if output_path.exists() and output_path.stat().st_size > 1000:
+            lines.append(f"   ✅ Converted using {method} ({output_path.stat().st_size // 1024} KB)")
+            return True, lines
+        lines.append(f"   ❌ Output file invalid or too small")
+        if output_path.exists():
+            output_path.unlink()  # Remove invalid file
+    else:
+        lines.append(f"   ❌ Conversion failed: {method}")
+    return False, lines
+
 def clean_orphaned_proxies():
     """Remove proxy files for images no longer in database."""
     proxy_dir = setup_proxy_directory()
@@ -211,6 +232,8 @@ def main():
     parser = argparse.ArgumentParser(description='Generate WebP proxies from HEIC files')
     parser.add_argument('--clean', action='store_true', 
                         help='Clean up orphaned proxy files (remove proxies for images no longer in database)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Files to convert at once (default: CPU cores)')
     args = parser.parse_args()
     
     if args.clean:
@@ -253,44 +276,42 @@ def main():
     skipped_count = 0
     error_count = 0
     
+    # Checks happen here; conversions (mostly ImageMagick subprocesses) run on a
+    # thread pool, and each file's messages are printed together, in order
+    jobs = []
     for row in heic_files:
         image_id = row['id']
         source_path = Path(row['path'])
         filename = row['filename']
         
-        print(f"\n📷 Processing ID {image_id}: {filename}")
-        
         # Check if source file exists
         if not source_path.exists():
+            print(f"\n📷 Processing ID {image_id}: {filename}")
             print(f"   ⚠️ Source file not found: {source_path}")
             error_count += 1
             continue
         
         # Check if proxy already exists
         if proxy_exists(image_id, proxy_dir):
+            print(f"\n📷 Processing ID {image_id}: {filename}")
             print(f"   ⏭️ Proxy already exists: {image_id}.webp")
             skipped_count += 1
             continue
         
-        # Convert to WebP
-        output_path = proxy_dir / f"{image_id}.webp"
-        print(f"   🔄 Converting to {output_path.name}...")
-        
-        success, method = convert_heic_to_webp(source_path, output_path)
-        
-        if success:
-            # Verify the output file was created and has reasonable size
-            if output_path.exists() and output_path.stat().st_size > 1000:
-                print(f"   ✅ Converted using {method} ({output_path.stat().st_size // 1024} KB)")
+        jobs.append((image_id, filename, source_path, proxy_dir / f"{image_id}.webp"))
+    
+    workers = max(1, min(args.workers, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(convert_one, source_path, output_path)
+                   for _, _, source_path, output_path in jobs]
+        for (image_id, filename, _, _), future in zip(jobs, futures):
+            converted, lines = future.result()
+            print(f"\n📷 Processing ID {image_id}: {filename}")
+            print("\n".join(lines))
+            if converted:
                 converted_count += 1
             else:
-                print(f"   ❌ Output file invalid or too small")
-                if output_path.exists():
-                    output_path.unlink()  # Remove invalid file
                 error_count += 1
-        else:
-            print(f"   ❌ Conversion failed: {method}")
-            error_count += 1
     
     # Summary
     print(f"\n🎉 Conversion complete!")
@@ -9,11 +9,30 @@ import sqlite3
 import os
 import sys
 import argparse
+import hashlib
+import logging
 import tempfile
 import shutil
+import signal
+import threading
+import itertools
+import collections
+import multiprocessing
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Optional
 import subprocess
 
+# Use orjson's C encoder for processing_settings when available
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    import json
+    _dumps = json.dumps
+
 # Configuration - auto-detect paths based on current directory
 if os.path.basename(os.getcwd()) == "Scripts":
     # Running from Scripts directory
@@ -26,13 +45,64 @@ else:
 
 # RAW file extensions supported
 RAW_EXTENSIONS = {'.cr2', '.cr3', '.nef', '.arw', '.dng', '.raf', '.orf', '.rw2', '.raw'}
+RAW_EXTENSIONS_PARAMS = sorted(ext[1:] for ext in RAW_EXTENSIONS)  # Matches images.file_ext
+RAW_EXTENSIONS_SQL = ",".join("?" * len(RAW_EXTENSIONS_PARAMS))
 
 # RawTherapee CLI settings for high quality
 RAWTHERAPEE_QUALITY = 98  # Higher JPEG quality
 RAWTHERAPEE_CHROMA_SUBSAMPLING = 3  # Best quality (4:4:4)
 RAWTHERAPEE_TIMEOUT = 300  # 5 minutes per file (more time for quality processing)
+RAWTHERAPEE_BATCH_SIZE = 500  # Max files per rawtherapee-cli run (long runs leak memory)
+DB_FETCH_SIZE = 2000  # RAW rows read from the database per dispatch round
+MAX_IN_FLIGHT_CHUNKS = 2  # Chunks handed to the pool before waiting on results (bounds memory)
 DEFAULT_CAMERA_STANDARD = "RawTherapee Presets/Standard_D7200.pp3"  # Default camera standard
-DEFAULT_STYLE_PRESET = None  # No default style preset - camera standard only
+
+# Map camera models to standard profiles
+# Regular versions: tone curve/look table disabled (for film sim use)
+# Full versions: tone curve/look table enabled (for camera-only use)
+_CAMERA_MAP_REG = {
+    'D7200': 'Standard_D7200.pp3',
+    'A7C': 'Standard_A7C.pp3',
+    'LX100': 'Standard_LX100.pp3',
+    'X-E4': 'Standard_XE4.pp3',
+    'ILCE-6500': 'Standard_A6500.pp3',
+    'ILCE-7C': 'Standard_A7C.pp3',  # Sony A7C full model name
+    'DMC-LX100': 'Standard_LX100.pp3',  # Panasonic LX100 full model name
+}
+_CAMERA_MAP_FULL = {key: standard.replace('.pp3', '_Full.pp3') for key, standard in _CAMERA_MAP_REG.items()}
+
+# processing_settings recorded for proxies; only the custom presets vary per file
+ADJACENT_PROCESSING_SETTINGS = _dumps({
+    "quality": RAWTHERAPEE_QUALITY,
+    "chroma_subsampling": RAWTHERAPEE_CHROMA_SUBSAMPLING,
+    "method": "rawtherapee-cli-adjacent-hq",
+    "lens_correction": True
+})
+_CUSTOM_SETTINGS_BASE = {
+    "chroma_subsampling": RAWTHERAPEE_CHROMA_SUBSAMPLING,
+    "method": "rawtherapee-cli",
+    "generated_on_demand": True
+}
+
+# Per-file progress goes through this logger so --quiet can skip it cheaply
+logger = logging.getLogger("generate_raw_proxies")
+
+# Per-file outcomes reported by worker processes
+STATUS_CONVERTED = "converted"
+STATUS_ADJACENT = "adjacent"
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+def setup_logging(level=logging.INFO):
+    """Send per-file log messages to stdout as bare lines, like the rest of the output.
+    
+    Also used as the worker pool initializer, since spawned workers don't inherit it.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
 
 def setup_proxy_directory():
     """Create the RAW Proxies directory if it doesn't exist."""
@@ -41,49 +111,68 @@ def setup_proxy_directory():
     return proxy_path
 
 def get_raw_files_from_db(image_id=None):
-    """Get RAW files from database that need proxies."""
+    """Get RAW files from database that need proxies.
+    
+    Returns (conn, cursor) so callers can stream rows instead of loading the
+    whole library into memory; the caller closes the connection.
+    """
     conn = sqlite3.connect(DB_FILE)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
     if image_id:
-        # Get specific image by ID
+        # Get specific image by ID, with the fingerprint of its current custom proxy
         cursor.execute("""
-            SELECT id, path, filename 
+            SELECT id, path, filename, camera_make, camera_model, raw_proxy_type,
+                   raw_proxy_src_mtime, raw_proxy_src_size, raw_proxy_preset_hash
             FROM images 
             WHERE id = ?
             AND path IS NOT NULL
         """, (image_id,))
     else:
-        # Find all RAW files by extension
-        raw_extensions_sql = " OR ".join([f"UPPER(filename) LIKE '%.{ext[1:].upper()}'" for ext in RAW_EXTENSIONS])
+        # Find all RAW files by extension (indexed file_ext column, see ensure_schema)
         cursor.execute(f"""
-            SELECT id, path, filename 
+            SELECT id, path, filename, camera_make, camera_model
             FROM images 
-            WHERE ({raw_extensions_sql})
+            WHERE file_ext IN ({RAW_EXTENSIONS_SQL})
             AND path IS NOT NULL
             ORDER BY id
-        """)
+        """, RAW_EXTENSIONS_PARAMS)
     
-    results = cursor.fetchall()
-    conn.close()
-    return results
+    return conn, cursor
 
 def proxy_exists(image_id, proxy_dir):
     """Check if JPG proxy already exists for this image ID."""
-    proxy_path = proxy_dir / f"{image_id}.jpg"
-    return proxy_path.exists()
-
-def has_adjacent_jpg(raw_path):
-    """Check if there's an adjacent JPG file (same name, different extension)."""
-    raw_path = Path(raw_path)
-    jpg_path = raw_path.with_suffix('.jpg')
-    jpeg_path = raw_path.with_suffix('.jpeg')
-    JPG_path = raw_path.with_suffix('.JPG')
-    JPEG_path = raw_path.with_suffix('.JPEG')
-    
-    for potential_jpg in [jpg_path, jpeg_path, JPG_path, JPEG_path]:
-        if potential_jpg.exists():
+    return os.path.isfile(os.path.join(proxy_dir, f"{image_id}.jpg"))
+
+def list_directory(directory, cache):
+    """Return the set of filenames in a directory, scanning each directory only once."""
+    names = cache.get(directory)
+    if names is None:
+        try:
+            with os.scandir(directory) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            names = set()
+        cache[directory] = names
+    return names
+
+def has_adjacent_jpg(raw_path, dir_names=None):
+    """Check if there's an adjacent JPG file (same name, different extension).
+    
+    If dir_names (the filenames in the RAW's directory) is given, membership
+    is checked against it instead of stat'ing each candidate.
+    
+    Returns the adjacent JPG path as a string, or None.
+    """
+    stem = os.path.splitext(os.fspath(raw_path))[0]
+    
+    for suffix in ('.jpg', '.jpeg', '.JPG', '.JPEG'):
+        potential_jpg = stem + suffix
+        if dir_names is not None:
+            if os.path.basename(potential_jpg) in dir_names:
+                return potential_jpg
+        elif os.path.isfile(potential_jpg):
             return potential_jpg
     return None
 
@@ -97,159 +186,214 @@ def check_rawtherapee_cli():
     except (subprocess.TimeoutExpired, FileNotFoundError):
         return False
 
-def get_camera_standard_from_exif(image_id, use_full_version=False):
-    """Get appropriate camera standard based on EXIF data from database.
+@lru_cache(maxsize=None)
+def resolved_preset(preset) -> Optional[Path]:
+    """Resolve a preset path once per process; returns None if the preset doesn't exist."""
+    preset_path = Path(preset)
+    if not preset_path.exists():
+        return None
+    return preset_path.resolve()
+
+@lru_cache(maxsize=None)
+def pick_camera_standard(camera_make, camera_model, use_full_version=False):
+    """Get appropriate camera standard from the image's EXIF camera make/model.
+    
+    Returns the absolute preset path as a string, or None if neither a matching
+    standard nor the default standard exists.
     
     Args:
-        image_id: Database image ID
+        camera_make: camera_make column from the images table (may be None)
+        camera_model: camera_model column from the images table (may be None)
         use_full_version: If True, use Full version (with tone curve/look table for camera-only processing).
                          If False, use regular version (without tone curve/look table for film sim processing).
     """
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    model = (camera_model or '').upper()
+    table = _CAMERA_MAP_FULL if use_full_version else _CAMERA_MAP_REG
     
-    cursor.execute("SELECT camera_make, camera_model FROM images WHERE id = ?", (image_id,))
-    result = cursor.fetchone()
-    conn.close()
-    
-    if not result:
-        return DEFAULT_CAMERA_STANDARD
-    
-    make = (result['camera_make'] or '').upper()
-    model = (result['camera_model'] or '').upper()
-    
-    # Map camera models to standard profiles
-    # Regular versions: tone curve/look table disabled (for film sim use)
-    # Full versions: tone curve/look table enabled (for camera-only use)
-    camera_mappings = {
-        'D7200': 'Standard_D7200_Full.pp3' if use_full_version else 'Standard_D7200.pp3',
-        'A7C': 'Standard_A7C_Full.pp3' if use_full_version else 'Standard_A7C.pp3',
-        'LX100': 'Standard_LX100_Full.pp3' if use_full_version else 'Standard_LX100.pp3',
-        'X-E4': 'Standard_XE4_Full.pp3' if use_full_version else 'Standard_XE4.pp3',
-        'ILCE-6500': 'Standard_A6500_Full.pp3' if use_full_version else 'Standard_A6500.pp3',
-        'ILCE-7C': 'Standard_A7C_Full.pp3' if use_full_version else 'Standard_A7C.pp3',  # Sony A7C full model name
-        'DMC-LX100': 'Standard_LX100_Full.pp3' if use_full_version else 'Standard_LX100.pp3',  # Panasonic LX100 full model name
-    }
+    # Exact model match first, then substring match in table order
+    standard_file = table.get(model)
+    if standard_file is None:
+        standard_file = next((v for k, v in table.items() if k in model), None)
     
-    # Find matching standard
-    for camera_key, standard_file in camera_mappings.items():
-        if camera_key in model:
-            standard_path = f"RawTherapee Presets/{standard_file}"
-            if Path(standard_path).exists():
-                return standard_path
+    if standard_file:
+        standard_path = resolved_preset(f"RawTherapee Presets/{standard_file}")
+        if standard_path:
+            return str(standard_path)
     
     # Fallback to default
-    return DEFAULT_CAMERA_STANDARD
+    default_path = resolved_preset(DEFAULT_CAMERA_STANDARD)
+    return str(default_path) if default_path else None
 
-def convert_raw_to_adjacent_jpg(source_path, image_id=None, camera_standard=None, style_preset=None, quality=None, exposure=0):
-    """Convert RAW file to adjacent JPG using RawTherapee CLI with high quality settings and presets."""
+def resolve_run_presets(camera_standard=None, style_preset=None, exposure=0, custom=False):
+    """Resolve every preset this run will use to an absolute path string.
+    
+    Exits if an explicitly requested preset is missing, so workers can pass the
+    returned paths straight to rawtherapee-cli without re-checking them.
+    
+    Returns a dict with camera_standard, style_preset and exposure_preset
+    (None when not used; camera_standard None means auto-detect per image).
+    """
+    presets = {'camera_standard': None, 'style_preset': None, 'exposure_preset': None}
+    required = []
+    if camera_standard:
+        required.append(('camera_standard', f"RawTherapee Presets/{camera_standard}"))
+    if style_preset:
+        required.append(('style_preset', f"RawTherapee Presets/{style_preset}"))
+    if exposure != 0:
+        required.append(('exposure_preset', f"RawTherapee Presets/Exposure_{exposure:+g}.pp3"))
+    elif custom:
+        # Custom proxies stack the neutral exposure preset when it's available
+        exposure_path = resolved_preset("RawTherapee Presets/Exposure_0.pp3")
+        presets['exposure_preset'] = str(exposure_path) if exposure_path else None
+    
+    missing = []
+    for key, preset in required:
+        preset_path = resolved_preset(preset)
+        if preset_path:
+            presets[key] = str(preset_path)
+        else:
+            missing.append(preset)
+    
+    if missing:
+        print("❌ RawTherapee preset(s) not found:")
+        for preset in missing:
+            print(f"  • {preset}")
+        sys.exit(1)
+    
+    if not camera_standard and not resolved_preset(DEFAULT_CAMERA_STANDARD):
+        print(f"⚠️ Default camera standard not found: {DEFAULT_CAMERA_STANDARD}")
+        print("   Cameras without a matching standard will use RawTherapee defaults")
+    
+    return presets
+
+def preset_fingerprint(camera_standard, exposure_preset, style_preset, quality, sidecar=None):
+    """Short hash identifying the preset stack and quality a proxy was rendered with.
+    
+    Preset mtimes are included so editing a .pp3 file also invalidates the proxy,
+    as is the mtime of the RAW's own sidecar (applied through -s) if it has one.
+    """
+    parts = [str(quality)]
+    for preset in (camera_standard, exposure_preset, style_preset):
+        parts.append(f"{preset}:{os.stat(preset).st_mtime_ns}" if preset else '')
     try:
-        # Auto-detect camera standard if not provided
+        parts.append(f"{sidecar}:{os.stat(sidecar).st_mtime_ns}" if sidecar else '')
+    except OSError:
+        parts.append('')  # No sidecar
+    return hashlib.blake2b('|'.join(parts).encode(), digest_size=8).hexdigest()
+
+def conversion_presets(row, args):
+    """Get the (camera, exposure, style) preset stack for a RAW file as absolute path strings."""
+    camera_standard = args['camera_standard']
+    if camera_standard is None:
         # Use Full version if no style preset, regular version if style preset is used
-        use_full_version = (style_preset is None or style_preset == "None")
-        if camera_standard is None and image_id is not None:
-            camera_standard = get_camera_standard_from_exif(image_id, use_full_version)
-        elif camera_standard is None:
-            camera_standard = DEFAULT_CAMERA_STANDARD
-            
-        # Use default style if not provided
-        if style_preset is None:
-            style_preset = DEFAULT_STYLE_PRESET
-            
+        use_full_version = args['style_preset'] is None
+        camera_standard = pick_camera_standard(row['camera_make'], row['camera_model'], use_full_version)
+    return camera_standard, args['exposure_preset'], args['style_preset']
+
+def run_rawtherapee(cmd, timeout):
+    """Run a rawtherapee-cli command with stdout discarded.
+
+    On POSIX the CLI is launched with os.posix_spawnp, which avoids forking the
+    (large) Python worker before exec; stderr goes to an anonymous temp file that
+    is only read back on failure. Other platforms fall back to subprocess.run.
+
+    Returns (returncode, stderr bytes). Raises subprocess.TimeoutExpired on timeout
+    and FileNotFoundError if rawtherapee-cli is not on PATH.
+    """
+    if not hasattr(os, 'posix_spawnp'):
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=timeout)
+        return result.returncode, result.stderr
+
+    with tempfile.TemporaryFile() as stderr_file:
+        pid = os.posix_spawnp(cmd[0], cmd, os.environ, file_actions=[
+            (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+            (os.POSIX_SPAWN_DUP2, stderr_file.fileno(), 2),
+        ])
+        # Block in waitpid on a helper thread so the timeout needs no polling
+        waited = []
+        waiter = threading.Thread(target=lambda: waited.append(os.waitpid(pid, 0)), daemon=True)
+        waiter.start()
+        waiter.join(timeout)
+        if waiter.is_alive():
+            os.kill(pid, signal.SIGKILL)
+            waiter.join()  # Reaps the killed process
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        returncode = os.waitstatus_to_exitcode(waited[0][1])
+        if returncode == 0:
+            return 0, b""
+        stderr_file.seek(0)
+        return returncode, stderr_file.read()
+
+def convert_raw_to_adjacent_jpg(source_paths, output_dir, presets, quality=None):
+    """Convert a batch of RAW files to adjacent JPGs with a single RawTherapee CLI invocation.
+    
+    Every file in the batch shares the same preset stack and output directory,
+    since RawTherapee applies -p/-o to all inputs of one run.
+    
+    Returns None if RawTherapee ran cleanly, otherwise an error message for the batch.
+    """
+    try:
         # Use default quality if not provided
         if quality is None:
             quality = RAWTHERAPEE_QUALITY
         
-        # Validate and prepare preset paths
-        camera_path = None
-        style_path = None
-        exposure_path = None
-
-        # Check camera preset
-        if camera_standard:
-            camera_path = Path(camera_standard)
-            if not camera_path.exists():
-                print(f" ⚠ Camera standard not found: {camera_standard}, using default settings")
-                camera_path = None
-
-        # Check style preset
-        if style_preset and style_preset != "None":
-            style_path = Path(style_preset)
-            if not style_path.exists():
-                print(f" ⚠ Style preset not found: {style_preset}, using default settings")
-                style_path = None
-
-        # Check exposure preset (skip if exposure is 0)
-        if exposure != 0:
-            exposure_preset = f"RawTherapee Presets/Exposure_{exposure:+g}.pp3"
-            exposure_path = Path(exposure_preset)
-            if not exposure_path.exists():
-                print(f" ⚠ Exposure preset not found: {exposure_preset}, skipping exposure adjustment")
-                exposure_path = None
+        camera_standard, exposure_preset, style_preset = presets
         
         # Use RawTherapee CLI with optimized settings for best quality
         # Order: Camera Standard -> Exposure -> Film Simulation
         cmd = ['rawtherapee-cli']
         
-        # Specify output directory (RAW Proxies folder)
-        source_path_obj = Path(source_path)
-        cmd.extend(['-o', str(proxy_dir)])
+        # Write the JPGs next to the RAW files (adjacent JPG)
+        cmd.extend(['-o', output_dir])
 
         # Add presets in order: Camera Standard -> Exposure -> Style
-        if camera_path:
-            cmd.extend(['-p', str(camera_path.resolve())])
-            print(f" 📷 Using camera standard: {camera_path.name}")
+        if camera_standard:
+            cmd.extend(['-p', camera_standard])
+            logger.info(" 📷 Using camera standard: %s", os.path.basename(camera_standard))
 
-        if exposure_path:
-            cmd.extend(['-p', str(exposure_path.resolve())])
-            print(f" ⚡ Using exposure: {exposure:+g} EV")
+        if exposure_preset:
+            cmd.extend(['-p', exposure_preset])
+            logger.info(" ⚡ Using exposure preset: %s", os.path.basename(exposure_preset))
 
-        if style_path:
-            cmd.extend(['-p', str(style_path.resolve())])
-            print(f" 🎨 Using style preset: {style_path.name}")
+        if style_preset:
+            cmd.extend(['-p', style_preset])
+            logger.info(" 🎨 Using style preset: %s", os.path.basename(style_preset))
         
         cmd.extend([
             f'-j{quality}',  # JPEG quality
             f'-js{RAWTHERAPEE_CHROMA_SUBSAMPLING}',  # Best chroma subsampling
             '-Y',  # Overwrite if exists
             '-s',  # Use sidecar files if available
-            '-c', str(source_path)  # Convert (must be last)
+            '-c'  # Convert (must be last, followed by the input files)
         ])
+        cmd.extend(source_paths)
         
-        print(f"   🔧 RawTherapee command: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   🔧 RawTherapee command: %s", ' '.join(cmd))
 
-        # Execute command
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=RAWTHERAPEE_TIMEOUT)
+        # Execute command - timeout scales with the number of files in the batch
+        returncode, stderr = run_rawtherapee(cmd, RAWTHERAPEE_TIMEOUT * len(source_paths))
 
-        # Check if adjacent JPG was created
-        adjacent_jpg = source_path_obj.with_suffix('.jpg')
+        if returncode == 0:
+            return None
 
-        if adjacent_jpg.exists():
-            return True, str(adjacent_jpg), "RawTherapee CLI (adjacent JPG)"
-        else:
-            # Provide more detailed error information
-            error_msg = result.stderr.strip() if result.stderr else "No adjacent JPG created"
-            if result.returncode != 0:
-                error_msg += f" (exit code: {result.returncode})"
-            if result.stdout:
-                error_msg += f" | stdout: {result.stdout.strip()}"
-            return False, None, f"RawTherapee CLI error: {error_msg}"
+        # Provide more detailed error information (stderr is only decoded on failure)
+        error_msg = stderr.decode('utf-8', errors='replace').strip() if stderr else "No adjacent JPG created"
+        error_msg += f" (exit code: {returncode})"
+        return f"RawTherapee CLI error: {error_msg}"
 
     except subprocess.TimeoutExpired:
-        return False, None, "RawTherapee CLI timeout"
+        return "RawTherapee CLI timeout"
     except FileNotFoundError:
-        return False, None, "RawTherapee CLI not found in PATH"
+        return "RawTherapee CLI not found in PATH"
     except Exception as e:
-        return False, None, f"RawTherapee CLI exception: {e}"
+        return f"RawTherapee CLI exception: {e}"
 
 
-def update_database_proxy_status(image_id, proxy_type, processing_settings=None):
-    """Update database with RAW proxy information."""
-    conn = sqlite3.connect(DB_FILE)
+def ensure_schema(conn):
+    """Add the RAW proxy columns to the images table if they don't exist yet."""
     cursor = conn.cursor()
-    
-    # Check if columns exist, add them if they don't
     cursor.execute("PRAGMA table_info(images)")
     columns = [row[1] for row in cursor.fetchall()]
     
@@ -259,102 +403,119 @@ def update_database_proxy_status(image_id, proxy_type, processing_settings=None)
     if 'raw_processing_settings' not in columns:
         cursor.execute("ALTER TABLE images ADD COLUMN raw_processing_settings TEXT")
     
-    # Update the record
-    cursor.execute("""
-        UPDATE images 
-        SET raw_proxy_type = ?, raw_processing_settings = ?
-        WHERE id = ?
-    """, (proxy_type, processing_settings, image_id))
+    # Source/preset fingerprint of the last custom proxy; without --force an unchanged one is kept
+    if 'raw_proxy_src_mtime' not in columns:
+        cursor.execute("ALTER TABLE images ADD COLUMN raw_proxy_src_mtime REAL")
+    
+    if 'raw_proxy_src_size' not in columns:
+        cursor.execute("ALTER TABLE images ADD COLUMN raw_proxy_src_size INTEGER")
+    
+    if 'raw_proxy_preset_hash' not in columns:
+        cursor.execute("ALTER TABLE images ADD COLUMN raw_proxy_preset_hash TEXT")
+    
+    if 'file_ext' not in columns:
+        cursor.execute("ALTER TABLE images ADD COLUMN file_ext TEXT")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_images_file_ext ON images(file_ext)")
+    
+    # Backfill the extension for rows added since the last run
+    cursor.execute("SELECT id, filename FROM images WHERE file_ext IS NULL")
+    backfill = [(os.path.splitext(filename or '')[1][1:].lower(), image_id)
+                for image_id, filename in cursor.fetchall()]
+    if backfill:
+        cursor.executemany("UPDATE images SET file_ext = ? WHERE id = ?", backfill)
     
     conn.commit()
+
+def update_database_proxy_status(pending_updates):
+    """Write all collected RAW proxy statuses in a single transaction.
+
+    Args:
+        pending_updates: List of (proxy_type, processing_settings, src_mtime, src_size,
+                         preset_hash, image_id) tuples
+    """
+    if not pending_updates:
+        return
+    
+    conn = sqlite3.connect(DB_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    with conn:
+        conn.executemany("""
+            UPDATE images 
+            SET raw_proxy_type = ?, raw_processing_settings = ?,
+                raw_proxy_src_mtime = ?, raw_proxy_src_size = ?, raw_proxy_preset_hash = ?
+            WHERE id = ?
+        """, pending_updates)
     conn.close()
 
-def generate_custom_raw_proxy(source_path, image_id, proxy_dir, camera_standard=None, style_preset=None, quality=None, exposure=0):
-    """Generate custom RAW proxy in RAW Proxies directory using RawTherapee CLI."""
+def generate_custom_raw_proxy(source_path, image_id, proxy_dir, camera_make=None, camera_model=None, camera_standard=None, style_preset=None, exposure_preset=None, quality=None):
+    """Generate custom RAW proxy in RAW Proxies directory using RawTherapee CLI.
+    
+    Preset arguments are absolute paths already validated by resolve_run_presets.
+    """
     try:
         # Auto-detect camera standard if not provided
         # Use Full version if no style preset, regular version if style preset is used
-        use_full_version = (style_preset is None or style_preset == "None")
         if camera_standard is None:
-            camera_standard = get_camera_standard_from_exif(image_id, use_full_version)
-        
-        # Use default style if not provided  
-        if style_preset is None:
-            style_preset = DEFAULT_STYLE_PRESET
+            camera_standard = pick_camera_standard(camera_make, camera_model, style_preset is None)
             
         # Use default quality if not provided
         if quality is None:
             quality = RAWTHERAPEE_QUALITY
             
         # Setup output path
-        output_path = proxy_dir / f"{image_id}.jpg"
-        
-        # Check if presets exist
-        camera_path = Path(camera_standard)
-        style_path = Path(style_preset) if style_preset and style_preset != "None" else None
-        
-        if not camera_path.exists():
-            print(f"   ⚠️ Camera standard not found: {camera_standard}, using default settings")
-        if style_path and not style_path.exists():
-            print(f"   ⚠️ Style preset not found: {style_preset}, using default settings")
-        
-        # Get exposure preset path
-        exposure_preset = f"RawTherapee Presets/Exposure_{exposure:+g}.pp3" if exposure != 0 else "RawTherapee Presets/Exposure_0.pp3"
-        exposure_path = Path(exposure_preset)
+        output_path = os.path.join(proxy_dir, f"{image_id}.jpg")
         
         # Build RawTherapee command
         # Order: Camera Standard -> Exposure -> Film Simulation
         cmd = ['rawtherapee-cli']
         
         # Add camera standard first (base settings)
-        if camera_path.exists():
-            cmd.extend(['-p', str(camera_path.resolve())])
-            print(f"   📷 Using camera standard: {camera_path.name}")
+        if camera_standard:
+            cmd.extend(['-p', camera_standard])
+            logger.info("   📷 Using camera standard: %s", os.path.basename(camera_standard))
         
         # Add exposure adjustment second
-        if exposure_path.exists():
-            cmd.extend(['-p', str(exposure_path.resolve())])
-            print(f"   ⚡ Using exposure: {exposure:+g} EV")
+        if exposure_preset:
+            cmd.extend(['-p', exposure_preset])
+            logger.info("   ⚡ Using exposure preset: %s", os.path.basename(exposure_preset))
         
-        # Add style preset third (stacked on top) - only if provided and exists
-        if style_preset and style_preset != "None" and style_path and style_path.exists():
-            cmd.extend(['-p', str(style_path.resolve())])
-            print(f"   🎨 Using style preset: {style_path.name}")
+        # Add style preset third (stacked on top) - only if provided
+        if style_preset:
+            cmd.extend(['-p', style_preset])
+            logger.info("   🎨 Using style preset: %s", os.path.basename(style_preset))
         else:
-            print(f"   🎨 No style preset - using camera standard only")
+            logger.info("   🎨 No style preset - using camera standard only")
         
         cmd.extend([
-            '-o', str(output_path),
+            '-o', output_path,
             f'-j{quality}',  # JPEG quality
             f'-js{RAWTHERAPEE_CHROMA_SUBSAMPLING}',  # Best chroma subsampling
             '-Y',  # Overwrite if exists
             '-s',  # Use sidecar files if available
-            '-c', str(source_path)  # Convert (must be last)
+            '-c', source_path  # Convert (must be last)
         ])
         
-        print(f"   🔧 Command: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=RAWTHERAPEE_TIMEOUT)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   🔧 Command: %s", ' '.join(cmd))
+        returncode, stderr = run_rawtherapee(cmd, RAWTHERAPEE_TIMEOUT)
         
-        if result.returncode == 0 and output_path.exists():
+        if returncode == 0 and os.path.isfile(output_path):
             # Update database with custom proxy info
-            import json
-            processing_settings = json.dumps({
+            processing_settings = _dumps({
+                **_CUSTOM_SETTINGS_BASE,
                 "quality": quality,
-                "chroma_subsampling": RAWTHERAPEE_CHROMA_SUBSAMPLING,
-                "method": "rawtherapee-cli",
-                "camera_standard": camera_path.name if camera_path.exists() else "auto-detected",
-                "style_preset": style_path.name if style_path and style_path.exists() else "none",
-                "generated_on_demand": True
+                "camera_standard": os.path.basename(camera_standard) if camera_standard else "auto-detected",
+                "style_preset": os.path.basename(style_preset) if style_preset else "none"
             })
-            update_database_proxy_status(image_id, "custom_generated", processing_settings)
-            return True, "success"
+            return True, "success", processing_settings
         else:
-            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-            return False, f"conversion failed: {error_msg}"
+            error_msg = stderr.decode('utf-8', errors='replace').strip() if stderr else "Unknown error"
+            return False, f"conversion failed: {error_msg}", None
     except subprocess.TimeoutExpired:
-        return False, "timeout"
+        return False, "timeout", None
     except Exception as e:
-        return False, f"error: {e}"
+        return False, f"error: {e}", None
 
 def clean_orphaned_proxies():
     """Remove proxy files for images no longer in database."""
@@ -369,31 +530,192 @@ def clean_orphaned_proxies():
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
     
+    ensure_schema(conn)
+    
     # Get all RAW image IDs that should have proxies
-    raw_extensions_sql = " OR ".join([f"UPPER(filename) LIKE '%.{ext[1:].upper()}'" for ext in RAW_EXTENSIONS])
     cursor.execute(f"""
         SELECT id FROM images 
-        WHERE ({raw_extensions_sql})
-    """)
-    valid_ids = {row['id'] for row in cursor.fetchall()}
+        WHERE file_ext IN ({RAW_EXTENSIONS_SQL})
+    """, RAW_EXTENSIONS_PARAMS)
+    valid_ids = {row['id'] for row in cursor}
     conn.close()
     
-    # Find and remove orphaned proxy files
+    # Find and remove orphaned proxy files - DirEntry gives names without a stat per file
     removed = 0
-    for proxy_file in proxy_dir.glob("*.jpg"):
-        try:
-            # Extract image ID from filename
-            image_id = int(proxy_file.stem)
+    with os.scandir(proxy_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".jpg"):
+                continue
+            try:
+                # Extract image ID from filename
+                image_id = int(entry.name[:-4])
+            except ValueError:
+                # Skip files that don't have numeric names
+                continue
             if image_id not in valid_ids:
-                proxy_file.unlink()
-                print(f"🗑️ Removed orphaned proxy: {proxy_file.name}")
+                os.unlink(entry.path)
+                print(f"🗑️ Removed orphaned proxy: {entry.name}")
                 removed += 1
-        except ValueError:
-            # Skip files that don't have numeric names
-            continue
     
     return removed
 
+def check_raw_file(row, args, existing_proxies, dir_cache):
+    """Decide whether a RAW file still needs converting.
+    
+    Existence checks use directory listings (existing_proxies and dir_cache)
+    rather than a stat per file.
+    
+    Returns a final (image_id, status, message, db_update) result, or None if
+    the file should be queued for RawTherapee.
+    """
+    image_id = row['id']
+    source_path = row['path']
+    dir_names = list_directory(os.path.dirname(source_path), dir_cache)
+
+    # Check if source file exists
+    if os.path.basename(source_path) not in dir_names:
+        return image_id, STATUS_ERROR, f"⚠️ ID {image_id}: Source file not found: {source_path}", None
+
+    # Check if proxy already exists (unless forcing regeneration)
+    if not args['force'] and f"{image_id}.jpg" in existing_proxies:
+        return image_id, STATUS_SKIPPED, f"⏭️ ID {image_id}: Proxy already exists: {image_id}.jpg", None
+
+    # Check for a camera-generated adjacent JPG first
+    adjacent_jpg = has_adjacent_jpg(source_path, dir_names)
+    if adjacent_jpg:
+        return (image_id, STATUS_ADJACENT,
+                f"📄 ID {image_id}: Found adjacent JPG: {os.path.basename(adjacent_jpg)} - will be used directly for galleries",
+                ("original_jpg", None, None))
+
+    return None
+
+def convert_batch(batch, args):
+    """Convert one batch of RAW files sharing presets and directory in a worker process.
+
+    Returns a list of (image_id, status, message, db_update) tuples, one per file.
+    """
+    rows = batch['rows']
+    logger.info("\n🔄 Creating %d adjacent JPG(s) in %s using RawTherapee...", len(rows), batch['output_dir'])
+
+    error = convert_raw_to_adjacent_jpg(
+        [row['path'] for row in rows],
+        batch['output_dir'],
+        batch['presets'],
+        quality=args['quality']
+    )
+
+    results = []
+    for row in rows:
+        image_id = row['id']
+        # Verify the adjacent JPG was created and has reasonable size (one stat for both)
+        adjacent_jpg_path = os.path.splitext(row['path'])[0] + '.jpg'
+        try:
+            adjacent_jpg_size = os.stat(adjacent_jpg_path).st_size
+        except OSError:
+            adjacent_jpg_size = None
+        
+        if adjacent_jpg_size is not None and adjacent_jpg_size > 10000:  # At least 10KB
+            results.append((image_id, STATUS_CONVERTED,
+                            f"✅ ID {image_id}: Created adjacent JPG {os.path.basename(adjacent_jpg_path)} using RawTherapee CLI "
+                            f"({adjacent_jpg_size // 1024} KB)",
+                            ("original_jpg",
+                             ADJACENT_PROCESSING_SETTINGS,
+                             None)))
+        elif adjacent_jpg_size is not None:
+            os.unlink(adjacent_jpg_path)  # Remove invalid file
+            results.append((image_id, STATUS_ERROR, f"❌ ID {image_id}: Adjacent JPG invalid or too small", None))
+        else:
+            results.append((image_id, STATUS_ERROR,
+                            f"❌ ID {image_id}: Conversion failed: {error or 'No adjacent JPG created'}", None))
+    return results
+
+def plan_batches(rows, args, num_workers):
+    """Group RAW files by output directory and preset stack, then split into batches.
+    
+    Groups are split so the pool has work for every worker, and capped at
+    RAWTHERAPEE_BATCH_SIZE files to bound RawTherapee's memory use per run.
+    """
+    groups = {}
+    for row in rows:
+        presets = conversion_presets(row, args)
+        key = (os.path.dirname(row['path']), presets)
+        groups.setdefault(key, []).append(row)
+
+    batches = []
+    for (output_dir, presets), group_rows in groups.items():
+        batch_size = min(RAWTHERAPEE_BATCH_SIZE, -(-len(group_rows) // num_workers))
+        for start in range(0, len(group_rows), batch_size):
+            batches.append({
+                'output_dir': output_dir,
+                'presets': presets,
+                'rows': group_rows[start:start + batch_size],
+            })
+    return batches
+
+def record_results(results, counts, pending_updates):
+    """Log worker results, tally them by status, and queue their database updates."""
+    for image_id, status, message, db_update in results:
+        # Errors stay visible with --quiet
+        logger.log(logging.WARNING if status == STATUS_ERROR else logging.INFO, "   %s", message)
+        if db_update:
+            proxy_type, processing_settings, fingerprint = db_update
+            src_mtime, src_size, preset_hash = fingerprint or (None, None, None)
+            pending_updates.append((proxy_type, processing_settings, src_mtime, src_size, preset_hash, image_id))
+        counts[status] += 1
+
+def process_one(row, args):
+    """Generate a custom proxy for a single image (--image-id mode).
+
+    Returns a tuple (image_id, status, message, db_update) where db_update is None
+    or a (proxy_type, processing_settings, fingerprint) tuple for the main process to write.
+    """
+    image_id = row['id']
+    source_path = row['path']
+    filename = row['filename']
+    proxy_dir = args['proxy_dir']
+
+    logger.info("\n📷 Processing ID %s: %s", image_id, filename)
+
+    # Check if source file exists
+    try:
+        source_stat = os.stat(source_path)
+    except OSError:
+        return image_id, STATUS_ERROR, f"⚠️ ID {image_id}: Source file not found: {source_path}", None
+
+    camera_standard, exposure_preset, style_preset = conversion_presets(row, args)
+    fingerprint = (source_stat.st_mtime, source_stat.st_size,
+                   preset_fingerprint(camera_standard, exposure_preset, style_preset, args['quality'],
+                                      sidecar=source_path + '.pp3'))
+
+    # Keep an existing custom proxy (unless forcing regeneration) when neither the RAW,
+    # its sidecar nor the presets changed since it was rendered
+    if not args['force'] and proxy_exists(image_id, proxy_dir):
+        stored = (row['raw_proxy_src_mtime'], row['raw_proxy_src_size'], row['raw_proxy_preset_hash'])
+        if row['raw_proxy_type'] == "custom_generated" and stored == fingerprint:
+            return image_id, STATUS_SKIPPED, f"⏭️ ID {image_id}: Proxy is up to date: {image_id}.jpg", None
+
+    # Check if it's actually a RAW file
+    suffix = os.path.splitext(source_path)[1]
+    if suffix.lower() not in RAW_EXTENSIONS:
+        return image_id, STATUS_ERROR, f"❌ ID {image_id}: Not a RAW file: {suffix}", None
+
+    logger.info("   🔄 Generating custom proxy using RawTherapee...")
+
+    success, message, processing_settings = generate_custom_raw_proxy(
+        source_path,
+        image_id,
+        proxy_dir,
+        camera_standard=camera_standard,
+        style_preset=style_preset,
+        exposure_preset=exposure_preset,
+        quality=args['quality']
+    )
+
+    if success:
+        return (image_id, STATUS_CONVERTED, f"✅ ID {image_id}: Generated custom proxy: {image_id}.jpg",
+                ("custom_generated", processing_settings, fingerprint))
+    return image_id, STATUS_ERROR, f"❌ ID {image_id}: Failed to generate custom proxy: {message}", None
+
 def get_available_presets():
     """Get lists of available camera standards and style presets."""
     preset_dir = Path("RawTherapee Presets")
@@ -426,8 +748,17 @@ def main():
                         help=f'JPEG quality (1-100, default: {RAWTHERAPEE_QUALITY})')
     parser.add_argument('--exposure', type=float, default=0.0, choices=[-1.0, -0.5, 0.0, 0.5, 1.0],
                         help='Exposure compensation in EV (-1, -0.5, 0, +0.5, +1, default: 0)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Only report errors and the summary, not per-file progress')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Also show the full rawtherapee-cli command for each run')
+    parser.add_argument('--workers', type=int,
+                        help='RawTherapee runs to have going at once (default: CPU cores)')
     args = parser.parse_args()
     
+    log_level = logging.WARNING if args.quiet else logging.DEBUG if args.verbose else logging.INFO
+    setup_logging(log_level)
+    
     if args.list_presets:
         print("📷 Available Camera Standards:")
         for standard in camera_standards:
@@ -469,137 +800,95 @@ def main():
         print("  • Or download from: https://rawtherapee.com/")
         sys.exit(1)
     
+    # Migrate schema once up front instead of per file
+    conn = sqlite3.connect(DB_FILE)
+    ensure_schema(conn)
+    conn.close()
+    
     proxy_dir = setup_proxy_directory()
     print(f"📁 Proxy directory: {proxy_dir.resolve()}")
     print(f"✅ RawTherapee CLI available")
     
+    # Process each file
+    counts = {STATUS_CONVERTED: 0, STATUS_ADJACENT: 0, STATUS_SKIPPED: 0, STATUS_ERROR: 0}
+    pending_updates = []
+
+    # Plain dicts pickle cleanly into worker processes; sqlite3.Row does not.
+    # Presets are validated once here and handed to workers as absolute paths.
+    worker_args = {
+        'force': args.force,
+        'image_id': args.image_id,
+        'quality': args.quality,
+        'proxy_dir': str(proxy_dir),
+    }
+    worker_args.update(resolve_run_presets(args.camera_standard, args.style_preset, args.exposure,
+                                           custom=bool(args.image_id)))
+    
     # Get RAW files from database
+    conn, cursor = get_raw_files_from_db(args.image_id)
     if args.image_id:
         print(f"\n🔍 Finding image {args.image_id} in database...")
-        raw_files = get_raw_files_from_db(args.image_id)
-        if raw_files:
-            print(f"Found image {args.image_id}")
-        else:
+        row = cursor.fetchone()
+        conn.close()
+        if not row:
             print(f"❌ Image {args.image_id} not found in database")
             return
+        print(f"Found image {args.image_id}")
+        
+        # Single custom proxy - run inline, a worker pool would only add start-up cost
+        record_results([process_one(dict(row), worker_args)], counts, pending_updates)
     else:
         print("\n🔍 Finding RAW files in database...")
-        raw_files = get_raw_files_from_db()
-        print(f"Found {len(raw_files)} RAW files")
+        # Stream rows in bounded chunks rather than fetchall() on the whole library
+        chunks = iter(lambda: cursor.fetchmany(DB_FETCH_SIZE), [])
+        existing_proxies = list_directory(str(proxy_dir), {})
+        dir_cache = {}
+
+        # Database writes are collected here and committed together after the pool finishes.
+        # At most MAX_IN_FLIGHT_CHUNKS chunks are queued on the pool: the next chunk is
+        # read and triaged while earlier ones convert, but reading stops until the oldest
+        # chunk's results are drained, so memory stays bounded for any library size.
+        num_workers = args.workers or os.cpu_count() or 1
+        with multiprocessing.Pool(num_workers, initializer=setup_logging, initargs=(log_level,)) as pool:
+            in_flight = collections.deque()
+            for chunk in chunks:
+                # Cheap checks first; only files that really need RawTherapee get batched
+                checked = []
+                pending_rows = []
+                for row in chunk:
+                    row = dict(row)
+                    result = check_raw_file(row, worker_args, existing_proxies, dir_cache)
+                    if result:
+                        checked.append(result)
+                    else:
+                        pending_rows.append(row)
+
+                batches = plan_batches(pending_rows, worker_args, num_workers)
+                results = itertools.chain(checked, itertools.chain.from_iterable(
+                    pool.imap_unordered(partial(convert_batch, args=worker_args), batches)))
+
+                in_flight.append(results)
+                if len(in_flight) >= MAX_IN_FLIGHT_CHUNKS:
+                    record_results(in_flight.popleft(), counts, pending_updates)
+
+            while in_flight:
+                record_results(in_flight.popleft(), counts, pending_updates)
+        conn.close()
     
-    if not raw_files:
+    if not any(counts.values()):
         print("✅ No RAW files found in database")
         return
     
-    # Process each file
-    converted_count = 0
-    skipped_adjacent_count = 0
-    skipped_count = 0
-    error_count = 0
-    
-    for row in raw_files:
-        image_id = row['id']
-        source_path = Path(row['path'])
-        filename = row['filename']
-        
-        print(f"\n📷 Processing ID {image_id}: {filename}")
-        
-        # Check if source file exists
-        if not source_path.exists():
-            print(f"   ⚠️ Source file not found: {source_path}")
-            error_count += 1
-            continue
-        
-        output_path = proxy_dir / f"{image_id}.jpg"
-        
-        # Check if proxy already exists (unless forcing regeneration)
-        if not args.force and proxy_exists(image_id, proxy_dir):
-            print(f"   ⏭️ Proxy already exists: {image_id}.jpg")
-            skipped_count += 1
-            continue
-        
-        # If processing a specific image ID, generate custom proxy
-        if args.image_id:
-            # Check if it's actually a RAW file
-            if source_path.suffix.lower() not in RAW_EXTENSIONS:
-                print(f"   ❌ Not a RAW file: {source_path.suffix}")
-                error_count += 1
-                continue
-                
-            print(f"   🔄 Generating custom proxy using RawTherapee...")
-            
-            # Determine presets to use
-            camera_standard = f"RawTherapee Presets/{args.camera_standard}" if args.camera_standard else None
-            style_preset = f"RawTherapee Presets/{args.style_preset}" if args.style_preset else None
-            
-            success, message = generate_custom_raw_proxy(
-                source_path, 
-                image_id,
-                proxy_dir,
-                camera_standard=camera_standard,
-                style_preset=style_preset,
-                quality=args.quality,
-                exposure=args.exposure
-            )
-            
-            if success:
-                print(f"   ✅ Generated custom proxy: {image_id}.jpg")
-                converted_count += 1
-            else:
-                print(f"   ❌ Failed to generate custom proxy: {message}")
-                error_count += 1
-        else:
-            # Normal batch processing - check for adjacent JPG first
-            adjacent_jpg = has_adjacent_jpg(source_path)
-            if adjacent_jpg:
-                print(f"   📄 Found adjacent JPG: {adjacent_jpg.name}")
-                print(f"   ⏭️ Skipping - adjacent JPG will be used directly for galleries")
-                update_database_proxy_status(image_id, "original_jpg")
-                skipped_adjacent_count += 1
-                continue
-            
-            # Generate adjacent JPG using RawTherapee CLI
-            print(f"   🔄 Creating adjacent JPG using RawTherapee...")
-            
-            # Determine presets to use
-            camera_standard = f"RawTherapee Presets/{args.camera_standard}" if args.camera_standard else None
-            style_preset = f"RawTherapee Presets/{args.style_preset}" if args.style_preset else None
-            
-            success, adjacent_path, method = convert_raw_to_adjacent_jpg(
-                source_path, 
-                image_id=image_id,
-                camera_standard=camera_standard,
-                style_preset=style_preset,
-                quality=args.quality,
-                exposure=args.exposure
-            )
-            
-            if success:
-                # Verify the adjacent JPG was created and has reasonable size
-                adjacent_jpg_path = Path(adjacent_path)
-                if adjacent_jpg_path.exists() and adjacent_jpg_path.stat().st_size > 10000:  # At least 10KB
-                    print(f"   ✅ Created adjacent JPG using {method} ({adjacent_jpg_path.stat().st_size // 1024} KB)")
-                    print(f"   📄 Location: {adjacent_jpg_path.name}")
-                    update_database_proxy_status(image_id, "original_jpg", 
-                                               f'{{"quality": {RAWTHERAPEE_QUALITY}, "chroma_subsampling": {RAWTHERAPEE_CHROMA_SUBSAMPLING}, "method": "rawtherapee-cli-adjacent-hq", "lens_correction": true}}')
-                    converted_count += 1
-                else:
-                    print(f"   ❌ Adjacent JPG invalid or too small")
-                    if adjacent_jpg_path.exists():
-                        adjacent_jpg_path.unlink()  # Remove invalid file
-                    error_count += 1
-            else:
-                print(f"   ❌ Conversion failed: {method}")
-                error_count += 1
+    update_database_proxy_status(pending_updates)
     
     # Summary
     print(f"\n🎉 Processing complete!")
-    print(f"   📄 Adjacent JPGs found: {skipped_adjacent_count} files (already existed)")
-    print(f"   ✅ Adjacent JPGs created: {converted_count} files (RawTherapee)")
-    print(f"   ⏭️ Skipped: {skipped_count} files (already processed)")
-    print(f"   ❌ Errors: {error_count} files")
+    print(f"   📄 Adjacent JPGs found: {counts[STATUS_ADJACENT]} files (already existed)")
+    print(f"   ✅ Adjacent JPGs created: {counts[STATUS_CONVERTED]} files (RawTherapee)")
+    print(f"   ⏭️ Skipped: {counts[STATUS_SKIPPED]} files (already processed)")
+    print(f"   ❌ Errors: {counts[STATUS_ERROR]} files")
     
-    if converted_count > 0:
+    if counts[STATUS_CONVERTED] > 0:
         print(f"\n💡 Next steps:")
         print(f"   • Adjacent JPGs created alongside RAW files")
         print(f"   • Gallery creation will use adjacent JPGs automatically")
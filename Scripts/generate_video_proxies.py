@@ -5,15 +5,73 @@ Creates compressed h.264 video proxies for fast gallery loading and playback.
 Optimized for retina displays with good quality/size balance.
 """
 
+import hashlib
+import io
 import os
 import sqlite3
 import subprocess
 import argparse
-import tempfile
 import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime
 from pathlib import Path
 
+# Parse picks and stored probe JSON with orjson's C parser when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Hardware H.264 encoders in order of preference; libx264 is the software fallback
+HARDWARE_ENCODERS = ['h264_videotoolbox', 'h264_nvenc'] if sys.platform == 'darwin' else ['h264_nvenc']
+SOFTWARE_ENCODER = 'libx264'
+
+# Sources at or below this bitrate that are already H.264/AAC are remuxed, not re-encoded
+REMUX_MAX_BITRATE = 15_000_000
+
+# Pipe buffer for ffprobe/ffmpeg output; one large read instead of many 8KB ones
+PIPE_BUFSIZE = 1 << 20
+
+# Quiet ffmpeg: no banner, per-frame stats or stdin polling, only errors on stderr
+FFMPEG_QUIET = ["-hide_banner", "-nostdin", "-nostats", "-loglevel", "error"]
+
+# Fragmented MP4: the moov header is written up front, so unlike faststart there is no
+# second pass rewriting the whole file, and browsers still play it progressively
+MP4_MOVFLAGS = "+frag_keyframe+empty_moov+default_base_moof"
+
+# Camera MP4/MOV files describe their streams in the moov header, so there's no need for
+# ffmpeg's default 5MB / 5s of stream analysis before probing or encoding can start
+INPUT_PROBE_ARGS = ["-probesize", "1000000", "-analyzeduration", "1000000"]
+
+# Threads given to each ffmpeg process in batch mode when neither --workers nor
+# --ffmpeg-threads is set; the pool is then sized to fill the remaining cores
+DEFAULT_FFMPEG_THREADS = 4
+
+def resolve_parallelism(workers: int = None, ffmpeg_threads: int = None) -> tuple:
+    """Split the CPU between concurrent ffmpeg processes and their threads.
+    
+    Explicit arguments win, then the DIY_PHOTO_FFMPEG_WORKERS / DIY_PHOTO_FFMPEG_THREADS
+    environment variables. Whichever is left unset is derived from the other.
+    """
+    cpu_count = os.cpu_count() or 4
+    if workers is None and os.environ.get('DIY_PHOTO_FFMPEG_WORKERS'):
+        workers = int(os.environ['DIY_PHOTO_FFMPEG_WORKERS'])
+    if ffmpeg_threads is None and os.environ.get('DIY_PHOTO_FFMPEG_THREADS'):
+        ffmpeg_threads = int(os.environ['DIY_PHOTO_FFMPEG_THREADS'])
+    
+    if ffmpeg_threads is None:
+        if workers is None:
+            ffmpeg_threads = min(DEFAULT_FFMPEG_THREADS, cpu_count)
+        else:
+            ffmpeg_threads = cpu_count // max(1, workers)
+    ffmpeg_threads = max(1, ffmpeg_threads)
+    if workers is None:
+        workers = cpu_count // ffmpeg_threads
+    return max(1, workers), ffmpeg_threads
+
 class VideoProxyGenerator:
     def __init__(self, db_path=None, proxy_dir="Video Proxies"):
         if db_path is None:
@@ -32,65 +90,232 @@ class VideoProxyGenerator:
         # Keeps original resolution, optimized for good quality/size balance
         self.ffmpeg_path = "/usr/bin/ffmpeg"
         self.crf = 23  # Constant Rate Factor - 23 is good quality/size balance
-        self.preset = "medium"  # Good compression/speed balance
+        self.preset = "faster"  # Much quicker than medium at near-identical quality for the same CRF
+        self.ffmpeg_threads = 0  # 0 lets ffmpeg use every core; batch mode pins it per worker
+        self.encoder = None  # Detected on first use, see _detect_encoder()
         
         self.conn = sqlite3.connect(db_path)
+        # WAL so batch runs don't block other scripts writing to the database
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-64000")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS video_proxies (
+                image_id INTEGER PRIMARY KEY,
+                source_mtime REAL,
+                proxy_mtime REAL,
+                proxy_size INTEGER,
+                lut_fingerprint TEXT,
+                probe_info TEXT,
+                correction_lut TEXT,
+                style_lut TEXT
+            )
+        ''')
+        # Tables from before the LUT paths were kept get the columns added
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(video_proxies)")}
+        for column in ('correction_lut', 'style_lut'):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE video_proxies ADD COLUMN {column} TEXT")
         self.conn.row_factory = sqlite3.Row
         
-    def __del__(self):
-        if hasattr(self, 'conn'):
-            self.conn.close()
+        # video_proxies rows for proxies made (or found up to date) since the last save
+        self._state_updates = []
+        # ffprobe results keyed by (path, mtime)
+        self._probe_cache = {}
+        
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.conn.close()
     
     def get_proxy_path(self, video_id: int) -> Path:
         """Get proxy file path for a video ID."""
         return self.proxy_dir / f"{video_id}.mp4"
     
-    def needs_proxy(self, video_id: int, original_path: str) -> bool:
-        """Check if video needs proxy generation/update."""
-        proxy_path = self.get_proxy_path(video_id)
+    def get_rendition_path(self, video_id: int, width: int, height: int) -> Path:
+        """Get file path for an extra proxy rendition fitted to width x height."""
+        return self.proxy_dir / f"{video_id}_{width}x{height}.mp4"
+    
+    def _lut_fingerprint(self, correction_lut: str = None, style_lut: str = None) -> str:
+        """Hash of the LUT files a proxy was made with.
+        
+        LUTs are identified by path, size and mtime, so editing or swapping a LUT in place
+        also forces the proxy to be rebuilt. Encoder settings are left out: a run with a
+        different --crf or encoder shouldn't redo every existing proxy.
+        """
+        settings = []
+        for lut in (correction_lut, style_lut):
+            try:
+                lut_stat = os.stat(lut) if lut else None
+            except OSError:
+                lut_stat = None
+            settings.append((os.path.abspath(lut) if lut else '', lut_stat.st_size if lut_stat else None, lut_stat.st_mtime if lut_stat else None))
+        return hashlib.blake2b(repr(settings).encode(), digest_size=16).hexdigest()
+    
+    def _record_state(self, video_id: int, original_path: str, correction_lut: str = None, style_lut: str = None):
+        """Queue the video_proxies row for a proxy that matches its source and settings."""
+        proxy_stat = os.stat(self.get_proxy_path(video_id))
+        source_mtime = os.path.getmtime(original_path)
+        probe_info = self._probe_cache.get((original_path, source_mtime))
+        self._state_updates.append((video_id, source_mtime, proxy_stat.st_mtime, proxy_stat.st_size,
+                                    self._lut_fingerprint(correction_lut, style_lut),
+                                    json.dumps(probe_info) if probe_info else None,
+                                    *(os.path.abspath(lut) if lut else None for lut in (correction_lut, style_lut))))
+    
+    def _save_proxy_state(self):
+        """Write the proxy state collected so far in one transaction."""
+        if not self._state_updates:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO video_proxies (image_id, source_mtime, proxy_mtime, proxy_size, lut_fingerprint, "
+                "probe_info, correction_lut, style_lut) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._state_updates)
+        self._state_updates = []
+    
+    def needs_proxy(self, video_id: int, original_path: str, correction_lut: str = None, style_lut: str = None) -> bool:
+        """Check if video needs proxy generation/update.
         
-        if not proxy_path.exists():
+        LUTs are only compared when the caller gives some; without them (batch mode) a
+        proxy is kept whatever LUTs it was graded with.
+        """
+        try:
+            proxy_mtime = os.stat(self.get_proxy_path(video_id)).st_mtime
+        except FileNotFoundError:
             return True
         
         # Check if original video is newer than proxy
-        if not os.path.exists(original_path):
+        try:
+            original_mtime = os.stat(original_path).st_mtime
+        except FileNotFoundError:
             return False
         
-        original_mtime = os.path.getmtime(original_path)
-        proxy_mtime = os.path.getmtime(proxy_path)
+        row = self.conn.execute(
+            "SELECT source_mtime, proxy_mtime, lut_fingerprint, correction_lut, style_lut FROM video_proxies "
+            "WHERE image_id = ?",
+            (video_id,)).fetchone()
+        if row and row['proxy_mtime'] == proxy_mtime:
+            if row['source_mtime'] != original_mtime:
+                return True
+            return bool(correction_lut or style_lut) and \
+                row['lut_fingerprint'] != self._lut_fingerprint(correction_lut, style_lut)
         
-        return original_mtime > proxy_mtime
+        # Proxy made before state was tracked (or replaced by hand): fall back to mtimes
+        if original_mtime > proxy_mtime:
+            return True
+        if row and not (correction_lut or style_lut):
+            correction_lut, style_lut = row['correction_lut'], row['style_lut']
+        self._record_state(video_id, original_path, correction_lut, style_lut)
+        return False
+    
+    def stored_luts(self, video_id: int) -> tuple:
+        """(correction_lut, style_lut) the video's current proxy was made with."""
+        row = self.conn.execute("SELECT correction_lut, style_lut FROM video_proxies WHERE image_id = ?",
+                                (video_id,)).fetchone()
+        return (row['correction_lut'], row['style_lut']) if row else (None, None)
     
-    def get_video_info(self, video_path: str) -> dict:
-        """Get video information using ffprobe."""
+    def _stored_probe_info(self, video_id: int, source_mtime: float) -> dict:
+        """ffprobe result saved with the last proxy, if the source is unchanged since."""
+        row = self.conn.execute("SELECT source_mtime, probe_info FROM video_proxies WHERE image_id = ?",
+                                (video_id,)).fetchone()
+        if row and row['probe_info'] and row['source_mtime'] == source_mtime:
+            return _json_loads(row['probe_info'])
+        return None
+    
+    def get_video_info(self, video_path: str, video_id: int = None) -> dict:
+        """Get video (and audio codec) information using ffprobe.
+        
+        Results are cached per (path, mtime) for the run and, given a video_id, reused from the
+        video_proxies row when the source hasn't changed since the last proxy was made.
+        """
+        try:
+            cache_key = (video_path, os.path.getmtime(video_path))
+        except OSError:
+            return {}
+        if cache_key in self._probe_cache:
+            return self._probe_cache[cache_key]
+        stored = self._stored_probe_info(video_id, cache_key[1]) if video_id is not None else None
+        if stored:
+            self._probe_cache[cache_key] = stored
+            return stored
+        
         if not os.path.exists("/usr/bin/ffprobe"):
             return {}
         
         try:
             cmd = [
                 "/usr/bin/ffprobe", "-v", "quiet", "-print_format", "json",
-                "-show_streams", "-select_streams", "v:0", video_path
+                "-show_streams", "-show_format", *INPUT_PROBE_ARGS, video_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(cmd, capture_output=True, bufsize=PIPE_BUFSIZE, timeout=30)
             if result.returncode == 0 and result.stdout:
-                import json
-                data = json.loads(result.stdout)
+                data = _json_loads(result.stdout)
                 
                 streams = data.get('streams', [])
-                if streams:
-                    video_stream = streams[0]
-                    return {
+                video_stream = next((s for s in streams if s.get('codec_type') == 'video'), None)
+                audio_stream = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+                if video_stream:
+                    self._probe_cache[cache_key] = {
                         'width': int(video_stream.get('width', 0)),
                         'height': int(video_stream.get('height', 0)),
                         'codec': video_stream.get('codec_name', ''),
-                        'duration': float(video_stream.get('duration', 0))
+                        'duration': float(video_stream.get('duration', 0)),
+                        'pix_fmt': video_stream.get('pix_fmt', ''),
+                        'bit_rate': int(data.get('format', {}).get('bit_rate') or video_stream.get('bit_rate') or 0),
+                        'audio_codec': audio_stream.get('codec_name', '') if audio_stream else ''
                     }
+                    return self._probe_cache[cache_key]
         except Exception as e:
             print(f"Warning: Could not get video info for {video_path}: {e}")
         
         return {}
     
+    def _detect_encoder(self) -> str:
+        """Pick the fastest working H.264 encoder: VideoToolbox (macOS), NVENC, else libx264."""
+        try:
+            result = subprocess.run([self.ffmpeg_path, "-hide_banner", "-encoders"],
+                                    capture_output=True, text=True, timeout=30)
+            listed = result.stdout.split()
+        except (OSError, subprocess.TimeoutExpired):
+            return SOFTWARE_ENCODER
+        
+        for encoder in HARDWARE_ENCODERS:
+            if encoder not in listed:
+                continue
+            # Builds often list NVENC without a GPU to run it, so try a tiny encode first
+            try:
+                probe = subprocess.run([self.ffmpeg_path, "-hide_banner", "-loglevel", "error",
+                                        "-f", "lavfi", "-i", "color=black:s=256x256:d=0.1",
+                                        "-c:v", encoder, "-f", "null", "-"],
+                                       capture_output=True, timeout=30)
+            except (OSError, subprocess.TimeoutExpired):
+                continue
+            if probe.returncode == 0:
+                return encoder
+        return SOFTWARE_ENCODER
+    
+    def _encoder_args(self) -> list:
+        """Codec and quality options for the selected encoder."""
+        if self.encoder == 'h264_nvenc':
+            # NVENC ignores -crf; constant-quality VBR is the closest equivalent
+            return ["-vcodec", self.encoder, "-rc", "vbr", "-cq", str(self.crf), "-b:v", "0"]
+        if self.encoder == 'h264_videotoolbox':
+            # VideoToolbox ignores -crf and -preset and only takes a 1-100 quality scale
+            return ["-vcodec", self.encoder, "-q:v", "55"]
+        args = [
+            "-vcodec", self.encoder,  # h.264 codec
+            "-preset", self.preset,  # Encoder speed/compression trade-off
+            "-crf", str(self.crf),  # Quality setting (lower = better quality, bigger file)
+        ]
+        if self.ffmpeg_threads:
+            # -threads alone doesn't stop x264 adding its own lookahead threads, which
+            # oversubscribes the CPU when several encodes share it; sliced threads cost quality
+            args.extend(["-x264-params", f"threads={self.ffmpeg_threads}:sliced-threads=0:lookahead-threads=1"])
+        return args
+    
     def calculate_dimensions(self, original_width: int, original_height: int) -> tuple:
         """Keep original dimensions but ensure they are even (required for h.264)."""
         target_width = original_width
@@ -104,6 +329,126 @@ class VideoProxyGenerator:
         
         return target_width, target_height
     
+    def _can_remux(self, video_info: dict, correction_lut: str = None, style_lut: str = None) -> bool:
+        """True when the source can be copied into the proxy as-is: H.264 4:2:0 at a modest bitrate."""
+        if correction_lut or style_lut:
+            return False
+        return (video_info.get('codec') == 'h264'
+                and video_info.get('pix_fmt') == 'yuv420p'
+                and video_info.get('audio_codec', '') in ('aac', '')
+                and video_info.get('width', 1) % 2 == 0
+                and video_info.get('height', 1) % 2 == 0
+                and 0 < video_info.get('bit_rate', 0) <= REMUX_MAX_BITRATE)
+    
+    def _build_encode_command(self, video_path: str, output_path: str, video_info: dict, target_width: int,
+                              target_height: int, correction_lut: str = None, style_lut: str = None) -> list:
+        """Build the ffmpeg transcode command, applying any LUTs before scaling."""
+        if self.encoder is None:
+            self.encoder = self._detect_encoder()
+        
+        # Build FFmpeg command with proper LUT handling. With a hardware encoder, decode on the
+        # GPU too; frames still come back to system memory for the CPU LUT/scale filters.
+        cmd = [self.ffmpeg_path, *FFMPEG_QUIET]
+        if self.encoder != SOFTWARE_ENCODER:
+            cmd.extend(["-hwaccel", "auto"])
+        cmd.extend([*INPUT_PROBE_ARGS, "-i", video_path])
+        
+        # Handle HALDCLUT PNG as separate input
+        has_haldclut = (style_lut and os.path.exists(style_lut) and 
+                       style_lut.lower().endswith('.png'))
+        
+        if has_haldclut:
+            cmd.extend(["-i", style_lut])
+            print(f"   🌈 Added HALDCLUT input: {os.path.basename(style_lut)}")
+        
+        # Build video filter chain - handle HALDCLUT specially
+        if has_haldclut:
+            # For HALDCLUT, we need to use filter_complex with proper syntax
+            filter_parts = []
+            
+            # Start with video input and apply any correction LUT
+            video_stream = "[0:v]"
+            if correction_lut and os.path.exists(correction_lut) and correction_lut.lower().endswith('.cube'):
+                filter_parts.append(f"{video_stream}lut3d={correction_lut}:interp=tetrahedral[corrected]")
+                video_stream = "[corrected]"
+                print(f"   🎨 Applied correction LUT (.cube): {os.path.basename(correction_lut)}")
+            
+            # Apply HALDCLUT with the style LUT
+            filter_parts.append(f"{video_stream}[1:v]haldclut[styled]")
+            print(f"   🌈 Applied style LUT (HALDCLUT .png): {os.path.basename(style_lut)}")
+            
+            # Apply scaling
+            filter_parts.append(f"[styled]scale={target_width}:{target_height}")
+            
+            filter_complex = ";".join(filter_parts)
+        else:
+            # Simple filter chain for non-HALDCLUT processing
+            filters = []
+            
+            # Add correction LUT (cube files only)
+            if correction_lut and os.path.exists(correction_lut):
+                if correction_lut.lower().endswith('.cube'):
+                    filters.append(f"lut3d={correction_lut}:interp=tetrahedral")
+                    print(f"   🎨 Applied correction LUT (.cube): {os.path.basename(correction_lut)}")
+                else:
+                    print(f"   ⚠️ Correction LUT must be .cube format: {correction_lut}")
+            
+            # Add style LUT (cube only in this branch)
+            if style_lut and os.path.exists(style_lut) and style_lut.lower().endswith('.cube'):
+                filters.append(f"lut3d={style_lut}:interp=tetrahedral")
+                print(f"   🌈 Applied style LUT (.cube): {os.path.basename(style_lut)}")
+            
+            # Add scaling filter
+            filters.append(f"scale={target_width}:{target_height}")
+            
+            filter_complex = ",".join(filters)
+        
+        # Add filter and encoding options
+        cmd.extend(self._encoder_args())
+        
+        # Use filter_complex for multi-input filters (HALDCLUT), otherwise use vf
+        if has_haldclut:
+            cmd.extend(["-filter_complex", filter_complex])
+        else:
+            cmd.extend(["-vf", filter_complex])
+        
+        cmd.extend([
+            "-threads", str(self.ffmpeg_threads),  # Per-process threads (0 = all cores)
+            "-pix_fmt", "yuv420p",  # Force compatible pixel format for web playback
+        ])
+        
+        if video_info.get('audio_codec') == 'aac':
+            # Already web-playable audio: copy it rather than re-encode
+            cmd.extend(["-c:a", "copy"])
+        else:
+            cmd.extend([
+                "-acodec", "aac",  # Audio codec
+                "-ab", "128k",  # Audio bitrate (128k is good for most content)
+            ])
+        
+        cmd.extend([
+            "-movflags", MP4_MOVFLAGS,  # Streamable for progressive playback without a rewrite pass
+            "-avoid_negative_ts", "make_zero",  # Fix timing issues
+            "-y",  # Overwrite output file
+            output_path
+        ])
+        
+        lut_info = ""
+        if correction_lut or style_lut:
+            luts = []
+            if correction_lut:
+                luts.append(f"correction: {os.path.basename(correction_lut)}")
+            if style_lut:
+                luts.append(f"style: {os.path.basename(style_lut)}")
+            lut_info = f" + LUTs ({', '.join(luts)})"
+        
+        if self.encoder == SOFTWARE_ENCODER:
+            print(f"   🔄 Encoding with h.264 (CRF {self.crf}, preset {self.preset}){lut_info}...")
+        else:
+            print(f"   🔄 Encoding with h.264 ({self.encoder}){lut_info}...")
+        
+        return cmd
+    
     def generate_proxy(self, video_id: int, video_path: str, correction_lut: str = None, style_lut: str = None, force: bool = False) -> bool:
         """Generate h.264 proxy for a video."""
         if not os.path.exists(self.ffmpeg_path):
@@ -114,10 +459,14 @@ class VideoProxyGenerator:
             print(f"❌ Original video not found: {video_path}")
             return False
         
+        if not force and not self.needs_proxy(video_id, video_path, correction_lut, style_lut):
+            print(f"⏭️ Skipping: {os.path.basename(video_path)} (proxy up to date)")
+            return False
+        
         proxy_path = self.get_proxy_path(video_id)
         
         # Get original video info
-        video_info = self.get_video_info(video_path)
+        video_info = self.get_video_info(video_path, video_id)
         original_width = video_info.get('width', 1920)
         original_height = video_info.get('height', 1080)
         
@@ -127,119 +476,38 @@ class VideoProxyGenerator:
         print(f"🎬 Processing: {os.path.basename(video_path)} (ID: {video_id})")
         print(f"   📐 Original: {original_width}x{original_height} → Target: {target_width}x{target_height}")
         
+        # Encode to a hidden sibling and move it into place only once it's complete
+        temp_path = str(self.proxy_dir / f".{video_id}.partial.mp4")
         try:
-            # Create temporary output file first (safer for concurrent access)
-            with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False, dir=self.proxy_dir) as temp_file:
-                temp_path = temp_file.name
-            
-            # Build FFmpeg command with proper LUT handling
-            cmd = [self.ffmpeg_path, "-i", video_path]
-            
-            # Handle HALDCLUT PNG as separate input
-            has_haldclut = (style_lut and os.path.exists(style_lut) and 
-                           style_lut.lower().endswith('.png'))
-            
-            if has_haldclut:
-                cmd.extend(["-i", style_lut])
-                print(f"   🌈 Added HALDCLUT input: {os.path.basename(style_lut)}")
-            
-            # Build video filter chain - handle HALDCLUT specially
-            if has_haldclut:
-                # For HALDCLUT, we need to use filter_complex with proper syntax
-                filter_parts = []
-                
-                # Start with video input and apply any correction LUT
-                video_stream = "[0:v]"
-                if correction_lut and os.path.exists(correction_lut) and correction_lut.lower().endswith('.cube'):
-                    filter_parts.append(f"{video_stream}lut3d={correction_lut}[corrected]")
-                    video_stream = "[corrected]"
-                    print(f"   🎨 Applied correction LUT (.cube): {os.path.basename(correction_lut)}")
-                
-                # Apply HALDCLUT with the style LUT
-                filter_parts.append(f"{video_stream}[1:v]haldclut[styled]")
-                print(f"   🌈 Applied style LUT (HALDCLUT .png): {os.path.basename(style_lut)}")
-                
-                # Apply scaling
-                filter_parts.append(f"[styled]scale={target_width}:{target_height}")
-                
-                filter_complex = ";".join(filter_parts)
-            else:
-                # Simple filter chain for non-HALDCLUT processing
-                filters = []
-                
-                # Add correction LUT (cube files only)
-                if correction_lut and os.path.exists(correction_lut):
-                    if correction_lut.lower().endswith('.cube'):
-                        filters.append(f"lut3d={correction_lut}")
-                        print(f"   🎨 Applied correction LUT (.cube): {os.path.basename(correction_lut)}")
-                    else:
-                        print(f"   ⚠️ Correction LUT must be .cube format: {correction_lut}")
-                
-                # Add style LUT (cube only in this branch)
-                if style_lut and os.path.exists(style_lut) and style_lut.lower().endswith('.cube'):
-                    filters.append(f"lut3d={style_lut}")
-                    print(f"   🌈 Applied style LUT (.cube): {os.path.basename(style_lut)}")
-                
-                # Add scaling filter
-                filters.append(f"scale={target_width}:{target_height}")
-                
-                filter_complex = ",".join(filters)
-            
-            # Add filter and encoding options
-            cmd.extend([
-                "-vcodec", "libx264",  # h.264 codec
-                "-preset", "ultrafast" if (correction_lut or style_lut) else self.preset,  # Use faster preset for LUT processing
-                "-crf", str(self.crf),  # Quality setting (lower = better quality, bigger file)
-            ])
-            
-            # Use filter_complex for multi-input filters (HALDCLUT), otherwise use vf
-            if has_haldclut:
-                cmd.extend(["-filter_complex", filter_complex])
+            if self._can_remux(video_info, correction_lut, style_lut):
+                # Already proxy-shaped: rewrap the streams into MP4 without transcoding
+                print("   ⚡ Remux-only path (H.264/AAC source, no LUTs)")
+                cmd = [self.ffmpeg_path, *FFMPEG_QUIET, *INPUT_PROBE_ARGS, "-i", video_path,
+                       "-map", "0:v:0", "-map", "0:a:0?", "-c", "copy",
+                       "-movflags", MP4_MOVFLAGS, "-y", temp_path]
             else:
-                cmd.extend(["-vf", filter_complex])
-            
-            cmd.extend([
-                "-threads", "0",  # Use all CPU cores
-                "-pix_fmt", "yuv420p",  # Force compatible pixel format for web playback
-                "-acodec", "aac",  # Audio codec
-                "-ab", "128k",  # Audio bitrate (128k is good for most content)
-                "-movflags", "faststart",  # Optimize for web streaming with progressive buffering
-                "-avoid_negative_ts", "make_zero",  # Fix timing issues
-                "-progress", "pipe:1",  # Show progress
-                "-y",  # Overwrite output file
-                temp_path
-            ])
-            
-            lut_info = ""
-            if correction_lut or style_lut:
-                luts = []
-                if correction_lut:
-                    luts.append(f"correction: {os.path.basename(correction_lut)}")
-                if style_lut:
-                    luts.append(f"style: {os.path.basename(style_lut)}")
-                lut_info = f" + LUTs ({', '.join(luts)})"
+                cmd = self._build_encode_command(video_path, temp_path, video_info, target_width, target_height,
+                                                 correction_lut, style_lut)
             
-            print(f"   🔄 Encoding with h.264 (CRF {self.crf}, preset {self.preset}){lut_info}...")
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)  # 60 minute timeout for LUT processing
+            # Only errors reach stderr, so capture that alone; 60 minute timeout for LUT processing
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    bufsize=PIPE_BUFSIZE, timeout=3600)
             
             if result.returncode == 0 and os.path.exists(temp_path):
-                # Move temporary file to final location
-                os.rename(temp_path, proxy_path)
+                # Move temporary file to final location (atomic on POSIX)
+                os.replace(temp_path, proxy_path)
                 
                 # Get file size info
                 original_size = os.path.getsize(video_path)
                 proxy_size = os.path.getsize(proxy_path)
                 compression_ratio = (1 - proxy_size / original_size) * 100
                 
+                self._record_state(video_id, video_path, correction_lut, style_lut)
                 print(f"   ✅ Generated: {proxy_path.name}")
                 print(f"   📊 Size: {original_size/1024/1024:.1f}MB → {proxy_size/1024/1024:.1f}MB ({compression_ratio:.1f}% smaller)")
                 return True
             else:
-                # Clean up failed temp file
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
-                print(f"   ❌ FFmpeg failed: {result.stderr}")
+                print(f"   ❌ FFmpeg failed: {result.stderr.decode(errors='replace')}")
                 return False
                 
         except subprocess.TimeoutExpired:
@@ -248,8 +516,86 @@ class VideoProxyGenerator:
         except Exception as e:
             print(f"   ❌ Error: {e}")
             return False
+        finally:
+            # Clean up a failed or interrupted encode
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    def generate_multi_proxy(self, video_id: int, sizes: list = ((1920, 1080), (1280, 720)),
+                             correction_lut: str = None, style_lut: str = None) -> bool:
+        """Generate several proxy sizes for a video from a single ffmpeg run.
+        
+        The source is decoded and LUT-graded once, then split into one scale/encode branch
+        per size, instead of repeating the decode and LUTs for every rendition.
+        """
+        row = self.conn.execute("SELECT path FROM images WHERE id = ? AND file_type = 'video'", (video_id,)).fetchone()
+        if not row:
+            print(f"❌ Video ID {video_id} not found in database")
+            return False
+        video_path = row['path']
+        if not os.path.exists(self.ffmpeg_path):
+            print(f"❌ ffmpeg not found at {self.ffmpeg_path}")
+            return False
+        if not os.path.exists(video_path):
+            print(f"❌ Original video not found: {video_path}")
+            return False
+        if self.encoder is None:
+            self.encoder = self._detect_encoder()
+        
+        video_info = self.get_video_info(video_path, video_id)
+        print(f"🎬 Processing: {os.path.basename(video_path)} (ID: {video_id}) → {len(sizes)} renditions")
+        
+        # Shared part of the graph: decode → correction LUT → style LUT (.cube or HALDCLUT)
+        cmd = [self.ffmpeg_path, *FFMPEG_QUIET, *INPUT_PROBE_ARGS, "-i", video_path]
+        grade = [f"lut3d={lut}:interp=tetrahedral" for lut in (correction_lut, style_lut)
+                 if lut and os.path.exists(lut) and lut.lower().endswith('.cube')]
+        graph = "[0:v]" + (",".join(grade) or "null")
+        if style_lut and os.path.exists(style_lut) and style_lut.lower().endswith('.png'):
+            cmd.extend(["-i", style_lut])
+            graph += "[graded];[graded][1:v]haldclut"
+        labels = [f"[s{i}]" for i in range(len(sizes))]
+        graph += f",split={len(sizes)}" + "".join(labels)
+        
+        # One scale branch per rendition, fitted inside the box with even dimensions
+        outputs = []
+        for i, (width, height) in enumerate(sizes):
+            graph += (f";{labels[i]}scale={width}:{height}:force_original_aspect_ratio=decrease"
+                      f":force_divisible_by=2[v{i}]")
+            outputs.append((f"[v{i}]", self.get_rendition_path(video_id, width, height)))
+        cmd.extend(["-filter_complex", graph])
+        
+        audio_args = ["-c:a", "copy"] if video_info.get('audio_codec') == 'aac' else ["-acodec", "aac", "-ab", "128k"]
+        temp_paths = []
+        for label, output_path in outputs:
+            temp_path = output_path.with_name(f".{output_path.stem}.partial.mp4")
+            temp_paths.append(temp_path)
+            cmd.extend(["-map", label, "-map", "0:a:0?"])
+            cmd.extend(self._encoder_args())
+            cmd.extend(["-threads", str(self.ffmpeg_threads), "-pix_fmt", "yuv420p"])
+            cmd.extend(audio_args)
+            cmd.extend(["-movflags", MP4_MOVFLAGS, "-y", str(temp_path)])
+        
+        try:
+            result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                    bufsize=PIPE_BUFSIZE, timeout=3600)
+        except subprocess.TimeoutExpired:
+            print(f"   ⏰ Encoding timeout (>60 minutes)")
+            result = None
+        
+        if result is None or result.returncode != 0:
+            for temp_path in temp_paths:
+                if temp_path.exists():
+                    temp_path.unlink()
+            if result is not None:
+                print(f"   ❌ FFmpeg failed: {result.stderr.decode(errors='replace')}")
+            return False
+        
+        for temp_path, (_, output_path) in zip(temp_paths, outputs):
+            os.replace(temp_path, output_path)
+            print(f"   ✅ Generated: {output_path.name} ({output_path.stat().st_size/1024/1024:.1f}MB)")
+        return True
     
-    def batch_generate(self, limit: int = None, force: bool = False) -> dict:
+    def batch_generate(self, limit: int = None, force: bool = False, workers: int = None) -> dict:
         """Generate proxies for all videos in database."""
         cursor = self.conn.cursor()
         
@@ -284,56 +630,113 @@ class VideoProxyGenerator:
         print(f"📹 Found {stats['total']} videos in database")
         print(f"🎯 Target: max {self.target_max_dimension}px longest edge, h.264, CRF {self.crf}")
         print(f"📁 Output: {self.proxy_dir}")
-        print()
         
-        for i, video in enumerate(videos):
-            video_id = video['id']
-            video_path = video['path']
-            filename = video['filename']
-            
+        todo = []
+        for video in videos:
             try:
-                if not force and not self.needs_proxy(video_id, video_path):
-                    print(f"⏭️ Skipping: {filename} (proxy up to date)")
+                if not force and not self.needs_proxy(video['id'], video['path']):
+                    print(f"⏭️ Skipping: {video['filename']} (proxy up to date)")
                     stats['skipped'] += 1
                     continue
-                
-                if self.generate_proxy(video_id, video_path, force=force):
+            except Exception as e:
+                print(f"❌ Error processing {video['filename']}: {e}")
+                stats['errors'] += 1
+                continue
+            # Rebuilt with the LUTs it was graded with, so a picks proxy keeps its look
+            todo.append((video['id'], video['path'], *self.stored_luts(video['id'])))
+        
+        return self._encode_jobs(todo, stats, workers)
+    
+    def _encode_jobs(self, todo: list, stats: dict, workers: int = None) -> dict:
+        """Encode (video_id, video_path, correction_lut, style_lut) jobs, updating stats."""
+        # A single x264 process stops scaling well long before it fills a big machine, so run
+        # several at once, each pinned to its share of the cores. Workers live for the whole
+        # run, so LUT files and encoder setup stay warm from one clip to the next.
+        if self.encoder is None:
+            self.encoder = self._detect_encoder()
+        workers, ffmpeg_threads = resolve_parallelism(workers, self.ffmpeg_threads or None)
+        if len(todo) < workers:
+            # Fewer videos than workers: hand the idle workers' cores to the ones that run
+            workers, ffmpeg_threads = resolve_parallelism(max(1, len(todo)), self.ffmpeg_threads or None)
+        self.ffmpeg_threads = ffmpeg_threads
+        print(f"⚙️ Encoding {len(todo)} videos: {workers} at a time, {self.ffmpeg_threads} ffmpeg threads each")
+        print()
+        
+        executor = None
+        if workers > 1:
+            settings = {
+                'ffmpeg_path': self.ffmpeg_path,
+                'crf': self.crf,
+                'preset': self.preset,
+                'encoder': self.encoder,
+                'ffmpeg_threads': self.ffmpeg_threads,
+            }
+            luts = sorted({lut for job in todo for lut in job[2:] if lut})
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(self.db_path, str(self.proxy_dir), settings, luts))
+            outcomes = executor.map(_generate_proxy, todo, chunksize=1)
+        else:
+            # Inline: output is printed and state queued directly, nothing to replay
+            outcomes = ((self.generate_proxy(*job, force=True), '', ()) for job in todo)
+        
+        try:
+            for i, (success, output, states) in enumerate(outcomes):
+                print(output, end='')
+                self._state_updates.extend(states)
+                if success:
                     stats['generated'] += 1
                 else:
                     stats['errors'] += 1
                 
                 # Progress update every 5 videos
                 if (i + 1) % 5 == 0:
-                    print(f"\n📈 Progress: {i + 1}/{stats['total']} videos processed")
+                    print(f"\n📈 Progress: {i + 1}/{len(todo)} videos encoded")
                     print(f"   ✅ Generated: {stats['generated']}, ⏭️ Skipped: {stats['skipped']}, ❌ Errors: {stats['errors']}\n")
-                
-            except KeyboardInterrupt:
-                print("\n⚠️ Generation interrupted by user")
-                break
-            except Exception as e:
-                print(f"❌ Error processing {filename}: {e}")
-                stats['errors'] += 1
+        except KeyboardInterrupt:
+            print("\n⚠️ Generation interrupted by user")
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        finally:
+            if executor:
+                executor.shutdown()
+            self._save_proxy_state()
         
         return stats
     
+    def _scan_proxies(self):
+        """List (video_id, DirEntry) for every proxy and rendition with a single directory scan.
+        
+        DirEntry caches its stat() result, so callers only pay for it if they need it.
+        """
+        proxies = []
+        with os.scandir(self.proxy_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.mp4'):
+                    try:
+                        # Video ID is the filename, before the _WxH of a rendition;
+                        # temp files (.<id>.partial.mp4) don't parse
+                        proxies.append((int(entry.name[:-4].split('_', 1)[0]), entry))
+                    except ValueError:
+                        continue
+        return proxies
+    
     def clean_orphaned(self) -> int:
         """Remove proxy files for videos no longer in database."""
         cursor = self.conn.cursor()
         cursor.execute("SELECT id FROM images WHERE file_type = 'video'")
         valid_ids = {row[0] for row in cursor.fetchall()}
         
+        # Scan the directory rather than trusting video_proxies, which misses proxies made
+        # before it existed
         removed = 0
-        for proxy_file in self.proxy_dir.glob("*.mp4"):
-            try:
-                # Extract video ID from filename
-                video_id = int(proxy_file.stem)
-                if video_id not in valid_ids:
-                    proxy_file.unlink()
-                    print(f"🗑️ Removed orphaned proxy: {proxy_file.name}")
-                    removed += 1
-            except ValueError:
-                # Invalid filename format, skip
-                continue
+        for video_id, entry in self._scan_proxies():
+            if video_id not in valid_ids:
+                os.unlink(entry.path)
+                print(f"🗑️ Removed orphaned proxy: {entry.name}")
+                removed += 1
+        
+        with self.conn:
+            self.conn.execute("DELETE FROM video_proxies WHERE image_id NOT IN (SELECT id FROM images WHERE file_type = 'video')")
         
         return removed
     
@@ -343,8 +746,9 @@ class VideoProxyGenerator:
         cursor.execute("SELECT COUNT(*) FROM images WHERE file_type = 'video'")
         total_videos = cursor.fetchone()[0]
         
-        total_proxies = len(list(self.proxy_dir.glob("*.mp4")))
-        cache_size = sum(f.stat().st_size for f in self.proxy_dir.glob("*.mp4"))
+        proxies = self._scan_proxies()
+        total_proxies = len({video_id for video_id, _ in proxies})
+        cache_size = sum(entry.stat().st_size for _, entry in proxies)
         
         return {
             'total_videos': total_videos,
@@ -353,11 +757,12 @@ class VideoProxyGenerator:
             'cache_path': str(self.proxy_dir)
         }
     
-    def process_picks_file(self, picks_file: str, correction_lut: str = None, style_lut: str = None, force: bool = False) -> dict:
+    def process_picks_file(self, picks_file: str, correction_lut: str = None, style_lut: str = None, force: bool = False,
+                           workers: int = None) -> dict:
         """Generate proxies for videos in a JSON picks file."""
         try:
-            with open(picks_file, 'r') as f:
-                picks = json.load(f)
+            with open(picks_file, 'rb') as f:
+                picks = _json_loads(f.read())
         except Exception as e:
             print(f"❌ Error reading picks file: {e}")
             return {'total': 0, 'generated': 0, 'skipped': 0, 'errors': 1}
@@ -365,6 +770,7 @@ class VideoProxyGenerator:
         cursor = self.conn.cursor()
         stats = {'total': 0, 'generated': 0, 'skipped': 0, 'errors': 0}
         
+        todo = []
         for pick in picks:
             image_id = pick.get('id')
             if not image_id:
@@ -382,15 +788,17 @@ class VideoProxyGenerator:
             stats['total'] += 1
             video_path = row['path']
             
-            if self.generate_proxy(row['id'], video_path, correction_lut, style_lut, force):
-                stats['generated'] += 1
+            if not os.path.exists(video_path):
+                print(f"❌ Original video not found: {video_path}")
+                stats['errors'] += 1
+            elif not force and not self.needs_proxy(row['id'], video_path, correction_lut, style_lut):
+                print(f"⏭️ Skipping: {row['filename']} (proxy up to date)")
+                stats['skipped'] += 1
             else:
-                if force or self.needs_proxy(row['id'], video_path):
-                    stats['errors'] += 1
-                else:
-                    stats['skipped'] += 1
+                todo.append((row['id'], video_path, correction_lut, style_lut))
         
-        return stats
+        # Picks share their LUTs, so run them through the same worker pool as batch mode
+        return self._encode_jobs(todo, stats, workers)
     
     def process_single_video(self, video_path: str, correction_lut: str = None, style_lut: str = None, force: bool = False) -> dict:
         """Generate proxy for a single video file."""
@@ -409,11 +817,12 @@ class VideoProxyGenerator:
         if self.generate_proxy(row['id'], video_path, correction_lut, style_lut, force):
             stats['generated'] = 1
         else:
-            if force or self.needs_proxy(row['id'], video_path):
+            if force or self.needs_proxy(row['id'], video_path, correction_lut, style_lut):
                 stats['errors'] = 1
             else:
                 stats['skipped'] = 1
         
+        self._save_proxy_state()
         return stats
     
     def process_single_video_by_id(self, video_id: int, correction_lut: str = None, style_lut: str = None, force: bool = False) -> dict:
@@ -433,13 +842,46 @@ class VideoProxyGenerator:
         if self.generate_proxy(row['id'], row['path'], correction_lut, style_lut, force):
             stats['generated'] = 1
         else:
-            if force or self.needs_proxy(row['id'], row['path']):
+            if force or self.needs_proxy(row['id'], row['path'], correction_lut, style_lut):
                 stats['errors'] = 1
             else:
                 stats['skipped'] = 1
         
+        self._save_proxy_state()
         return stats
 
+# Per-process generator for batch_generate's worker pool
+_worker_generator = None
+
+def _init_worker(db_path, proxy_dir, settings, luts=()):
+    """Create one generator per worker process with the parent's encoder settings.
+    
+    The LUT files are read once up front so every ffmpeg run in this worker loads them
+    from the page cache.
+    """
+    global _worker_generator
+    _worker_generator = VideoProxyGenerator(db_path, proxy_dir)
+    for name, value in settings.items():
+        setattr(_worker_generator, name, value)
+    for lut in luts:
+        try:
+            with open(lut, 'rb') as f:
+                while f.read(1 << 20):
+                    pass
+        except OSError:
+            pass  # Reported by generate_proxy when it builds the filter
+
+def _generate_proxy(job):
+    """Worker entry point: (success, captured output, state rows) for one
+    (video_id, video_path, correction_lut, style_lut) job."""
+    output = io.StringIO()
+    with redirect_stdout(output):
+        # Up-to-date videos were already filtered out before the job was queued
+        success = _worker_generator.generate_proxy(*job, force=True)
+    # Hand the new video_proxies rows to the parent, which owns the writes
+    states, _worker_generator._state_updates = _worker_generator._state_updates, []
+    return success, output.getvalue(), states
+
 def main():
     parser = argparse.ArgumentParser(description='Generate h.264 video proxies for fast gallery playback')
     parser.add_argument('--db', default=None, help='Database file path (auto-detected if not specified)')
@@ -449,12 +891,20 @@ def main():
     parser.add_argument('--clean', action='store_true', help='Remove orphaned proxy files')
     parser.add_argument('--stats', action='store_true', help='Show proxy statistics')
     parser.add_argument('--crf', type=int, default=23, help='Quality setting (lower=better, 18-28 recommended)')
+    parser.add_argument('--workers', type=int, help='Videos to encode at once in batch mode (default: CPU cores / ffmpeg threads, or $DIY_PHOTO_FFMPEG_WORKERS)')
+    parser.add_argument('--ffmpeg-threads', type=int, help=f'Threads per ffmpeg process (default: {DEFAULT_FFMPEG_THREADS} in batch mode, all cores otherwise, or $DIY_PHOTO_FFMPEG_THREADS)')
+    parser.add_argument('--preset', default='faster',
+                        choices=['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow', 'placebo'],
+                        help='x264 encoder preset (default: faster)')
+    parser.add_argument('--encoder', default='auto', choices=['auto', SOFTWARE_ENCODER, 'h264_nvenc', 'h264_videotoolbox'],
+                        help='H.264 encoder (default: auto - hardware when available, else libx264)')
     parser.add_argument('--max-dimension', type=int, default=2732, help='Maximum dimension (longest edge) in pixels (default: 2732 for iPad Pro)')
     
     # New input options
     parser.add_argument('--picks-file', help='JSON picks file containing video IDs to process')
     parser.add_argument('--video-file', help='Single video file path to process')
     parser.add_argument('--video-id', type=int, help='Single video database ID to process')
+    parser.add_argument('--renditions', help='With --video-id: comma-separated WxH sizes to encode in one pass (e.g. 1920x1080,1280x720)')
     
     # LUT options
     parser.add_argument('--correction-lut', help='Path to correction LUT (.cube file)')
@@ -462,69 +912,82 @@ def main():
     
     args = parser.parse_args()
     
-    generator = VideoProxyGenerator(args.db, args.proxy_dir)
-    
-    # Override default settings if specified
-    if args.crf:
-        generator.crf = args.crf
-    if args.max_dimension:
-        generator.target_max_dimension = args.max_dimension
-    
-    if args.stats:
-        stats = generator.get_stats()
-        print("\n📊 VIDEO PROXY STATISTICS")
+    with VideoProxyGenerator(args.db, args.proxy_dir) as generator:
+        # Override default settings if specified
+        if args.crf:
+            generator.crf = args.crf
+        if args.preset:
+            generator.preset = args.preset
+        if args.max_dimension:
+            generator.target_max_dimension = args.max_dimension
+        if args.encoder != 'auto':
+            generator.encoder = args.encoder
+        if args.ffmpeg_threads or os.environ.get('DIY_PHOTO_FFMPEG_THREADS'):
+            _, generator.ffmpeg_threads = resolve_parallelism(args.workers, args.ffmpeg_threads)
+        
+        if args.stats:
+            stats = generator.get_stats()
+            print("\n📊 VIDEO PROXY STATISTICS")
+            print("-" * 40)
+            print(f"Total videos in database: {stats['total_videos']}")
+            print(f"Proxy directory: {stats['cache_path']}")
+            print(f"Cache size: {stats['cache_size_mb']:.1f} MB")
+            print(f"Total proxies: {stats['total_proxies']}")
+            coverage = (stats['total_proxies'] / stats['total_videos']) * 100 if stats['total_videos'] > 0 else 0
+            print(f"Coverage: {coverage:.1f}%")
+            return
+        
+        if args.clean:
+            print("🧹 Cleaning orphaned video proxies...")
+            removed = generator.clean_orphaned()
+            print(f"✅ Removed {removed} orphaned proxy files")
+            return
+        
+        # Determine processing mode and generate proxies
+        print("🚀 Starting video proxy generation...")
+        if generator.encoder is None:
+            generator.encoder = generator._detect_encoder()
+        print(f"🖥️ Encoder: {generator.encoder}")
+        print(f"🎯 Settings: max {generator.target_max_dimension}px longest edge, CRF {generator.crf}, preset {generator.preset}")
+        
+        if args.correction_lut or args.style_lut:
+            luts = []
+            if args.correction_lut:
+                luts.append(f"correction: {os.path.basename(args.correction_lut)}")
+            if args.style_lut:
+                luts.append(f"style: {os.path.basename(args.style_lut)}")
+            print(f"🎨 LUTs: {', '.join(luts)}")
+        print()
+        
+        # Choose processing mode
+        if args.picks_file:
+            print(f"📄 Processing videos from picks file: {args.picks_file}")
+            stats = generator.process_picks_file(args.picks_file, args.correction_lut, args.style_lut, args.force, args.workers)
+        elif args.video_file:
+            print(f"🎬 Processing single video file: {args.video_file}")
+            stats = generator.process_single_video(args.video_file, args.correction_lut, args.style_lut, args.force)
+        elif args.video_id and args.renditions:
+            print(f"🆔 Processing renditions for video ID: {args.video_id}")
+            sizes = [tuple(int(n) for n in size.lower().split('x')) for size in args.renditions.split(',')]
+            success = generator.generate_multi_proxy(args.video_id, sizes, args.correction_lut, args.style_lut)
+            stats = {'total': 1, 'generated': int(success), 'skipped': 0, 'errors': int(not success)}
+        elif args.video_id:
+            print(f"🆔 Processing single video ID: {args.video_id}")
+            stats = generator.process_single_video_by_id(args.video_id, args.correction_lut, args.style_lut, args.force)
+        else:
+            print("📁 Processing all videos in database (batch mode)")
+            stats = generator.batch_generate(args.limit, args.force, args.workers)
+        
+        print(f"\n📊 GENERATION COMPLETE")
         print("-" * 40)
-        print(f"Total videos in database: {stats['total_videos']}")
-        print(f"Proxy directory: {stats['cache_path']}")
-        print(f"Cache size: {stats['cache_size_mb']:.1f} MB")
-        print(f"Total proxies: {stats['total_proxies']}")
-        coverage = (stats['total_proxies'] / stats['total_videos']) * 100 if stats['total_videos'] > 0 else 0
-        print(f"Coverage: {coverage:.1f}%")
-        return
-    
-    if args.clean:
-        print("🧹 Cleaning orphaned video proxies...")
-        removed = generator.clean_orphaned()
-        print(f"✅ Removed {removed} orphaned proxy files")
-        return
-    
-    # Determine processing mode and generate proxies
-    print("🚀 Starting video proxy generation...")
-    print(f"🎯 Settings: max {generator.target_max_dimension}px longest edge, CRF {generator.crf}, preset {generator.preset}")
-    
-    if args.correction_lut or args.style_lut:
-        luts = []
-        if args.correction_lut:
-            luts.append(f"correction: {os.path.basename(args.correction_lut)}")
-        if args.style_lut:
-            luts.append(f"style: {os.path.basename(args.style_lut)}")
-        print(f"🎨 LUTs: {', '.join(luts)}")
-    print()
-    
-    # Choose processing mode
-    if args.picks_file:
-        print(f"📄 Processing videos from picks file: {args.picks_file}")
-        stats = generator.process_picks_file(args.picks_file, args.correction_lut, args.style_lut, args.force)
-    elif args.video_file:
-        print(f"🎬 Processing single video file: {args.video_file}")
-        stats = generator.process_single_video(args.video_file, args.correction_lut, args.style_lut, args.force)
-    elif args.video_id:
-        print(f"🆔 Processing single video ID: {args.video_id}")
-        stats = generator.process_single_video_by_id(args.video_id, args.correction_lut, args.style_lut, args.force)
-    else:
-        print("📁 Processing all videos in database (batch mode)")
-        stats = generator.batch_generate(args.limit, args.force)
-    
-    print(f"\n📊 GENERATION COMPLETE")
-    print("-" * 40)
-    print(f"Total videos: {stats['total']}")
-    print(f"Generated: {stats['generated']}")
-    print(f"Skipped: {stats['skipped']}")
-    print(f"Errors: {stats['errors']}")
-    
-    if stats['generated'] > 0:
-        print(f"\n💡 Video proxies stored in: {generator.proxy_dir}")
-        print("💡 Proxies optimized for retina displays with h.264 compression")
+        print(f"Total videos: {stats['total']}")
+        print(f"Generated: {stats['generated']}")
+        print(f"Skipped: {stats['skipped']}")
+        print(f"Errors: {stats['errors']}")
+        
+        if stats['generated'] > 0:
+            print(f"\n💡 Video proxies stored in: {generator.proxy_dir}")
+            print("💡 Proxies optimized for retina displays with h.264 compression")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,20 +4,74 @@ Quick Galleries JSON Rebuilder
 Regenerates the main galleries.json file by scanning Hard Link Galleries directory.
 """
 
+import argparse
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def rebuild_galleries_json():
-    """Rebuild galleries.json by scanning Hard Link Galleries directory."""
+# Parse and write JSON with orjson's C implementation when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj, pretty=False):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj, pretty=False):
+        return json.dumps(obj, indent=2 if pretty else None, separators=None if pretty else (',', ':')).encode()
+
+def count_gallery_images(json_file):
+    """Number of entries in a gallery's image_data.json.
+    
+    The count is cached in an image_data.meta.json sidecar together with the size and mtime
+    of the JSON it was taken from, so unchanged galleries are not parsed again. Raises
+    json.JSONDecodeError for an invalid gallery file.
+    """
+    json_stat = json_file.stat()
+    meta_file = json_file.with_name("image_data.meta.json")
+    try:
+        with open(meta_file, 'rb') as f:
+            meta = _json_loads(f.read())
+        if meta.get("mtime") == json_stat.st_mtime and meta.get("size") == json_stat.st_size:
+            return meta["count"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    
+    # Sidecar missing or stale: parse the full gallery JSON
+    with open(json_file, 'rb') as f:
+        image_count = len(_json_loads(f.read()))
+    
+    try:
+        meta_file.write_bytes(_json_dumps({"count": image_count, "mtime": json_stat.st_mtime, "size": json_stat.st_size}))
+    except OSError:
+        pass  # Read-only gallery; just count again next time
+    return image_count
+
+def _count_gallery(json_file):
+    """(image count, None) for a gallery, or (None, exception) if it can't be read."""
+    try:
+        return count_gallery_images(json_file), None
+    except Exception as e:
+        return None, e
+
+def rebuild_galleries_json(pretty=False, base_dir=None):
+    """Rebuild galleries.json by scanning Hard Link Galleries directory.
+    
+    The file is written compact (it's only read by the web interface) unless pretty is set.
+    base_dir is the toolkit directory; by default it is found from the current directory.
+    """
     print("🔨 Rebuilding main gallery list...")
     
-    # Determine if we're running from Scripts/ or main directory
-    current_dir = Path.cwd()
-    if current_dir.name == "Scripts":
-        base_dir = current_dir.parent
+    if base_dir is not None:
+        base_dir = Path(base_dir)
+    elif Path.cwd().name == "Scripts":
+        # Running from Scripts/ rather than the main directory
+        base_dir = Path.cwd().parent
     else:
-        base_dir = current_dir
+        base_dir = Path.cwd()
     
     galleries = []
     hard_link_path = base_dir / "Hard Link Galleries"
@@ -28,35 +82,36 @@ def rebuild_galleries_json():
     
     total_images = 0
     
+    candidates = []
     for gallery_dir in hard_link_path.iterdir():
         if gallery_dir.is_dir() and not gallery_dir.name.startswith('.'):
-            gallery_name = gallery_dir.name
             json_file = gallery_dir / "image_data.json"
-            
             if json_file.exists():
-                try:
-                    # Read the JSON to get image count and verify it's valid
-                    with open(json_file, 'r') as f:
-                        gallery_data = json.load(f)
-                    
-                    image_count = len(gallery_data)
-                    total_images += image_count
-                    
-                    gallery_info = {
-                        "name": gallery_name,
-                        "jsonPath": str(json_file.relative_to(base_dir)),
-                        "imageCount": image_count
-                    }
-                    
-                    galleries.append(gallery_info)
-                    print(f"✅ Found gallery: {gallery_name} ({image_count} images)")
-                    
-                except json.JSONDecodeError:
-                    print(f"⚠️ Skipping {gallery_name}: Invalid JSON file")
-                except Exception as e:
-                    print(f"⚠️ Error reading {gallery_name}: {e}")
+                candidates.append(json_file)
             else:
-                print(f"⚠️ Skipping {gallery_name}: No image_data.json found")
+                print(f"⚠️ Skipping {gallery_dir.name}: No image_data.json found")
+    
+    # Reading and parsing gallery files is mostly I/O, so overlap it across threads
+    with ThreadPoolExecutor(max_workers=min(32, len(candidates) or 1)) as executor:
+        results = list(executor.map(_count_gallery, candidates))
+    
+    for json_file, (image_count, error) in zip(candidates, results):
+        gallery_name = json_file.parent.name
+        if isinstance(error, json.JSONDecodeError):
+            print(f"⚠️ Skipping {gallery_name}: Invalid JSON file")
+        elif error is not None:
+            print(f"⚠️ Error reading {gallery_name}: {error}")
+        else:
+            total_images += image_count
+            
+            gallery_info = {
+                "name": gallery_name,
+                "jsonPath": str(json_file.relative_to(base_dir)),
+                "imageCount": image_count
+            }
+            
+            galleries.append(gallery_info)
+            print(f"✅ Found gallery: {gallery_name} ({image_count} images)")
     
     # Sort by name (keep alphabetical for gallery list)
     galleries.sort(key=lambda x: x['name'])
@@ -64,8 +119,7 @@ def rebuild_galleries_json():
     # Write galleries.json
     galleries_file = base_dir / "JSON" / "galleries.json"
     try:
-        with open(galleries_file, 'w') as f:
-            json.dump(galleries, f, indent=2)
+        galleries_file.write_bytes(_json_dumps(galleries, pretty=pretty))
         
         print(f"\n🎉 Successfully rebuilt gallery list:")
         print(f"   📁 File: {galleries_file}")
@@ -83,11 +137,14 @@ if __name__ == "__main__":
     import sys
     
     # Script works from either Scripts/ directory or main directory
+    parser = argparse.ArgumentParser(description='Rebuild galleries.json from the Hard Link Galleries directory')
+    parser.add_argument('--pretty', action='store_true', help='Write indented JSON for reading by hand')
+    args = parser.parse_args()
     
     print("🚀 Quick Galleries JSON Rebuilder")
     print("-" * 40)
     
-    success = rebuild_galleries_json()
+    success = rebuild_galleries_json(pretty=args.pretty)
     
     if success:
         print("\n💡 Tip: Refresh your browser to see updated gallery list")
@@ -8,10 +8,25 @@ import sqlite3
 import os
 import sys
 import json
+import re
 import argparse
+import logging
+import logging.handlers
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 import subprocess
 
+# Parse gallery JSON with orjson's C parser when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Configuration - auto-detect paths
 if os.path.basename(os.getcwd()) == "Scripts":
     DB_FILE = "image_metadata.db"
@@ -26,61 +41,179 @@ else:
 DEFAULT_QUALITY = 98  # Higher JPEG quality for picks
 DEFAULT_CHROMA_SUBSAMPLING = 3  # Best quality (4:4:4)
 DEFAULT_TIMEOUT = 600  # 10 minutes per file for custom processing
+RAWTHERAPEE_BATCH_SIZE = 500  # Max files per rawtherapee-cli run (long runs leak memory)
 DEFAULT_CAMERA_STANDARD = "RawTherapee Presets/Standard_A7C.pp3"  # Default camera standard
 DEFAULT_STYLE_PRESET = "RawTherapee Presets/Provia.pp3"  # Default style for picks - vibrant, punchy colors
+DEFAULT_JOBS = max(1, (os.cpu_count() or 2) // 2)  # RawTherapee is multi-threaded itself, so half the cores
+
+# Last interactive preset choice, reused while the preset folder is unchanged
+SELECTION_CACHE = os.path.expanduser("~/.cache/diy_photo_tool/last_selection.json")
+
+# RAW file extensions supported
+RAW_EXTENSIONS = frozenset({'.cr2', '.cr3', '.nef', '.arw', '.dng', '.raf', '.orf', '.rw2', '.raw'})
+
+# Map camera models to standard profiles
+CAMERA_MAPPINGS = {
+    'A7C': 'Standard_A7C.pp3',
+    'LX100': 'Standard_LX100.pp3',
+    'X-E4': 'Standard_XE4.pp3',
+    'ILCE-6500': 'Standard_A6500.pp3',
+    'ILCE-7C': 'Standard_A7C.pp3',  # Sony A7C full model name
+    'DMC-LX100': 'Standard_LX100.pp3',  # Panasonic LX100 full model name
+}
+
+@lru_cache(maxsize=None)
+def discover_presets():
+    """Preset file name -> absolute path, scanned once; presets don't change mid-run.
+    
+    Resolves the folder once rather than each preset, so a large preset collection costs
+    one directory read instead of a realpath() per file.
+    """
+    presets_dir = os.path.realpath("RawTherapee Presets")
+    try:
+        with os.scandir(presets_dir) as entries:
+            return {entry.name: os.path.join(presets_dir, entry.name) for entry in entries
+                    if entry.name.endswith('.pp3') and entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+def get_available_presets():
+    """Get lists of available camera standards and style presets."""
+    presets = discover_presets()
+    if not presets:
+        return [], []
+    
+    all_presets = list(presets)
+    camera_standards = [p for p in all_presets if p.startswith("Standard_")]
+    style_presets = [p for p in all_presets if not p.startswith("Standard_")]
+    style_presets.insert(0, "None")  # Add "None" option to use no style preset
+    
+    return camera_standards, style_presets
+
+def _presets_dir_state():
+    """(resolved preset folder, its mtime) - changes whenever a preset is added or removed."""
+    presets_dir = os.path.realpath("RawTherapee Presets")
+    try:
+        return presets_dir, os.stat(presets_dir).st_mtime_ns
+    except OSError:
+        return None
+
+def load_last_selection():
+    """(camera_standard, style_preset) from the last interactive run, or None if stale."""
+    state = _presets_dir_state()
+    try:
+        with open(SELECTION_CACHE, 'rb') as f:
+            cached = _json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not state or not isinstance(cached, dict) or cached.get('presets_dir') != list(state):
+        return None
+    return cached.get('camera_standard'), cached.get('style_preset')
+
+def save_last_selection(camera_standard, style_preset):
+    """Remember an interactive preset choice for the next run."""
+    state = _presets_dir_state()
+    if not state:
+        return
+    tmp_path = f"{SELECTION_CACHE}.tmp"
+    try:
+        os.makedirs(os.path.dirname(SELECTION_CACHE), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({'presets_dir': list(state), 'camera_standard': camera_standard,
+                       'style_preset': style_preset}, f)
+        os.replace(tmp_path, SELECTION_CACHE)
+    except OSError as e:
+        print(f"⚠️ Could not save preset selection: {e}")
+
+# Max IDs per IN (...) query (SQLite variable limit)
+SQL_CHUNK_SIZE = 999
+
+# Per-pick messages go through this logger so --quiet can skip them; pool workers
+# buffer them and the main process prints them, so workers never contend for stdout
+logger = logging.getLogger("regenerate_raw_picks")
+
+def setup_logging(level=logging.INFO):
+    """Send per-pick log messages to stdout as bare lines, like the rest of the output."""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+# One pass over the model string instead of a substring scan per mapping. Each key is a
+# lookahead so overlapping keys (LX100 inside DMC-LX100) all still match.
+_CAMERA_KEYS = tuple(CAMERA_MAPPINGS)
+_CAMERA_RE = re.compile('|'.join(f'(?=(?P<c{i}>{re.escape(camera_key)}))'
+                                 for i, camera_key in enumerate(_CAMERA_KEYS)))
+
+@lru_cache(maxsize=64)
+def camera_standard_candidates(camera_model):
+    """Standard preset names matching an EXIF camera model, in CAMERA_MAPPINGS order.
+    
+    Picks usually come from a handful of bodies, so each model string is matched once.
+    """
+    matched = {int(match.lastgroup[1:])
+               for match in _CAMERA_RE.finditer((camera_model or '').upper())}
+    return tuple(CAMERA_MAPPINGS[_CAMERA_KEYS[i]] for i in sorted(matched))
 
 class RawPicksRegenerator:
     def __init__(self):
         self.db_path = DB_FILE
         self.picks_file = PICKS_FILE
         self.proxy_dir = Path(PROXY_DIR)
+        self.regenerated_image_ids = []  # Set by regenerate_picks
         self.proxy_dir.mkdir(exist_ok=True)
         
-    def check_rawtherapee_cli(self):
-        """Check if rawtherapee-cli is available."""
-        try:
-            result = subprocess.run(['rawtherapee-cli', '--help'], 
-                                  capture_output=True, text=True, timeout=10)
-            # RawTherapee CLI returns exit code 2 with --help, but still outputs version info
-            return 'RawTherapee' in result.stdout or 'command line' in result.stdout
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
-    
-    def get_camera_standard_from_exif(self, image_id):
-        """Get appropriate camera standard based on EXIF data from database."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        self._presets = discover_presets()  # Preset file name -> absolute path
         
-        cursor.execute("SELECT camera_make, camera_model FROM images WHERE id = ?", (image_id,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
-            return DEFAULT_CAMERA_STANDARD
-        
-        make = (result['camera_make'] or '').upper()
-        model = (result['camera_model'] or '').upper()
+        # Auto-detect gallery root
+        if os.path.basename(os.getcwd()) == "Scripts":
+            self.gallery_root = Path("../Hard Link Galleries")
+        else:
+            self.gallery_root = Path("Hard Link Galleries")
+        self._gallery_cache = {}  # gallery_name -> {FileName: image ID}, or None if unreadable
+        self._rt_cli = 'rawtherapee-cli'  # Absolute path once check_rawtherapee_cli() finds it
         
-        # Map camera models to standard profiles
-        camera_mappings = {
-            'A7C': 'Standard_A7C.pp3',
-            'LX100': 'Standard_LX100.pp3',
-            'X-E4': 'Standard_XE4.pp3',
-            'ILCE-6500': 'Standard_A6500.pp3',
-            'ILCE-7C': 'Standard_A7C.pp3',  # Sony A7C full model name
-            'DMC-LX100': 'Standard_LX100.pp3',  # Panasonic LX100 full model name
-        }
+        # One connection for the whole run instead of reopening it per pick
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-64000")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.row_factory = sqlite3.Row
+        self.ensure_schema()
+    
+    def ensure_schema(self):
+        """Add the RAW proxy columns to the images table if they don't exist yet."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(images)")}
+        with self.conn:
+            if 'raw_proxy_type' not in columns:
+                self.conn.execute("ALTER TABLE images ADD COLUMN raw_proxy_type TEXT")
+            if 'raw_processing_settings' not in columns:
+                self.conn.execute("ALTER TABLE images ADD COLUMN raw_processing_settings TEXT")
+    
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
         
-        # Find matching standard
-        for camera_key, standard_file in camera_mappings.items():
-            if camera_key in model:
-                standard_path = f"RawTherapee Presets/{standard_file}"
-                if Path(standard_path).exists():
-                    return standard_path
+    def check_rawtherapee_cli(self):
+        """Check if rawtherapee-cli is available.
         
-        # Fallback to default
-        return DEFAULT_CAMERA_STANDARD
+        A PATH lookup rather than running it; the resolved path is kept as argv[0]
+        so conversions don't search PATH again.
+        """
+        rt_cli = shutil.which('rawtherapee-cli')
+        if not rt_cli:
+            return False
+        self._rt_cli = rt_cli
+        return True
     
     def load_picks(self):
         """Load picks from JSON file."""
@@ -101,104 +234,72 @@ class RawPicksRegenerator:
             print(f"❌ Error reading picks file: {e}")
             return None
     
-    def get_image_id_from_gallery_json(self, gallery_name, filename):
-        """Get image ID from gallery JSON file by looking up filename."""
-        gallery_json_path = Path("Hard Link Galleries") / gallery_name / "image_data.json"
+    def load_gallery_image_ids(self, gallery_name):
+        """Map FileName -> image ID for a gallery's image_data.json (None if unreadable).
+        
+        Each gallery is parsed once per regenerator and cached.
+        """
+        if gallery_name in self._gallery_cache:
+            return self._gallery_cache[gallery_name]
+        
+        gallery_json_path = self.gallery_root / gallery_name / "image_data.json"
+        image_ids = None
         
         if not gallery_json_path.exists():
-            print(f"   ⚠️ Gallery JSON not found: {gallery_json_path}")
-            return None
+            logger.warning("   ⚠️ Gallery JSON not found: %s", gallery_json_path)
+        else:
+            try:
+                gallery_data = _json_loads(gallery_json_path.read_bytes())
+                
+                # First entry wins if a filename appears more than once
+                image_ids = {}
+                for item in gallery_data:
+                    if item.get('FileName'):
+                        image_ids.setdefault(item['FileName'], item.get('_imageId'))
+                
+            except Exception as e:
+                logger.warning("   ❌ Error reading gallery JSON: %s", e)
         
-        try:
-            with open(gallery_json_path, 'r') as f:
-                gallery_data = json.load(f)
-            
-            # Look for the filename in gallery data
-            for item in gallery_data:
-                if item.get('FileName') == filename:
-                    image_id = item.get('_imageId')
-                    original_path = item.get('_originalPath')
-                    print(f"   🔍 Found in gallery: ID {image_id}, original: {original_path}")
-                    return image_id
-            
-            print(f"   ⚠️ File not found in gallery JSON: {filename}")
-            return None
-            
-        except Exception as e:
-            print(f"   ❌ Error reading gallery JSON: {e}")
+        self._gallery_cache[gallery_name] = image_ids
+        return image_ids
+    
+    def get_image_id_from_gallery_json(self, gallery_name, filename):
+        """Get image ID from gallery JSON file by looking up filename."""
+        image_ids = self.load_gallery_image_ids(gallery_name)
+        if image_ids is None:
             return None
+        
+        if filename not in image_ids:
+            logger.warning("   ⚠️ File not found in gallery JSON: %s", filename)
+        return image_ids.get(filename)
     
     def get_raw_files_from_picks(self, picks):
         """Get RAW files from database that match the picks."""
         if not picks:
             return []
         
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        raw_files = []
-        for pick_entry in picks:
+        # First pass: resolve every pick to an image ID without touching the images table
+        resolved = {}  # position in picks -> image ID
+        legacy = []  # (position, filename) for plain filename picks
+        gallery_positions = set()
+        for pos, pick_entry in enumerate(picks):
             if not pick_entry:
                 continue
             
-            print(f"\n📷 Processing pick: {pick_entry}")
-            
             # Check if it's a numeric ID (new format)
             if isinstance(pick_entry, int) or (isinstance(pick_entry, str) and pick_entry.isdigit()):
-                image_id = int(pick_entry)
-                
-                # Look up the original file by image ID
-                cursor.execute("""
-                    SELECT id, path, filename, raw_proxy_type
-                    FROM images 
-                    WHERE id = ?
-                """, (image_id,))
-                
-                result = cursor.fetchone()
-                if result:
-                    # Check if it's a RAW file by extension
-                    file_ext = Path(result['filename']).suffix.lower()
-                    raw_extensions = {'.cr2', '.cr3', '.nef', '.arw', '.dng', '.raf', '.orf', '.rw2', '.raw'}
-                    
-                    if file_ext in raw_extensions:
-                        raw_files.append(result)
-                        print(f"   ✅ Found RAW file: {result['filename']} (ID: {result['id']})")
-                    else:
-                        print(f"   ⏭️ Original file is not RAW: {result['filename']}")
-                else:
-                    print(f"   ❌ Image ID {image_id} not found in database")
+                resolved[pos] = int(pick_entry)
             
             # Legacy support: Parse gallery_name/filename format or just filename
             elif isinstance(pick_entry, str) and '/' in pick_entry:
                 gallery_name, filename = pick_entry.split('/', 1)
                 
                 # Try to get image ID from gallery JSON first
-                image_id = self.get_image_id_from_gallery_json(gallery_name, filename)
-                
-                if image_id:
-                    # Look up the original file by image ID
-                    cursor.execute("""
-                        SELECT id, path, filename, raw_proxy_type
-                        FROM images 
-                        WHERE id = ?
-                    """, (image_id,))
-                    
-                    result = cursor.fetchone()
-                    if result:
-                        # Check if it's a RAW file by extension
-                        file_ext = Path(result['filename']).suffix.lower()
-                        raw_extensions = {'.cr2', '.cr3', '.nef', '.arw', '.dng', '.raf', '.orf', '.rw2', '.raw'}
-                        
-                        if file_ext in raw_extensions:
-                            raw_files.append(result)
-                            print(f"   ✅ Found RAW file: {result['filename']} (ID: {result['id']})")
-                        else:
-                            print(f"   ⏭️ Original file is not RAW: {result['filename']}")
-                    else:
-                        print(f"   ❌ Image ID {image_id} not found in database")
-                else:
-                    print(f"   ❌ Could not find image ID for: {pick_entry}")
+                resolved[pos] = self.get_image_id_from_gallery_json(gallery_name, filename)
+                gallery_positions.add(pos)
+            
             elif isinstance(pick_entry, str):
                 # Legacy fallback: direct filename lookup
                 filename = pick_entry
@@ -208,152 +309,144 @@ class RawPicksRegenerator:
                     original_filename = filename[9:]
                 else:
                     original_filename = filename
-                
-                # Look up in database
+                legacy.append((pos, original_filename))
+        
+        if legacy:
+            # One joined query for all legacy filenames instead of one LIKE scan per pick.
+            # filename LIKE '%name' also covers exact matches; newest matching ID wins.
+            # The temp table writes open a transaction: commit it on the way out so the
+            # connection doesn't hold a read snapshot (and later fail with "database is
+            # locked") for the rest of the run
+            with self.conn:
+                cursor.execute("CREATE TEMP TABLE IF NOT EXISTS picks_suffix (pos INTEGER PRIMARY KEY, suffix TEXT)")
+                cursor.execute("DELETE FROM picks_suffix")
+                cursor.executemany("INSERT INTO picks_suffix (pos, suffix) VALUES (?, ?)", legacy)
                 cursor.execute("""
-                    SELECT id, path, filename, raw_proxy_type
-                    FROM images 
-                    WHERE filename = ? OR filename LIKE ?
-                    ORDER BY id DESC
-                    LIMIT 1
-                """, (original_filename, f"%{original_filename}"))
-                
-                result = cursor.fetchone()
+                    SELECT ps.pos, MAX(i.id) FROM picks_suffix ps
+                    JOIN images i ON i.filename LIKE '%' || ps.suffix
+                    GROUP BY ps.pos
+                """)
+                for pos, image_id in cursor.fetchall():
+                    resolved[pos] = image_id
+                cursor.execute("DROP TABLE picks_suffix")
+        
+        # Second pass: load all resolved rows with one IN (...) query per SQL_CHUNK_SIZE IDs
+        ids = list({image_id for image_id in resolved.values() if image_id})
+        rows_by_id = {}
+        for start in range(0, len(ids), SQL_CHUNK_SIZE):
+            chunk = ids[start:start + SQL_CHUNK_SIZE]
+            cursor.execute(f"""
+                SELECT id, path, filename, raw_proxy_type, camera_make, camera_model
+                FROM images 
+                WHERE id IN ({','.join('?' * len(chunk))})
+            """, chunk)
+            for row in cursor:
+                rows_by_id[row['id']] = row
+        
+        legacy_names = dict(legacy)
+        raw_files = []
+        for pos, pick_entry in enumerate(picks):
+            if not pick_entry:
+                continue
+            
+            logger.info("\n📷 Processing pick: %s", pick_entry)
+            image_id = resolved.get(pos)
+            
+            if pos in legacy_names:
+                original_filename = legacy_names[pos]
+                result = rows_by_id.get(image_id)
                 if result:
                     # Check if it's a RAW file by extension
-                    file_ext = Path(result['filename']).suffix.lower()
-                    raw_extensions = {'.cr2', '.cr3', '.nef', '.arw', '.dng', '.raf', '.orf', '.rw2', '.raw'}
-                    
-                    if file_ext in raw_extensions:
+                    if os.path.splitext(result['filename'])[1].lower() in RAW_EXTENSIONS:
                         raw_files.append(result)
-                        print(f"   ✅ Found RAW file (legacy): {original_filename} (ID: {result['id']})")
+                        logger.info("   ✅ Found RAW file (legacy): %s (ID: %s)", original_filename, result['id'])
                     else:
-                        print(f"   ⏭️ Skipping non-RAW file (legacy): {original_filename}")
+                        logger.info("   ⏭️ Skipping non-RAW file (legacy): %s", original_filename)
                 else:
-                    print(f"   ⚠️ Pick not found in database (legacy): {original_filename}")
+                    logger.warning("   ⚠️ Pick not found in database (legacy): %s", original_filename)
+            
+            elif image_id:
+                if pos in gallery_positions:
+                    logger.info("   🔍 Found in gallery: ID %s", image_id)
+                result = rows_by_id.get(image_id)
+                if result:
+                    # Check if it's a RAW file by extension
+                    if os.path.splitext(result['filename'])[1].lower() in RAW_EXTENSIONS:
+                        raw_files.append(result)
+                        logger.info("   ✅ Found RAW file: %s (ID: %s)", result['filename'], result['id'])
+                    else:
+                        logger.info("   ⏭️ Original file is not RAW: %s", result['filename'])
+                else:
+                    logger.warning("   ❌ Image ID %s not found in database", image_id)
+            
+            elif isinstance(pick_entry, str):
+                logger.warning("   ❌ Could not find image ID for: %s", pick_entry)
         
-        conn.close()
         return raw_files
     
-    def get_camera_standard_from_exif(self, image_id):
-        """Get appropriate camera standard based on EXIF data from database."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT camera_make, camera_model FROM images WHERE id = ?", (image_id,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if not result:
-            return DEFAULT_CAMERA_STANDARD
-        
-        make = (result['camera_make'] or '').upper()
-        model = (result['camera_model'] or '').upper()
-        
-        # Map camera models to standard profiles
-        camera_mappings = {
-            'A7C': 'Standard_A7C.pp3',
-            'LX100': 'Standard_LX100.pp3', 
-            'ILCE-7C': 'Standard_A7C.pp3',  # Sony A7C full model name
-            'DMC-LX100': 'Standard_LX100.pp3',  # Panasonic LX100 full model name
-        }
-        
+    def get_camera_standard(self, camera_model):
+        """Get appropriate camera standard from the image's EXIF camera model."""
         # Find matching standard
-        for camera_key, standard_file in camera_mappings.items():
-            if camera_key in model:
-                standard_path = f"RawTherapee Presets/{standard_file}"
-                if Path(standard_path).exists():
-                    return standard_path
+        for standard_file in camera_standard_candidates(camera_model):
+            if standard_file in self._presets:
+                return f"RawTherapee Presets/{standard_file}"
         
         # Fallback to default
         return DEFAULT_CAMERA_STANDARD
-
-    def convert_raw_with_custom_settings(self, source_path, output_path, image_id=None, quality=DEFAULT_QUALITY, camera_standard=None, style_preset=None):
-        """Convert RAW file to JPG using RawTherapee CLI with high quality custom settings and two-stage processing."""
-        try:
-            # Auto-detect camera standard if not provided
-            if camera_standard is None and image_id is not None:
-                camera_standard = self.get_camera_standard_from_exif(image_id)
-            elif camera_standard is None:
-                camera_standard = DEFAULT_CAMERA_STANDARD
-                
-            # Use default style if not provided, or skip if "None"
-            if style_preset is None:
-                style_preset = DEFAULT_STYLE_PRESET
-            elif style_preset == "None":
-                style_preset = None  # No style preset - just camera standard
-            
-            # Check if presets exist
-            camera_path = Path(camera_standard)
-            style_path = Path(style_preset) if style_preset else None
-            
-            if not camera_path.exists():
-                print(f"   ⚠️ Camera standard not found: {camera_standard}, using default settings")
-            if style_preset and style_path and not style_path.exists():
-                print(f"   ⚠️ Style preset not found: {style_preset}, using default settings")
-            
-            cmd = ['rawtherapee-cli']
-            
-            # Add camera standard first (base settings)
-            if camera_path.exists():
-                cmd.extend(['-p', str(camera_path.resolve())])
-                print(f"   📷 Using camera standard: {camera_path.name}")
-            
-            # Add style preset second (stacked on top) - only if specified
-            if style_preset and style_path and style_path.exists():
-                cmd.extend(['-p', str(style_path.resolve())])
-                print(f"   🎨 Using style preset: {style_path.name}")
-            elif style_preset is None:
-                print(f"   🎨 No style preset - using camera standard only")
-            
-            cmd.extend([
-                '-o', str(output_path),
-                f'-j{quality}',  # JPEG output with quality
-                f'-js{DEFAULT_CHROMA_SUBSAMPLING}',  # Best chroma subsampling (4:4:4)
-                '-Y',  # Overwrite if exists
-                '-s',  # Use sidecar files if available
-                '-c', str(source_path)  # Convert (must be last)
-            ])
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=DEFAULT_TIMEOUT)
-            
-            if result.returncode == 0:
-                return True, "RawTherapee CLI (custom)"
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "Unknown error"
-                return False, f"RawTherapee CLI error: {error_msg}"
-                
-        except subprocess.TimeoutExpired:
-            return False, "RawTherapee CLI timeout"
-        except FileNotFoundError:
-            return False, "RawTherapee CLI not found"
-        except Exception as e:
-            return False, f"RawTherapee CLI exception: {e}"
     
-    def update_database_proxy_status(self, image_id, processing_settings):
-        """Update database to mark as custom_generated with new settings."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def find_existing_sources(self, paths):
+        """Set of the given source paths that exist.
         
-        # Ensure columns exist
-        try:
-            cursor.execute("SELECT raw_proxy_type FROM images LIMIT 1")
-        except:
-            cursor.execute("ALTER TABLE images ADD COLUMN raw_proxy_type TEXT")
-            cursor.execute("ALTER TABLE images ADD COLUMN raw_processing_settings TEXT")
-        
-        # Update the record
-        cursor.execute("""
-            UPDATE images 
-            SET raw_proxy_type = 'custom_generated', raw_processing_settings = ?
-            WHERE id = ?
-        """, (processing_settings, image_id))
-        
-        conn.commit()
-        conn.close()
-    
-    def regenerate_picks(self, quality=DEFAULT_QUALITY, camera_standard=None, style_preset=None, force=False):
+        Originals often live on an external or network drive, where a stat is a round
+        trip, so several are checked at once on a thread pool instead of one by one.
+        """
+        paths = list(dict.fromkeys(paths))
+        if len(paths) <= 1:
+            return {path for path in paths if os.path.exists(path)}
+        with ThreadPoolExecutor(max_workers=min(32, len(paths))) as pool:
+            return {path for path, exists in zip(paths, pool.map(os.path.exists, paths)) if exists}
+    
+    def remove_stale_scratch_dirs(self):
+        """Delete .batch-* scratch directories left in the proxy folder by killed runs.
+        
+        Proxies only appear under their final name once complete (see convert_batch), so
+        anything left in a scratch directory is partial. A directory that RawTherapee
+        wrote to recently may belong to another run and is left alone.
+        """
+        cutoff = time.time() - 2 * DEFAULT_TIMEOUT
+        with os.scandir(self.proxy_dir) as entries:
+            stale = [entry.path for entry in entries
+                     if entry.name.startswith('.batch-') and entry.is_dir()
+                     and entry.stat().st_mtime < cutoff]
+        for path in stale:
+            shutil.rmtree(path, ignore_errors=True)
+        if stale:
+            logger.info("🧹 Removed %s scratch folder(s) left by an interrupted run", len(stale))
+    
+    def get_existing_proxy_ids(self):
+        """IDs that already have a {image_id}.jpg proxy, from a single directory scan."""
+        with os.scandir(self.proxy_dir) as entries:
+            return {int(entry.name[:-4]) for entry in entries
+                    if entry.name.endswith('.jpg') and entry.name[:-4].isdigit()}
+    
+    def update_database_proxy_status(self, pending_updates):
+        """Mark regenerated images as custom_generated in a single transaction.
+        
+        Args:
+            pending_updates: List of (processing_settings, image_id) tuples
+        """
+        if not pending_updates:
+            return
+        
+        # Update the records (columns are added by ensure_schema at startup)
+        with self.conn:
+            self.conn.executemany("""
+                UPDATE images 
+                SET raw_proxy_type = 'custom_generated', raw_processing_settings = ?
+                WHERE id = ?
+            """, pending_updates)
+    
+    def regenerate_picks(self, quality=DEFAULT_QUALITY, camera_standard=None, style_preset=None, force=False, jobs_count=None):
         """Regenerate RAW picks with custom settings."""
         print("🎞️ RAW PICKS REGENERATION")
         print("=" * 50)
@@ -377,6 +470,8 @@ class RawPicksRegenerator:
         # Get RAW files from picks
         print("\n🔍 Finding RAW files from picks...")
         raw_files = self.get_raw_files_from_picks(picks)
+        # A pick listed twice (or legacy names resolving to the same image) is converted once
+        raw_files = list({row['id']: row for row in raw_files}.values())
         
         if not raw_files:
             print("❌ No RAW files found in picks")
@@ -397,65 +492,112 @@ class RawPicksRegenerator:
             print(f"   Style Preset: Default ({DEFAULT_STYLE_PRESET})")
         print(f"   Force regenerate: {force}")
         
+        # Same settings record for every file in the run
+        processing_settings = json.dumps({
+            "quality": quality,
+            "chroma_subsampling": DEFAULT_CHROMA_SUBSAMPLING,
+            "method": "rawtherapee-cli-two-stage",
+            "camera_standard": Path(camera_standard).name if camera_standard else "auto-detected",
+            "style_preset": Path(style_preset).name if style_preset else "none",
+            "regenerated_from_picks": True
+        })
+        
+        # Normalize presets once for the whole run; "None" means camera standard only
+        if style_preset is None:
+            style_preset = DEFAULT_STYLE_PRESET
+        elif style_preset == "None":
+            style_preset = None
+        style_path = self.resolve_preset(style_preset)
+        if style_preset and not style_path:
+            print(f"   ⚠️ Style preset not found: {style_preset}, using default settings")
+        missing_presets = set()
+        
         # Process each RAW file
         regenerated_count = 0
         skipped_count = 0
         error_count = 0
         regenerated_image_ids = []  # Track which images were regenerated for gallery updates
+        pending_updates = []  # (processing_settings, image_id) rows for the images table
         
         print(f"\n🔄 Processing {len(raw_files)} RAW files...")
+        self.remove_stale_scratch_dirs()
+        # One directory scan instead of a stat per pick; skipped picks cost nothing else
+        existing_proxies = set() if force else self.get_existing_proxy_ids()
+        existing_sources = self.find_existing_sources(
+            row['path'] for row in raw_files if row['id'] not in existing_proxies)
+        jobs = []
         for row in raw_files:
             image_id = row['id']
             source_path = Path(row['path'])
             filename = row['filename']
-            
-            print(f"\n📷 Processing ID {image_id}: {filename}")
-            
-            # Check if source file exists
-            if not source_path.exists():
-                print(f"   ⚠️ Source file not found: {source_path}")
-                error_count += 1
-                continue
-            
             output_path = self.proxy_dir / f"{image_id}.jpg"
             
             # Check if proxy already exists
-            if not force and output_path.exists():
-                print(f"   ⏭️ Proxy already exists: {output_path.name}")
+            if image_id in existing_proxies:
+                logger.info("\n📷 Processing ID %s: %s", image_id, filename)
+                logger.info("   ⏭️ Proxy already exists: %s", output_path.name)
                 skipped_count += 1
                 continue
             
-            # Convert with custom settings
-            print(f"   🔄 Converting with custom settings...")
-            success, method = self.convert_raw_with_custom_settings(
-                source_path, output_path, image_id, quality, camera_standard, style_preset
-            )
-            
-            if success:
-                # Verify output file
-                if output_path.exists() and output_path.stat().st_size > 10000:
-                    print(f"   ✅ Regenerated using {method} ({output_path.stat().st_size // 1024} KB)")
-                    
-                    # Update database
-                    processing_settings = json.dumps({
-                        "quality": quality,
-                        "chroma_subsampling": DEFAULT_CHROMA_SUBSAMPLING,
-                        "method": "rawtherapee-cli-two-stage",
-                        "camera_standard": Path(camera_standard).name if camera_standard else "auto-detected",
-                        "style_preset": Path(style_preset).name if style_preset else "none",
-                        "regenerated_from_picks": True
-                    })
-                    self.update_database_proxy_status(image_id, processing_settings)
-                    regenerated_count += 1
-                    regenerated_image_ids.append(image_id)  # Track for gallery updates
-                else:
-                    print(f"   ❌ Output file invalid or too small")
-                    if output_path.exists():
-                        output_path.unlink()
-                    error_count += 1
-            else:
-                print(f"   ❌ Conversion failed: {method}")
+            # Check if source file exists
+            if row['path'] not in existing_sources:
+                logger.warning("\n📷 Processing ID %s: %s", image_id, filename)
+                logger.warning("   ⚠️ Source file not found: %s", source_path)
                 error_count += 1
+                continue
+            
+            # Camera standard comes from the row fetched with the picks, not another query
+            job_camera_standard = camera_standard or self.get_camera_standard(row['camera_model'])
+            camera_path = self.resolve_preset(job_camera_standard)
+            if not camera_path and job_camera_standard not in missing_presets:
+                missing_presets.add(job_camera_standard)
+                logger.warning("   ⚠️ Camera standard not found: %s, using default settings", job_camera_standard)
+            jobs.append((image_id, filename, str(source_path), str(output_path), camera_path))
+        
+        # Files sharing a camera standard are converted by one rawtherapee-cli run, and
+        # several runs go at once. Workers only convert; the database is updated here
+        # as each batch comes back.
+        num_workers = jobs_count or DEFAULT_JOBS
+        batches = plan_batches(jobs, num_workers)
+        workers = min(num_workers, len(batches)) or 1
+        if jobs:
+            print(f"\n⚙️ Converting {len(jobs)} RAW files in {len(batches)} RawTherapee run(s), {workers} at a time")
+        
+        # The argv prefix only depends on the preset stack, so build it once per camera standard
+        commands = {job[4]: rawtherapee_command(quality, job[4], style_path, self._rt_cli) for job in jobs}
+        settings = {'proxy_dir': str(self.proxy_dir), 'commands': commands, 'style_preset': style_path}
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(logger.getEffectiveLevel(),))
+            outcomes = (future.result() for future in
+                        as_completed([executor.submit(_convert_batch, batch, **settings) for batch in batches]))
+        else:
+            # Inline: messages are logged directly, nothing to replay
+            outcomes = ((convert_batch(batch, **settings), ()) for batch in batches)
+        
+        try:
+            for results, messages in outcomes:
+                for level, message in messages:
+                    logger.log(level, "%s", message)
+                for image_id, success in results:
+                    if success:
+                        # Database updates are collected and written together after the pool finishes
+                        pending_updates.append((processing_settings, image_id))
+                        regenerated_count += 1
+                        regenerated_image_ids.append(image_id)  # Track for gallery updates
+                    else:
+                        error_count += 1
+        except KeyboardInterrupt:
+            print("\n⚠️ Regeneration interrupted by user")
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        finally:
+            if executor:
+                executor.shutdown()
+            self.update_database_proxy_status(pending_updates)
+        
+        self.regenerated_image_ids = regenerated_image_ids
         
         # Update gallery hard links for regenerated images
         if regenerated_image_ids:
@@ -476,18 +618,23 @@ class RawPicksRegenerator:
         
         return regenerated_count > 0
     
-    def regenerate_thumbnails_for_picks(self):
-        """Regenerate thumbnails for all picks using the new proxies."""
+    def regenerate_thumbnails_for_picks(self, image_ids):
+        """Regenerate thumbnails for the picks whose proxies were just regenerated."""
+        if not image_ids:
+            print("\n🖼️ No proxies were regenerated, thumbnails are unchanged")
+            return True
         try:
-            print(f"\n🖼️ Regenerating thumbnails for picked images...")
+            print(f"\n🖼️ Regenerating thumbnails for {len(image_ids)} picked images...")
             print("-" * 50)
             
-            # Call generate_thumbnails.py with --picks-only and --force
-            cmd = [sys.executable, "Scripts/generate_thumbnails.py", "--picks-only", "--force"]
+            # Name the regenerated images explicitly and force them, rather than redoing
+            # every pick; generate_thumbnails.py spreads them over its own process pool
+            args = ["--image-ids", ",".join(map(str, image_ids)), "--force"]
+            cmd = [sys.executable, "Scripts/generate_thumbnails.py", *args]
             
             # If we're running from Scripts directory, adjust the path
             if os.path.basename(os.getcwd()) == "Scripts":
-                cmd = [sys.executable, "generate_thumbnails.py", "--picks-only", "--force"]
+                cmd = [sys.executable, "generate_thumbnails.py", *args]
             
             result = subprocess.run(cmd, capture_output=False, text=True)
             
@@ -500,47 +647,58 @@ class RawPicksRegenerator:
                 
         except Exception as e:
             print(f"⚠️ Error regenerating thumbnails: {e}")
-            print(f"💡 You can manually run: python3 Scripts/generate_thumbnails.py --picks-only --force")
+            print(f"💡 You can manually run: python3 Scripts/generate_thumbnails.py --picks-only")
             return False
     
-    def update_hard_link_in_gallery(self, gallery_path, image_id, new_source_path):
-        """Update hard link for a specific image in a gallery."""
+    def relink_gallery_file(self, gallery_file, new_source_path):
+        """Point a gallery file at new_source_path with a hard link.
+        
+        The new link is made under a temporary name and renamed over the old file, so
+        the gallery never loses the image if linking fails. Files that already are
+        the proxy (same inode) are left alone.
+        
+        Runs on a worker thread, so messages are returned rather than printed.
+        Returns (success, messages); success is None when nothing needed changing.
+        """
         try:
-            # Load gallery JSON
-            json_file = gallery_path / 'image_data.json'
-            if not json_file.exists():
-                return False, f"Gallery JSON not found: {json_file}"
-            
-            with open(json_file, 'r') as f:
-                gallery_data = json.load(f)
-            
-            # Find the image in gallery data
-            updated = False
-            for item in gallery_data:
-                if item.get('_imageId') == image_id:
-                    old_gallery_file = gallery_path / item['FileName']
-                    
-                    if old_gallery_file.exists():
-                        # Remove old hard link
-                        old_gallery_file.unlink()
-                        print(f"   🗑️ Removed old hard link: {item['FileName']}")
-                    
-                    # Create new hard link with same filename
-                    try:
-                        os.link(new_source_path, old_gallery_file)
-                        print(f"   🔗 Created new hard link: {item['FileName']} -> {new_source_path}")
-                        updated = True
-                        break
-                    except OSError as e:
-                        return False, f"Failed to create hard link: {e}"
+            new_stat = os.stat(new_source_path)
+            try:
+                current_stat = os.stat(gallery_file)
+                if (current_stat.st_ino, current_stat.st_dev) == (new_stat.st_ino, new_stat.st_dev):
+                    return None, []
+            except FileNotFoundError:
+                pass
             
-            if updated:
-                return True, "Hard link updated successfully"
-            else:
-                return False, f"Image ID {image_id} not found in gallery"
-                
-        except Exception as e:
-            return False, f"Error updating gallery: {e}"
+            temp_file = gallery_file.with_name(f".{gallery_file.name}.tmp")
+            if os.path.lexists(temp_file):
+                os.unlink(temp_file)  # Left over from an interrupted run
+            os.link(new_source_path, temp_file)
+            try:
+                os.replace(temp_file, gallery_file)
+            except OSError:
+                os.unlink(temp_file)
+                raise
+            return True, [f"   🔗 Created new hard link: {gallery_file.name} -> {new_source_path}"]
+        except OSError as e:
+            return False, [f"   ❌ Failed to update hard link: {e}"]
+    
+    def update_hard_links_in_gallery(self, gallery_path, proxies, pool):
+        """Queue hard link updates for every regenerated image in a gallery.
+        
+        The gallery JSON is read once (through the same cache as pick resolution) and
+        each relink is submitted to pool. Returns the list of futures.
+        """
+        image_ids = self.load_gallery_image_ids(gallery_path.name)
+        if not image_ids:
+            return []
+        
+        # First FileName for each image ID, like the original linear search
+        filenames = {}
+        for filename, image_id in image_ids.items():
+            filenames.setdefault(image_id, filename)
+        
+        return [pool.submit(self.relink_gallery_file, gallery_path / filenames[image_id], new_source_path)
+                for image_id, new_source_path in proxies.items() if image_id in filenames]
     
     def update_gallery_hard_links_for_regenerated_picks(self, regenerated_image_ids):
         """Update hard links in all galleries for regenerated images."""
@@ -550,48 +708,46 @@ class RawPicksRegenerator:
         print(f"\n🔗 Updating gallery hard links for {len(regenerated_image_ids)} regenerated images...")
         print("-" * 50)
         
-        # Auto-detect gallery root
-        if os.path.basename(os.getcwd()) == "Scripts":
-            gallery_root = Path("../Hard Link Galleries")
-        else:
-            gallery_root = Path("Hard Link Galleries")
-            
-        if not gallery_root.exists():
-            print(f"⚠️ Gallery root not found: {gallery_root}")
+        if not self.gallery_root.exists():
+            print(f"⚠️ Gallery root not found: {self.gallery_root}")
             return
         
+        proxies = {}
+        for image_id in regenerated_image_ids:
+            proxy_path = self.proxy_dir / f"{image_id}.jpg"
+            if proxy_path.exists():
+                proxies[image_id] = str(proxy_path)
+            else:
+                logger.warning("   ⚠️ Proxy not found for ID %s: %s", image_id, proxy_path)
+        
         galleries_updated = 0
         links_updated = 0
         errors = 0
         
-        # Iterate through all galleries
-        for gallery_dir in gallery_root.iterdir():
-            if not gallery_dir.is_dir():
-                continue
-                
-            print(f"\n📁 Checking gallery: {gallery_dir.name}")
-            gallery_updated = False
+        # Each gallery JSON is parsed once, and the unlink/link pairs (independent
+        # filesystem calls that release the GIL) run on a thread pool
+        with ThreadPoolExecutor(max_workers=min(32, len(proxies) or 1)) as pool:
+            gallery_links = [(gallery_dir, self.update_hard_links_in_gallery(gallery_dir, proxies, pool))
+                             for gallery_dir in self.gallery_root.iterdir() if gallery_dir.is_dir()]
             
-            # Check each regenerated image
-            for image_id in regenerated_image_ids:
-                proxy_path = self.proxy_dir / f"{image_id}.jpg"
-                
-                if not proxy_path.exists():
-                    print(f"   ⚠️ Proxy not found for ID {image_id}: {proxy_path}")
-                    continue
-                
-                # Update hard link in this gallery
-                success, message = self.update_hard_link_in_gallery(gallery_dir, image_id, str(proxy_path))
+            for gallery_dir, futures in gallery_links:
+                logger.info("\n📁 Checking gallery: %s", gallery_dir.name)
+                gallery_updated = False
                 
-                if success:
-                    if not gallery_updated:
-                        galleries_updated += 1
-                        gallery_updated = True
-                    links_updated += 1
-                elif "not found in gallery" not in message:
-                    # Only count as error if it's not just "image not in this gallery"
-                    print(f"   ❌ {message}")
-                    errors += 1
+                for future in futures:
+                    success, messages = future.result()
+                    for message in messages:
+                        logger.log(logging.WARNING if success is False else logging.INFO, "%s", message)
+                    
+                    if success is None:
+                        continue  # Already linked to the current proxy
+                    if success:
+                        if not gallery_updated:
+                            galleries_updated += 1
+                            gallery_updated = True
+                        links_updated += 1
+                    else:
+                        errors += 1
         
         # Summary
         print(f"\n🔗 Gallery hard link update complete!")
@@ -607,22 +763,13 @@ class RawPicksRegenerator:
         
         return links_updated > 0
     
-    def get_available_presets(self):
-        """Get lists of available camera standards and style presets."""
-        presets_dir = Path("RawTherapee Presets")
-        if not presets_dir.exists():
-            return [], []
-        
-        all_presets = [p.name for p in presets_dir.glob("*.pp3")]
-        camera_standards = [p for p in all_presets if p.startswith("Standard_")]
-        style_presets = [p for p in all_presets if not p.startswith("Standard_")]
-        style_presets.insert(0, "None")  # Add "None" option to use no style preset
-        
-        return camera_standards, style_presets
+    def resolve_preset(self, preset):
+        """Absolute path string for a preset from the cached index, or None if it doesn't exist."""
+        return self._presets.get(os.path.basename(preset)) if preset else None
     
     def interactive_preset_selection(self):
         """Show interactive menu for two-stage preset selection."""
-        camera_standards, style_presets = self.get_available_presets()
+        camera_standards, style_presets = get_available_presets()
         
         # Camera standard selection
         print("\n📷 AVAILABLE CAMERA STANDARDS:")
@@ -688,74 +835,251 @@ class RawPicksRegenerator:
         
         return selected_camera, selected_style
 
-def main():
-    # Get available presets for help text
-    regenerator = RawPicksRegenerator()
-    camera_standards, style_presets = regenerator.get_available_presets()
+def rawtherapee_command(quality, camera_standard=None, style_preset=None, rt_cli='rawtherapee-cli'):
+    """rawtherapee-cli arguments up to -o/-c for one preset stack.
+    
+    Built once per camera standard in the main process; presets are absolute paths
+    already checked by RawPicksRegenerator.resolve_preset (None to leave that stage out).
+    """
+    cmd = [rt_cli]
+    
+    # Add camera standard first (base settings)
+    if camera_standard:
+        cmd.extend(['-p', camera_standard])
+    
+    # Add style preset second (stacked on top) - only if specified
+    if style_preset:
+        cmd.extend(['-p', style_preset])
+    
+    cmd.extend([
+        f'-j{quality}',  # JPEG output with quality
+        f'-js{DEFAULT_CHROMA_SUBSAMPLING}',  # Best chroma subsampling (4:4:4)
+        '-Y',  # Overwrite if exists
+        '-s',  # Use sidecar files if available
+    ])
+    return cmd
+
+def convert_raw_with_custom_settings(source_paths, output_path, base_command):
+    """Convert RAW files to JPG using RawTherapee CLI with high quality custom settings and two-stage processing.
+    
+    All source_paths are converted by one rawtherapee-cli run, so process start-up and
+    preset loading are paid once per batch. With a single file output_path is the JPG
+    to write; with several it is a directory and RawTherapee names each JPG after its RAW.
+    base_command comes from rawtherapee_command(); only the output and inputs are added here.
+    """
+    try:
+        # Convert (-c must be last, followed by the input files)
+        cmd = base_command + ['-o', str(output_path), '-c']
+        cmd.extend(str(source_path) for source_path in source_paths)
+        
+        # Timeout scales with the number of files in the batch
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=DEFAULT_TIMEOUT * len(source_paths))
+        
+        if result.returncode == 0:
+            return True, "RawTherapee CLI (custom)"
+        else:
+            error_msg = result.stderr.strip() if result.stderr else "Unknown error"
+            return False, f"RawTherapee CLI error: {error_msg}"
+            
+    except subprocess.TimeoutExpired:
+        return False, "RawTherapee CLI timeout"
+    except FileNotFoundError:
+        return False, "RawTherapee CLI not found"
+    except Exception as e:
+        return False, f"RawTherapee CLI exception: {e}"
+
+def plan_batches(jobs, num_workers):
+    """Group (image_id, filename, source_path, output_path, camera_standard) jobs into batches.
+    
+    Each batch shares a camera standard, since RawTherapee applies -p to every input
+    of a run. Groups are split so the pool has work for every worker, capped at
+    RAWTHERAPEE_BATCH_SIZE files, and never hold two RAWs with the same name
+    (RawTherapee would write both to the same JPG).
+    """
+    groups = {}
+    for image_id, filename, source_path, output_path, camera_standard in jobs:
+        stem = os.path.splitext(os.path.basename(source_path))[0].lower()
+        lanes = groups.setdefault(camera_standard, [])
+        for stems, lane in lanes:
+            if stem not in stems:
+                break
+        else:
+            stems, lane = set(), []
+            lanes.append((stems, lane))
+        stems.add(stem)
+        lane.append((image_id, filename, source_path, output_path))
     
+    batches = []
+    for camera_standard, lanes in groups.items():
+        for _, lane in lanes:
+            batch_size = min(RAWTHERAPEE_BATCH_SIZE, -(-len(lane) // num_workers))
+            for start in range(0, len(lane), batch_size):
+                batches.append((camera_standard, lane[start:start + batch_size]))
+    return batches
+
+def convert_batch(batch, proxy_dir, commands, style_preset):
+    """Convert one (camera_standard, [(image_id, filename, source_path, output_path), ...])
+    batch. Returns [(image_id, success), ...].
+    
+    commands maps each camera standard to its rawtherapee_command() argv.
+    """
+    camera_standard, picks = batch
+    base_command = commands[camera_standard]
+    results = []
+    logger.info("\n🔄 Converting %s RAW file(s) with custom settings...", len(picks))
+    if camera_standard:
+        logger.info("   📷 Using camera standard: %s", os.path.basename(camera_standard))
+    if style_preset:
+        logger.info("   🎨 Using style preset: %s", os.path.basename(style_preset))
+    else:
+        logger.info("   🎨 No style preset - using camera standard only")
+    
+    # RawTherapee names batch outputs after the RAW file, which could clash with an
+    # existing {image_id}.jpg, so convert into a scratch directory and move into place.
+    # The rename is atomic, so galleries and concurrent readers never see a partial or
+    # rejected JPG under the proxy name.
+    with tempfile.TemporaryDirectory(prefix='.batch-', dir=proxy_dir) as scratch_dir:
+        batch_ok, method = convert_raw_with_custom_settings(
+            [pick[2] for pick in picks], scratch_dir, base_command
+        )
+        
+        for image_id, filename, source_path, output_path in picks:
+            logger.info("\n📷 Processing ID %s: %s", image_id, filename)
+            scratch_path = os.path.join(scratch_dir, os.path.splitext(os.path.basename(source_path))[0] + '.jpg')
+            
+            if not batch_ok and not os.path.exists(scratch_path):
+                # One bad file fails the whole run; retry the others on their own
+                logger.info("   ↩️ Batch run failed, converting this file on its own...")
+                success, method = convert_raw_with_custom_settings(
+                    [source_path], scratch_path, base_command
+                )
+                if not success:
+                    logger.warning("   ❌ ID %s: Conversion failed: %s", image_id, method)
+                    results.append((image_id, False))
+                    continue
+            
+            # Verify output file
+            size = os.path.getsize(scratch_path) if os.path.exists(scratch_path) else 0
+            if size > 10000:
+                os.replace(scratch_path, output_path)
+                logger.info("   ✅ Regenerated using %s (%s KB)", method, size // 1024)
+                results.append((image_id, True))
+            else:
+                logger.warning("   ❌ ID %s: Output file invalid or too small", image_id)
+                results.append((image_id, False))
+    return results
+
+# Per-process log buffer for regenerate_picks' worker pool
+_worker_log = None
+
+def _init_worker(log_level=logging.INFO):
+    """Buffer this worker's log messages so the main process can print them in one piece."""
+    global _worker_log
+    # Large enough for every message of a full RAWTHERAPEE_BATCH_SIZE batch
+    _worker_log = logging.handlers.BufferingHandler(capacity=RAWTHERAPEE_BATCH_SIZE * 4 + 10)
+    logger.handlers[:] = [_worker_log]
+    logger.setLevel(log_level)
+    logger.propagate = False
+
+def _convert_batch(batch, **settings):
+    """Worker entry point: ([(image_id, success), ...], [(level, message)]) for one batch."""
+    results = convert_batch(batch, **settings)
+    messages = [(record.levelno, record.getMessage()) for record in _worker_log.buffer]
+    _worker_log.flush()
+    return results, messages
+
+def main():
+    # Presets are validated after parsing rather than through choices=, so --help
+    # doesn't scan the preset folder and --list-presets doesn't open the database
     parser = argparse.ArgumentParser(description='Regenerate RAW picks with custom RawTherapee settings using two-stage processing')
     parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY,
                         help=f'JPEG quality (1-100, default: {DEFAULT_QUALITY})')
-    parser.add_argument('--camera-standard', choices=camera_standards,
-                        help=f'Camera standard preset (auto-detected from EXIF if not specified). Available: {", ".join(camera_standards)}')
-    parser.add_argument('--style-preset', choices=style_presets,
-                        help=f'Style preset to apply on top of camera standard. Available: {", ".join(style_presets)}')
+    parser.add_argument('--camera-standard',
+                        help='Camera standard preset (auto-detected from EXIF if not specified). See --list-presets')
+    parser.add_argument('--style-preset',
+                        help='Style preset to apply on top of camera standard, or None. See --list-presets')
     parser.add_argument('--force', action='store_true',
                         help='Force regeneration even if proxy already exists')
     parser.add_argument('--regenerate-thumbnails', action='store_true',
                         help='Automatically regenerate thumbnails after creating proxies')
     parser.add_argument('--list-presets', action='store_true',
                         help='List available camera standards and style presets')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ask for presets again instead of reusing the last interactive selection')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Only report errors and the summary, not per-pick progress')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_JOBS,
+                        help=f'RAW files to convert at once (default: {DEFAULT_JOBS}, half the CPU cores)')
     
     args = parser.parse_args()
+    setup_logging(logging.WARNING if args.quiet else logging.INFO)
+    
+    if args.list_presets or args.camera_standard or args.style_preset:
+        camera_standards, style_presets = get_available_presets()
+        if args.camera_standard and args.camera_standard not in camera_standards:
+            parser.error(f"argument --camera-standard: invalid choice: '{args.camera_standard}' "
+                         f"(choose from {', '.join(camera_standards)})")
+        if args.style_preset and args.style_preset not in style_presets:
+            parser.error(f"argument --style-preset: invalid choice: '{args.style_preset}' "
+                         f"(choose from {', '.join(style_presets)})")
     
     if args.list_presets:
-        print("📷 Available Camera Standards:")
-        for standard in camera_standards:
-            print(f"   • {standard}")
-        print("\n🎨 Available Style Presets:")
-        for preset in style_presets:
-            print(f"   • {preset}")
+        # One write for the whole listing rather than a print per preset
+        sys.stdout.write("📷 Available Camera Standards:\n"
+                         + "".join(f"   • {standard}\n" for standard in camera_standards)
+                         + "\n🎨 Available Style Presets:\n"
+                         + "".join(f"   • {preset}\n" for preset in style_presets))
         return
     
-    # Check if database exists
+    # Check if database exists (before connecting, which would create an empty one)
     if not os.path.exists(DB_FILE):
         print(f"❌ Database not found: {DB_FILE}")
         print("Please run metadata extraction first.")
         sys.exit(1)
     
-    # Validate quality
-    if not 1 <= args.quality <= 100:
-        print("❌ Quality must be between 1 and 100")
-        sys.exit(1)
+    with RawPicksRegenerator() as regenerator:
+        # Validate quality
+        if not 1 <= args.quality <= 100:
+            print("❌ Quality must be between 1 and 100")
+            sys.exit(1)
     
-    # Handle preset selection
-    camera_standard = f"RawTherapee Presets/{args.camera_standard}" if args.camera_standard else None
-    style_preset = args.style_preset if args.style_preset == "None" else f"RawTherapee Presets/{args.style_preset}" if args.style_preset else None
+        # Handle preset selection
+        # Not given -> None, "None" -> no style preset, otherwise a path in the preset folder
+        camera = args.camera_standard
+        camera_standard = {None: None}.get(camera, f"RawTherapee Presets/{camera}")
+        style = args.style_preset
+        style_preset = {None: None, "None": "None"}.get(style, f"RawTherapee Presets/{style}")
     
-    if not camera_standard and not style_preset:
-        # Show interactive preset selection
-        camera_standard, style_preset = regenerator.interactive_preset_selection()
-        if camera_standard == "CANCELLED":
-            print("❌ Operation cancelled")
-            sys.exit(0)
+        if not camera_standard and not style_preset:
+            last_selection = None if args.no_cache else load_last_selection()
+            if last_selection:
+                camera_standard, style_preset = last_selection
+                print(f"📌 Using last preset selection: {camera_standard or 'auto-detect'} + "
+                      f"{style_preset or 'default style'} (--no-cache to choose again)")
+            else:
+                # Show interactive preset selection
+                camera_standard, style_preset = regenerator.interactive_preset_selection()
+                if camera_standard == "CANCELLED":
+                    print("❌ Operation cancelled")
+                    sys.exit(0)
+                save_last_selection(camera_standard, style_preset)
     
-    # Check preset files if specified
-    if camera_standard and not os.path.exists(camera_standard):
-        print(f"❌ Camera standard file not found: {camera_standard}")
-        sys.exit(1)
-    if style_preset and style_preset != "None" and not os.path.exists(style_preset):
-        print(f"❌ Style preset file not found: {style_preset}")
-        sys.exit(1)
+        # Check preset files if specified (against the preset index, not a fresh stat)
+        if camera_standard and not regenerator.resolve_preset(camera_standard):
+            print(f"❌ Camera standard file not found: {camera_standard}")
+            sys.exit(1)
+        if style_preset and style_preset != "None" and not regenerator.resolve_preset(style_preset):
+            print(f"❌ Style preset file not found: {style_preset}")
+            sys.exit(1)
     
-    success = regenerator.regenerate_picks(args.quality, camera_standard, style_preset, args.force)
+        success = regenerator.regenerate_picks(args.quality, camera_standard, style_preset, args.force, args.jobs)
     
-    if not success:
-        sys.exit(1)
+        if not success:
+            sys.exit(1)
     
-    # Regenerate thumbnails if requested and if proxy regeneration was successful
-    if args.regenerate_thumbnails and success:
-        regenerator.regenerate_thumbnails_for_picks()
+        # Regenerate thumbnails if requested and if proxy regeneration was successful
+        if args.regenerate_thumbnails and success:
+            regenerator.regenerate_thumbnails_for_picks(regenerator.regenerated_image_ids)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -4,113 +4,634 @@ Photo Management Toolkit
 Interactive CLI for managing photo library, metadata, galleries, and face recognition.
 """
 
+import argparse
+import atexit
+import importlib.util
+import json
 import os
+import re
+import shutil
+import signal
+import socket
+import sqlite3
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Optional: questionary asks a set of yes/no options as one checkbox list
+try:
+    import questionary
+except ImportError:
+    questionary = None
+
+# Optional: orjson reads and writes galleries.json with its C implementation
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: prompt_toolkit recalls earlier menu choices with the arrow keys
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit.history import FileHistory
+except ImportError:
+    PromptSession = None
+
+# Optional: send2trash moves deleted galleries to the Trash so they can be restored
+try:
+    from send2trash import send2trash
+except ImportError:
+    send2trash = None
+
+# Gallery numbers to delete: comma-separated numbers and ranges, e.g. "1, 4-7"
+_SELECTION_RE = re.compile(r"^\s*\d+(?:\s*-\s*\d+)?(?:\s*,\s*\d+(?:\s*-\s*\d+)?)*\s*$")
+
+# Scripts the toolkit runs, resolved and checked once at startup
+SCRIPTS = (
+    "Scripts/_worker.py",
+    "Scripts/cleanup_database.py",
+    "Scripts/create_db.py",
+    "Scripts/debug_db.py",
+    "Scripts/delete_all_culled_by_id.py",
+    "Scripts/extract_metadata.py",
+    "Scripts/face_api_server.py",
+    "Scripts/face_recognizer_insightface.py",
+    "Scripts/gallery_create_search.py",
+    "Scripts/gallery_rebuild_json.sh",
+    "Scripts/generate_heic_proxies.py",
+    "Scripts/generate_raw_proxies.py",
+    "Scripts/generate_thumbnails.py",
+    "Scripts/generate_video_proxies.py",
+    "Scripts/install_dependencies_macports_smart.sh",
+    "Scripts/rebuild_galleries_json.py",
+    "Scripts/regenerate_raw_picks.py",
+    "Scripts/start_gallery_server.sh",
+    "Scripts/start_local_servers.sh",
+)
+
+# Main menu options in order: (label, PhotoManager method). The menu text and the
+# choice dispatch are both built from this table; Exit comes after the last option
+MAIN_MENU_OPTIONS = (
+    ("📊 Extract Metadata (scan photos → database)", "extract_metadata"),
+    ("🗄️  Setup Database (create/initialize)", "setup_database"),
+    ("🖼️  Create Virtual Gallery (date/face/picks)", "create_gallery"),
+    ("🔧 Rebuild Gallery JSON (refresh metadata)", "rebuild_gallery_json"),
+    ("🖼️  Generate Thumbnails (fast loading)", "generate_thumbnails"),
+    ("🖼️  Generate HEIC Proxies (WebP for web viewing)", "generate_heic_proxies"),
+    ("🎞️  Generate RAW Proxies (JPG for RAW files)", "generate_raw_proxies"),
+    ("📹 Generate Video Proxies (h.264 for fast playback)", "generate_video_proxies"),
+    (
+        "🎯 Regenerate RAW Picks (custom processing for picked images)",
+        "regenerate_raw_picks",
+    ),
+    (
+        "🚀 Process New Images (extract metadata + thumbnails + proxies + faces)",
+        "process_new_images",
+    ),
+    ("🌐 Start Gallery Server (web viewer)", "start_gallery_server"),
+    ("🛑 Stop Gallery Server (stop all servers)", "stop_gallery_server"),
+    ("🔄 Restart Gallery Server (rebuild + restart)", "restart_gallery_server"),
+    ("🔨 Quick Rebuild Galleries List (no restart)", "quick_rebuild_galleries"),
+    ("👥 Face Recognition (detect/label people)", "face_recognition_menu"),
+    ("🔍 Database Debug (inspect/troubleshoot)", "database_debug"),
+    ("🛠️ Database Cleanup (remove stale entries)", "database_cleanup"),
+    ("🗑️  Delete Culled Images (cleanup)", "delete_culled"),
+    ("🗂️  Delete Galleries (cleanup)", "delete_galleries"),
+    (
+        "⚙️  Install Dependencies (complete toolkit + RAW support)",
+        "install_dependencies",
+    ),
+)
+EXIT_CHOICE = len(MAIN_MENU_OPTIONS) + 1
+
+# Static menu and help screens, each written with a single call
+_MAIN_MENU = (
+    "\n"
+    + "=" * 60
+    + "\n📸 PHOTO MANAGEMENT TOOLKIT\n"
+    + "=" * 60
+    + "\n"
+    + "".join(
+        f"{f'{n}.':<4}{label}\n"
+        for n, (label, _) in enumerate(MAIN_MENU_OPTIONS + (("❌ Exit", None),), 1)
+    )
+    + "=" * 60
+    + "\n"
+)
+
+_CREATE_GALLERY_INFO = """
+🖼️ CREATE VIRTUAL GALLERY
+----------------------------------------
+This creates virtual galleries using hard links with smart RAW file handling.
+Gallery types:
+  • 🔍 Search-based galleries (flexible metadata search)
+  • 📋 Picks-based galleries (from saved picks)
+  • 👥 Face sample galleries (one image per person)
+
+Search examples:
+  • People: 'Ben', 'Sarah'
+  • Lenses: '27mm fuji', '85mm', '24-70mm'
+  • Dates: '2023', '2023-12', '2023-12-25'
+  • Date ranges: '2023 to 2024', '2023-01 to 2023-06', '2023-2024'
+  • Cameras: 'Canon', 'Sony', 'Fuji'
+  • Combined: 'Ben 27mm 2023', 'fuji 85mm', '2020-2022 Canon'
+
+RAW file features:
+  • Smart handling of adjacent JPGs vs custom proxies
+  • Database ID tracking for reliable deletion
+  • Gallery folders contain display-ready files
+"""
+
+_HEIC_PROXIES_INFO = """
+🖼️ GENERATE HEIC PROXIES
+----------------------------------------
+This creates WebP proxies from HEIC files for web browser compatibility.
+Benefits:
+  • Enables HEIC viewing in Firefox/Chrome/Edge
+  • Uses high-quality conversion with proper orientation
+  • Maintains full resolution for gallery viewing
+  • Files are named by database ID to avoid conflicts
+  • Original HEIC files remain untouched
+
+Proxy storage: HEIC Proxies/
+Conversion methods: ImageMagick → sips → PIL (fallback)
+"""
+
+_RAW_PROXIES_INFO = """
+🎞️ GENERATE RAW PROXIES
+----------------------------------------
+This creates JPG proxies for RAW files using RawTherapee CLI.
+Features:
+  • Detects camera-generated adjacent JPGs automatically
+  • Uses RawTherapee CLI for high-quality RAW processing
+  • Handles orientation and color profiles correctly
+  • Files are named by database ID to avoid conflicts
+  • Original RAW files remain untouched
+
+Proxy storage: RAW Proxies/
+Processing: Adjacent JPG → RawTherapee CLI conversion
+"""
+
+_VIDEO_PROXIES_INFO = """
+📹 GENERATE VIDEO PROXIES
+----------------------------------------
+This creates h.264 compressed video proxies for fast gallery playback.
+Features:
+  • Optimized for iPad Pro 12.9" retina display (2732px max)
+  • h.264 compression with excellent quality/size balance
+  • Maintains aspect ratio for all video formats
+  • Files are named by database ID to avoid conflicts
+  • Original video files remain untouched
+  • Typical file size reduction: 70-90%
+
+Proxy storage: Video Proxies/
+Processing: FFmpeg h.264 encoding (CRF 23)
+"""
+
+_PROCESS_NEW_IMAGES_INFO = """
+🚀 PROCESS NEW IMAGES
+============================================================
+This will automatically run the complete workflow for new images:
+1. 📊 Extract metadata from photos (including RAW detection)
+2. 🖼️  Generate thumbnails for fast loading
+3. 🖼️  Generate HEIC proxies for web viewing
+4. 🎞️  Generate RAW proxies for RAW file viewing
+5. 📹 Generate video proxies for fast playback
+6. 👥 Extract faces from all images
+7. 🔗 Add new faces to existing people clusters
+
+"""
+
+_FACE_MENU = """
+👥 FACE RECOGNITION
+----------------------------------------
+1. Extract Face Embeddings
+2. Cluster Faces (Full Reset)
+3. Add New Faces to Clusters
+4. ⚙️  Configure Clustering Settings
+5. Label People
+6. View Statistics
+7. Start Face API Server (standalone)
+8. Back to main menu
+
+💡 Tip: Use 'Start Gallery Server' (main menu option 11)
+   to automatically start both servers together.
+"""
+
+
+# How each face clustering setting is shown, in display order
+_SETTING_LABELS = {
+    "eps": "Clustering Sensitivity (eps)",
+    "min_samples": "Min Samples per Person",
+    "similarity_threshold": "Similarity Threshold",
+    "min_samples_new": "Min Faces for New People",
+    "max_iterations": "Max Iterations",
+}
+
+
+# Folder each process_new_images stage writes its output to
+_STAGE_OUTPUTS = {
+    "heic_clean": "HEIC Proxies",
+    "thumb": "thumbnails",
+    "heic": "HEIC Proxies",
+    "raw": "RAW Proxies",
+    "video": "Video Proxies",
+}
+
+
+# Actions a --config file may list; the rest hand the terminal to an interactive
+# script or menu
+HEADLESS_ACTIONS = (
+    "extract_metadata",
+    "setup_database",
+    "generate_thumbnails",
+    "generate_heic_proxies",
+    "generate_raw_proxies",
+    "generate_video_proxies",
+    "process_new_images",
+    "start_gallery_server",
+    "stop_gallery_server",
+    "restart_gallery_server",
+    "quick_rebuild_galleries",
+    "face_extract_embeddings",
+    "face_cluster_new",
+    "face_statistics",
+    "database_debug",
+)
+
 
 class PhotoManager:
-    def __init__(self):
+    # Section header and divider lines
+    _H = "=" * 60
+    _HR = "-" * 40
+    # Galleries listed per page when choosing which to delete
+    _GALLERY_PAGE = 20
+
+    def __init__(self, config=None, legacy_rebuild=False):
         self.base_dir = Path(__file__).parent
+        # With a config nothing is asked: each action reads its answers from the
+        # config section named after it
+        self.config = config or {}
+        self.interactive = config is None
+        self._action = None
+        # Rebuild galleries.json with the script in a child process, as before
+        self.legacy_rebuild = legacy_rebuild
+        self._galleries_module = None
+        self._cuda = None
+        self._scripts = {name: str(self.base_dir / name) for name in SCRIPTS}
+        self._missing = {
+            name for name, path in self._scripts.items() if not os.path.exists(path)
+        }
+        self._children = set()
+        # Main menu option n runs self._actions[n - 1]
+        self._actions = tuple(getattr(self, name) for _, name in MAIN_MENU_OPTIONS)
+        # Persistent Python script runner: (process, command pipe, reply pipe)
+        self._worker = None
+        # face_recognizer_insightface.py --daemon, started by the first face action
+        self._face_worker = None
+        atexit.register(self._stop_face_worker)
+        # (time fetched, text) of the last people statistics, see _face_stats
+        self._face_stats_cache = None
+        # Menu prompt with history, created when a menu is first shown
+        self._menu_session = None
+        # Photo directory offered by default, remembered across sessions
+        self._last_dir = self._load_state().get("last_dir", "Master Photo Library")
 
     def show_main_menu(self):
         """Display main menu options."""
-        print("\n" + "=" * 60)
-        print("📸 PHOTO MANAGEMENT TOOLKIT")
-        print("=" * 60)
-        print("1.  📊 Extract Metadata (scan photos → database)")
-        print("2.  🗄️  Setup Database (create/initialize)")
-        print("3.  🖼️  Create Virtual Gallery (date/face/picks)")
-        print("4.  🔧 Rebuild Gallery JSON (refresh metadata)")
-        print("5.  🖼️  Generate Thumbnails (fast loading)")
-        print("6.  🖼️  Generate HEIC Proxies (WebP for web viewing)")
-        print("7.  🎞️  Generate RAW Proxies (JPG for RAW files)")
-        print("8.  📹 Generate Video Proxies (h.264 for fast playback)")
-        print("9.  🎯 Regenerate RAW Picks (custom processing for picked images)")
-        print(
-            "10. 🚀 Process New Images (extract metadata + thumbnails + proxies + faces)"
-        )
-        print("11. 🌐 Start Gallery Server (web viewer)")
-        print("12. 🛑 Stop Gallery Server (stop all servers)")
-        print("13. 🔄 Restart Gallery Server (rebuild + restart)")
-        print("14. 🔨 Quick Rebuild Galleries List (no restart)")
-        print("15. 👥 Face Recognition (detect/label people)")
-        print("16. 🔍 Database Debug (inspect/troubleshoot)")
-        print("17. 🛠️ Database Cleanup (remove stale entries)")
-        print("18. 🗑️  Delete Culled Images (cleanup)")
-        print("19. 🗂️  Delete Galleries (cleanup)")
-        print("20. ⚙️  Install Dependencies (complete toolkit + RAW support)")
-        print("21. ❌ Exit")
-        print("=" * 60)
-
-    def run_script(self, script_name, args=None, is_python=True):
-        """Run a script with arguments."""
-        script_path = self.base_dir / script_name
-        if not script_path.exists():
+        sys.stdout.write(_MAIN_MENU)
+
+    def script_command(self, script_name, args=None, is_python=True):
+        """Build the command line for a script, or None if the script is missing."""
+        script_path = self._scripts.get(script_name)
+        if script_path is None:
+            script_path = str(self.base_dir / script_name)
+            missing = not os.path.exists(script_path)
+        else:
+            missing = script_name in self._missing
+        if missing:
             print(f"❌ Script not found: {script_name}")
-            return False
+            return None
 
         if is_python:
-            cmd = [sys.executable, str(script_path)]
+            cmd = [sys.executable, script_path]
         else:
-            cmd = ["bash", str(script_path)]
+            cmd = ["bash", script_path]
 
         if args:
             cmd.extend(args)
+        return cmd
+
+    def _run_command(self, cmd, prefix=None):
+        """Run cmd from the base directory and return its exit code.
+
+        With a prefix the output is piped and every line is tagged with it, so
+        scripts running side by side stay readable. Without one the script keeps the
+        terminal, which the interactive scripts need.
+        """
+        if prefix is None and cmd[0] == sys.executable:
+            returncode = self._run_in_worker(cmd[1], cmd[2:])
+            if returncode is not None:
+                return returncode
+
+        if prefix is None:
+            process = subprocess.Popen(cmd, cwd=str(self.base_dir))
+        else:
+            process = subprocess.Popen(
+                cmd,
+                cwd=str(self.base_dir),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                env=dict(os.environ, PYTHONUNBUFFERED="1"),
+            )
+        self._children.add(process)
+        try:
+            if prefix is not None:
+                for line in iter(process.stdout.readline, ""):
+                    sys.stdout.write(f"[{prefix}] {line}")
+            return process.wait()
+        finally:
+            self._children.discard(process)
+
+    def _start_worker(self):
+        """Start Scripts/_worker.py, or return None where it can't run."""
+        if not hasattr(os, "fork") or "Scripts/_worker.py" in self._missing:
+            return None
+        command_read, command_write = os.pipe()
+        reply_read, reply_write = os.pipe()
+        try:
+            process = subprocess.Popen(
+                [
+                    sys.executable,
+                    self._scripts["Scripts/_worker.py"],
+                    str(command_read),
+                    str(reply_write),
+                ],
+                cwd=str(self.base_dir),
+                pass_fds=(command_read, reply_write),
+            )
+        except OSError:
+            os.close(command_write)
+            os.close(reply_read)
+            return None
+        finally:
+            os.close(command_read)
+            os.close(reply_write)
+        return process, os.fdopen(command_write, "w"), os.fdopen(reply_read)
+
+    def _stop_worker(self):
+        if self._worker is None:
+            return
+        process, commands, replies = self._worker
+        self._worker = None
+        commands.close()
+        replies.close()
+        if process.poll() is None:
+            process.terminate()
+            process.wait()
+
+    def _run_in_worker(self, script_path, args):
+        """Run a Python script in the persistent worker, saving an interpreter start.
+
+        Returns its exit code, or None if the worker couldn't take the job, in which
+        case nothing was run.
+        """
+        if self._worker is not None and self._worker[0].poll() is not None:
+            self._stop_worker()
+        if self._worker is None:
+            self._worker = self._start_worker()
+            if self._worker is None:
+                return None
+
+        _, commands, replies = self._worker
+        try:
+            commands.write(json.dumps({"script": script_path, "args": args}) + "\n")
+            commands.flush()
+        except OSError:
+            self._stop_worker()
+            return None
+
+        reply = replies.readline()
+        if not reply:
+            # The worker died while the script ran
+            self._stop_worker()
+            return 1
+        return json.loads(reply)["rc"]
+
+    def _terminate_children(self):
+        """Send SIGTERM to every running script, then wait for them to exit."""
+        self._stop_worker()
+        children = list(self._children)
+        for process in children:
+            process.terminate()
+        for process in children:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def run_script(
+        self, script_name, args=None, is_python=True, prefix=None, check=True
+    ):
+        """Run a script with arguments.
+
+        Returns whether it exited cleanly, or always True when check is False.
+        """
+        cmd = self.script_command(script_name, args, is_python)
+        if not cmd:
+            return False
 
         try:
             print(f"🚀 Running: {' '.join(cmd)}")
-            subprocess.run(cmd, cwd=str(self.base_dir))
-            return True
+            returncode = self._run_command(cmd, prefix)
+            return returncode == 0 or not check
         except KeyboardInterrupt:
+            self._terminate_children()
             print("\n⚠️ Interrupted by user")
             return False
         except Exception as e:
             print(f"❌ Error running {script_name}: {e}")
             return False
 
-    def extract_metadata(self):
-        """Extract metadata from photos to database."""
-        print("\n📊 EXTRACT METADATA")
-        print("-" * 40)
+    def run_scripts_parallel(self, stages):
+        """Run independent (label, title, script_name, args) stages at the same time.
+
+        Output is streamed as it arrives, each line tagged with its stage's label.
+        Returns a success flag per stage.
+        """
+        if not stages:
+            return []
+        commands = [self.script_command(name, args) for _, _, name, args in stages]
+        for (label, title, _, _), cmd in zip(stages, commands):
+            print(f"{title} [{label}]")
+            if cmd:
+                print(f"🚀 Running: {' '.join(cmd)}")
+
+        def run_stage(item):
+            (label, _, name, _), cmd = item
+            if not cmd:
+                return False
+            try:
+                return self._run_command(cmd, prefix=label) == 0
+            except Exception as e:
+                print(f"❌ Error running {name}: {e}")
+                return False
 
-        directory = input(
-            "Photo directory (or Enter for 'Master Photo Library'): "
+        workers = min(len(stages), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                return list(pool.map(run_stage, zip(stages, commands)))
+            except KeyboardInterrupt:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._terminate_children()
+                print("\n⚠️ Interrupted by user")
+                return [False] * len(stages)
+
+    def _configured(self, key, default=""):
+        """The config's answer for key under the running action, or default."""
+        return self.config.get(self._action, {}).get(key, default)
+
+    def _input(self, prompt, key=None):
+        """input(), or in config mode the configured answer for key ("" if unset)."""
+        if self.interactive:
+            return input(prompt)
+        if key is None:
+            return ""
+        value = self._configured(key)
+        return "" if value is None else str(value)
+
+    def _section(self, title, *lines):
+        """Print an action's title, a divider and any description lines in one write."""
+        sys.stdout.write("\n".join(("", title, self._HR, *lines, "")))
+
+    def _yn(self, prompt, default=False, key=None):
+        """Ask a yes/no question; an empty answer gives the default."""
+        if not self.interactive:
+            return bool(self._configured(key, default)) if key else default
+        answer = input(prompt).strip()
+        if not answer:
+            return default
+        return answer[0] in "yY"
+
+    def ask_flags(self, options):
+        """Ask a set of yes/no options at once; returns the flags the user chose.
+
+        options is a list of (flag, question). With questionary installed they are one
+        checkbox list; otherwise each is asked as a y/N prompt.
+        """
+        if questionary is not None and self.interactive:
+            choices = [
+                questionary.Choice(question, value=flag) for flag, question in options
+            ]
+            selected = questionary.checkbox(
+                "Options (space to toggle, Enter to accept):", choices=choices
+            ).ask()
+            return selected or []
+        return [
+            flag
+            for flag, question in options
+            if self._yn(f"{question} (y/N): ", key=flag[2:].replace("-", "_"))
+        ]
+
+    def prompt_workers(self, args):
+        """Ask how many files to process at once; adds --workers to args if given."""
+        cpu_count = os.cpu_count() or 1
+        workers = self._input(
+            f"Parallel workers (Enter for {cpu_count} CPU cores): ", "workers"
+        ).strip()
+        if workers.isdigit() and int(workers) > 0:
+            # More workers than cores only adds contention
+            args.extend(["--workers", str(min(int(workers), cpu_count))])
+
+    def _state_file(self):
+        return self.base_dir / ".photo_manager_state.json"
+
+    def _menu_input(self, prompt, choices):
+        """Read a menu choice; with prompt_toolkit, earlier choices can be recalled."""
+        if PromptSession is None or not sys.stdin.isatty():
+            return input(prompt).strip()
+        if self._menu_session is None:
+            history = FileHistory(str(self.base_dir / ".menu_history"))
+            self._menu_session = PromptSession(history=history)
+        return self._menu_session.prompt(
+            prompt, completer=WordCompleter(list(choices))
         ).strip()
-        if not directory:
-            directory = "Master Photo Library"
 
+    def _load_state(self):
+        """Settings kept between sessions, such as the last photo directory."""
+        try:
+            with open(self._state_file()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _remember_directory(self, directory):
+        """Offer directory by default from now on, in this and later sessions."""
+        if directory == self._last_dir:
+            return
+        self._last_dir = directory
+        state = self._load_state()
+        state["last_dir"] = directory
+        state_file = self._state_file()
+        tmp_file = state_file.with_name(state_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_file, state_file)
+
+    def ask_directory(self):
+        """Ask for a photo directory, defaulting to the last one used.
+
+        Returns None if it doesn't exist.
+        """
+        directory = self._input(
+            f"Photo directory (or Enter for '{self._last_dir}'): ", "directory"
+        )
+        directory = directory.strip() or self._last_dir
         if not os.path.exists(directory):
             print(f"❌ Directory not found: {directory}")
+            return None
+        return directory
+
+    def extract_metadata(self):
+        """Extract metadata from photos to database."""
+        self._section("📊 EXTRACT METADATA")
+
+        directory = self.ask_directory()
+        if directory is None:
             return
 
         args = [directory]
 
         print("\nOptions:")
-        if input("Force re-extract existing metadata? (y/N): ").lower().startswith("y"):
-            args.append("--force")
-        if input("Include file hashes? (slower) (y/N): ").lower().startswith("y"):
-            args.append("--hash")
-        if input("Skip deleted file cleanup? (y/N): ").lower().startswith("y"):
-            args.append("--no-cleanup")
+        args += self.ask_flags(
+            [
+                ("--force", "Force re-extract existing metadata?"),
+                ("--hash", "Include file hashes? (slower)"),
+                ("--no-cleanup", "Skip deleted file cleanup?"),
+            ]
+        )
 
-        self.run_script("Scripts/extract_metadata.py", args)
+        if self.run_script("Scripts/extract_metadata.py", args):
+            self._remember_directory(directory)
 
     def setup_database(self):
         """Create or initialize database."""
-        print("\n🗄️ DATABASE SETUP")
-        print("-" * 40)
+        self._section("🗄️ DATABASE SETUP")
 
-        db_path = input(
-            "Database path (or Enter for 'Scripts/image_metadata.db'): "
+        db_path = self._input(
+            "Database path (or Enter for 'Scripts/image_metadata.db'): ", "db_path"
         ).strip()
         if not db_path:
             db_path = "Scripts/image_metadata.db"
 
         if os.path.exists(db_path):
             print(f"⚠️ Database already exists: {db_path}")
-            if not input("Continue anyway? (y/N): ").lower().startswith("y"):
+            if not self._yn("Continue anyway? (y/N): ", key="continue"):
                 return
 
         args = [] if db_path == "Scripts/image_metadata.db" else [db_path]
@@ -118,175 +639,127 @@ class PhotoManager:
 
     def create_gallery(self):
         """Create virtual gallery with flexible search functionality."""
-        print("\n🖼️ CREATE VIRTUAL GALLERY")
-        print("-" * 40)
-        print(
-            "This creates virtual galleries using hard links with smart RAW file handling."
-        )
-        print("Gallery types:")
-        print("  • 🔍 Search-based galleries (flexible metadata search)")
-        print("  • 📋 Picks-based galleries (from saved picks)")
-        print("  • 👥 Face sample galleries (one image per person)")
-        print()
-        print("Search examples:")
-        print("  • People: 'Ben', 'Sarah'")
-        print("  • Lenses: '27mm fuji', '85mm', '24-70mm'")
-        print("  • Dates: '2023', '2023-12', '2023-12-25'")
-        print("  • Date ranges: '2023 to 2024', '2023-01 to 2023-06', '2023-2024'")
-        print("  • Cameras: 'Canon', 'Sony', 'Fuji'")
-        print("  • Combined: 'Ben 27mm 2023', 'fuji 85mm', '2020-2022 Canon'")
-        print()
-        print("RAW file features:")
-        print("  • Smart handling of adjacent JPGs vs custom proxies")
-        print("  • Database ID tracking for reliable deletion")
-        print("  • Gallery folders contain display-ready files")
+        sys.stdout.write(_CREATE_GALLERY_INFO)
 
-        input("\nPress Enter to start gallery creation...")
+        self._input("\nPress Enter to start gallery creation...")
         self.run_script("Scripts/gallery_create_search.py")
 
     def rebuild_gallery_json(self):
         """Rebuild gallery JSON files."""
-        print("\n🔧 REBUILD GALLERY JSON")
-        print("-" * 40)
+        self._section("🔧 REBUILD GALLERY JSON")
 
-        directory = input("Gallery directory path (or Enter for interactive): ").strip()
+        directory = self._input(
+            "Gallery directory path (or Enter for interactive): ", "directory"
+        ).strip()
         args = [directory] if directory else []
 
         self.run_script("Scripts/gallery_rebuild_json.sh", args, is_python=False)
 
     def generate_thumbnails(self):
         """Generate thumbnails for fast gallery loading."""
-        print("\n🖼️ GENERATE THUMBNAILS")
-        print("-" * 40)
-        print("This creates optimized thumbnails for fast gallery loading.")
-        print("Thumbnails are stored on main drive for maximum performance.")
+        self._section(
+            "🖼️ GENERATE THUMBNAILS",
+            "This creates optimized thumbnails for fast gallery loading.",
+            "Thumbnails are stored on main drive for maximum performance.",
+        )
 
         print("\nOptions:")
-        limit = input("Limit to recent N images (or Enter for all): ").strip()
+        limit = self._input(
+            "Limit to recent N images (or Enter for all): ", "limit"
+        ).strip()
 
         args = []
         if limit and limit.isdigit():
             args.extend(["--limit", limit])
-        if (
-            input("Force regenerate existing thumbnails? (y/N): ")
-            .lower()
-            .startswith("y")
-        ):
-            args.append("--force")
-        if (
-            input("Generate thumbnails only for HEIC files? (y/N): ")
-            .lower()
-            .startswith("y")
-        ):
-            args.append("--heic-only")
-        if input("Show statistics only? (y/N): ").lower().startswith("y"):
+        flags = self.ask_flags(
+            [
+                ("--force", "Force regenerate existing thumbnails?"),
+                ("--heic-only", "Generate thumbnails only for HEIC files?"),
+                ("--stats", "Show statistics only?"),
+            ]
+        )
+        if "--stats" in flags:
             args = ["--stats"]
+        else:
+            args += flags
+            self.prompt_workers(args)
 
         self.run_script("Scripts/generate_thumbnails.py", args)
 
     def generate_heic_proxies(self):
         """Generate WebP proxies from HEIC files for web viewing."""
-        print("\n🖼️ GENERATE HEIC PROXIES")
-        print("-" * 40)
-        print(
-            "This creates WebP proxies from HEIC files for web browser compatibility."
-        )
-        print("Benefits:")
-        print("  • Enables HEIC viewing in Firefox/Chrome/Edge")
-        print("  • Uses high-quality conversion with proper orientation")
-        print("  • Maintains full resolution for gallery viewing")
-        print("  • Files are named by database ID to avoid conflicts")
-        print("  • Original HEIC files remain untouched")
-
-        print(f"\nProxy storage: HEIC Proxies/")
-        print("Conversion methods: ImageMagick → sips → PIL (fallback)")
+        sys.stdout.write(_HEIC_PROXIES_INFO)
 
-        input("\nPress Enter to generate HEIC proxies...")
-        self.run_script("Scripts/generate_heic_proxies.py")
+        args = []
+        print()
+        self.prompt_workers(args)
+        self.run_script("Scripts/generate_heic_proxies.py", args)
 
     def generate_raw_proxies(self):
         """Generate JPG proxies from RAW files using RawTherapee CLI."""
-        print("\n🎞️ GENERATE RAW PROXIES")
-        print("-" * 40)
-        print("This creates JPG proxies for RAW files using RawTherapee CLI.")
-        print("Features:")
-        print("  • Detects camera-generated adjacent JPGs automatically")
-        print("  • Uses RawTherapee CLI for high-quality RAW processing")
-        print("  • Handles orientation and color profiles correctly")
-        print("  • Files are named by database ID to avoid conflicts")
-        print("  • Original RAW files remain untouched")
-
-        print(f"\nProxy storage: RAW Proxies/")
-        print("Processing: Adjacent JPG → RawTherapee CLI conversion")
+        sys.stdout.write(_RAW_PROXIES_INFO)
 
         args = []
         print("\nOptions:")
-        if input("Force regenerate existing proxies? (y/N): ").lower().startswith("y"):
+        if self._yn("Force regenerate existing proxies? (y/N): ", key="force"):
             args.append("--force")
-        if input("Clean up orphaned proxies first? (y/N): ").lower().startswith("y"):
+        if self._yn("Clean up orphaned proxies first? (y/N): ", key="clean"):
             # Run cleanup first
             print("\n🧹 Cleaning up orphaned proxies...")
             self.run_script("Scripts/generate_raw_proxies.py", ["--clean"])
-            input("Press Enter to continue with proxy generation...")
+            self._input("Press Enter to continue with proxy generation...")
+
+        self.prompt_workers(args)
 
         print("\nGenerating RAW proxies...")
         self.run_script("Scripts/generate_raw_proxies.py", args)
 
     def generate_video_proxies(self):
         """Generate h.264 video proxies for fast playback."""
-        print("\n📹 GENERATE VIDEO PROXIES")
-        print("-" * 40)
-        print("This creates h.264 compressed video proxies for fast gallery playback.")
-        print("Features:")
-        print('  • Optimized for iPad Pro 12.9" retina display (2732px max)')
-        print("  • h.264 compression with excellent quality/size balance")
-        print("  • Maintains aspect ratio for all video formats")
-        print("  • Files are named by database ID to avoid conflicts")
-        print("  • Original video files remain untouched")
-        print("  • Typical file size reduction: 70-90%")
-
-        print(f"\nProxy storage: Video Proxies/")
-        print("Processing: FFmpeg h.264 encoding (CRF 23)")
+        sys.stdout.write(_VIDEO_PROXIES_INFO)
 
         args = []
         print("\nOptions:")
 
-        limit = input("Limit to recent N videos (or Enter for all): ").strip()
+        limit = self._input(
+            "Limit to recent N videos (or Enter for all): ", "limit"
+        ).strip()
         if limit and limit.isdigit():
             args.extend(["--limit", limit])
 
-        if input("Force regenerate existing proxies? (y/N): ").lower().startswith("y"):
+        if self._yn("Force regenerate existing proxies? (y/N): ", key="force"):
             args.append("--force")
 
-        if input("Clean up orphaned proxies first? (y/N): ").lower().startswith("y"):
+        if self._yn("Clean up orphaned proxies first? (y/N): ", key="clean"):
             # Run cleanup first
             self.run_script("Scripts/generate_video_proxies.py", ["--clean"])
-            input("Press Enter to continue with proxy generation...")
+            self._input("Press Enter to continue with proxy generation...")
 
-        if input("Show statistics only? (y/N): ").lower().startswith("y"):
+        if self._yn("Show statistics only? (y/N): ", key="stats"):
             args = ["--stats"]
         else:
             # Quality settings
             print("\nQuality settings:")
-            crf = input(
-                "Quality setting CRF (18-28, lower=better, Enter for 23): "
+            crf = self._input(
+                "Quality setting CRF (18-28, lower=better, Enter for 23): ", "crf"
             ).strip()
             if crf and crf.isdigit() and 18 <= int(crf) <= 28:
                 args.extend(["--crf", crf])
 
-            max_dim = input(
-                "Max dimension in pixels (Enter for 2732 iPad Pro): "
+            max_dim = self._input(
+                "Max dimension in pixels (Enter for 2732 iPad Pro): ", "max_dimension"
             ).strip()
             if max_dim and max_dim.isdigit():
                 args.extend(["--max-dimension", max_dim])
 
+            self.prompt_workers(args)
+
         print("\nGenerating video proxies...")
         self.run_script("Scripts/generate_video_proxies.py", args)
 
     def regenerate_raw_picks(self):
         """Regenerate RAW picks with custom RawTherapee settings."""
-        print("\n🎯 REGENERATE RAW PICKS")
-        print("-" * 40)
+        self._section("🎯 REGENERATE RAW PICKS")
         print(
             "This regenerates selected RAW files from picks.json with custom settings."
         )
@@ -302,14 +775,13 @@ class PhotoManager:
         args = []
 
         print("\nCustom settings:")
-        quality = input("JPEG quality (1-100, Enter for 95): ").strip()
+        quality = self._input("JPEG quality (1-100, Enter for 95): ", "quality").strip()
         if quality and quality.isdigit() and 1 <= int(quality) <= 100:
             args.extend(["--quality", quality])
 
-        use_custom_style = (
-            input("Use custom RawTherapee style? (Y/n): ").strip().lower()
-        )
-        if use_custom_style in ["n", "no"]:
+        if not self._yn(
+            "Use custom RawTherapee style? (Y/n): ", default=True, key="custom_style"
+        ):
             # User wants default settings - we'll pass an empty preset to skip interactive menu
             print("Using default RawTherapee settings...")
             args.extend(["--preset", "DEFAULT"])
@@ -317,110 +789,202 @@ class PhotoManager:
             # Don't pass --preset argument, which will trigger interactive style selection
             print("Interactive style selection will be shown next...")
 
-        if input("Force regenerate existing proxies? (y/N): ").lower().startswith("y"):
+        if self._yn("Force regenerate existing proxies? (y/N): ", key="force"):
             args.append("--force")
 
-        if input("Regenerate thumbnails after processing? (Y/n): ").lower() != "n":
+        if self._yn(
+            "Regenerate thumbnails after processing? (Y/n): ",
+            default=True,
+            key="regenerate_thumbnails",
+        ):
             args.append("--regenerate-thumbnails")
 
         print("\nRegenerating RAW picks...")
         self.run_script("Scripts/regenerate_raw_picks.py", args)
 
+    def _process_state_file(self):
+        return self.base_dir / ".process_state.json"
+
+    def _load_process_state(self):
+        """Finished process_new_images stages, as {stage: _stage_key after the run}."""
+        try:
+            with open(self._process_state_file()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_process_state(self, done):
+        state_file = self._process_state_file()
+        tmp_file = state_file.with_name(state_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(done, f)
+        os.replace(tmp_file, state_file)
+
+    def _stage_key(self, stage):
+        """What a process_new_images stage's result depends on, or None if unknown.
+
+        Every stage works on the whole database, so the key is the images table's row
+        count and highest ID (plus the face count for the face stages) and the number
+        of files in the stage's output folder.
+        """
+        db_path = self.base_dir / "Scripts" / "image_metadata.db"
+        try:
+            conn = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                key = list(
+                    conn.execute("SELECT COUNT(*), MAX(id) FROM images").fetchone()
+                )
+                if stage in ("faces", "cluster"):
+                    key += conn.execute("SELECT COUNT(*) FROM faces").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+        output = _STAGE_OUTPUTS.get(stage)
+        if output:
+            try:
+                with os.scandir(self.base_dir / output) as entries:
+                    key.append(sum(1 for _ in entries))
+            except OSError:
+                key.append(0)
+        return key
+
     def process_new_images(self):
         """Complete automated workflow for processing new images."""
-        print("\n🚀 PROCESS NEW IMAGES")
-        print("=" * 60)
-        print("This will automatically run the complete workflow for new images:")
-        print("1. 📊 Extract metadata from photos (including RAW detection)")
-        print("2. 🖼️  Generate thumbnails for fast loading")
-        print("3. 🖼️  Generate HEIC proxies for web viewing")
-        print("4. 🎞️  Generate RAW proxies for RAW file viewing")
-        print("5. 📹 Generate video proxies for fast playback")
-        print("6. 👥 Extract faces from all images")
-        print("7. 🔗 Add new faces to existing people clusters")
-        print()
-
-        directory = input(
-            "Photo directory (or Enter for 'Master Photo Library'): "
-        ).strip()
-        if not directory:
-            directory = "Master Photo Library"
+        sys.stdout.write(_PROCESS_NEW_IMAGES_INFO)
 
-        if not os.path.exists(directory):
-            print(f"❌ Directory not found: {directory}")
+        directory = self.ask_directory()
+        if directory is None:
             return
 
-        print(f"\n🎯 Processing new images from: {directory}")
-        print("=" * 60)
+        face_device_args = self.ask_face_device()
 
-        # Step 1: Extract Metadata
-        print("\n📊 STEP 1: Extracting metadata...")
-        print("-" * 40)
+        print(f"\n🎯 Processing new images from: {directory}")
+        print(self._H)
+
+        # Stages after metadata extraction are skipped on a rerun when neither the
+        # database nor their output has changed since they last finished
+        done = self._load_process_state()
+
+        def is_done(stage):
+            key = self._stage_key(stage)
+            return key is not None and done.get(stage) == key
+
+        def mark_done(stage):
+            key = self._stage_key(stage)
+            if key is not None:
+                done[stage] = key
+
+        def run_stage(stage, script_name, args=None):
+            if is_done(stage):
+                print("⏭️ Nothing new since the last run, skipping")
+                return True
+            success = self.run_script(script_name, args)
+            if success:
+                mark_done(stage)
+                self._save_process_state(done)
+            return success
+
+        # Step 1: Extract Metadata (always run: it finds what is new in the directory)
+        self._section("📊 STEP 1: Extracting metadata...")
         metadata_success = self.run_script("Scripts/extract_metadata.py", [directory])
 
         if not metadata_success:
             print("❌ Metadata extraction failed. Stopping workflow.")
             return
+        self._remember_directory(directory)
 
         # Step 1.5: Clean up orphaned HEIC proxies
-        print("\n🧹 STEP 1.5: Cleaning orphaned HEIC proxies...")
-        print("-" * 40)
-        cleanup_success = self.run_script(
-            "Scripts/generate_heic_proxies.py", ["--clean"]
+        self._section("🧹 STEP 1.5: Cleaning orphaned HEIC proxies...")
+        cleanup_success = run_stage(
+            "heic_clean", "Scripts/generate_heic_proxies.py", ["--clean"]
         )
 
         if not cleanup_success:
             print("⚠️ Proxy cleanup failed, but continuing...")
 
-        # Step 2: Generate Thumbnails
-        print("\n🖼️  STEP 2: Generating thumbnails...")
-        print("-" * 40)
-        thumbnail_success = self.run_script(
-            "Scripts/generate_thumbnails.py", ["--force"]
-        )
-
-        if not thumbnail_success:
-            print("⚠️ Thumbnail generation failed, but continuing...")
-
-        # Step 3: Generate HEIC Proxies
-        print("\n🖼️  STEP 3: Generating HEIC proxies...")
-        print("-" * 40)
-        proxy_success = self.run_script("Scripts/generate_heic_proxies.py")
-
-        if not proxy_success:
-            print("⚠️ HEIC proxy generation failed, but continuing...")
-
-        # Step 4: Generate RAW Proxies
-        print("\n🎞️  STEP 4: Generating RAW proxies...")
-        print("-" * 40)
-        raw_proxy_success = self.run_script("Scripts/generate_raw_proxies.py")
-
-        if not raw_proxy_success:
-            print("⚠️ RAW proxy generation failed, but continuing...")
-
-        # Step 5: Generate Video Proxies
-        print("\n📹 STEP 5: Generating video proxies...")
-        print("-" * 40)
-        video_proxy_success = self.run_script("Scripts/generate_video_proxies.py")
-
-        if not video_proxy_success:
-            print("⚠️ Video proxy generation failed, but continuing...")
+        # Steps 2-5 write separate outputs (thumbnails, HEIC, RAW and video proxies)
+        # and don't wait on each other, so they run side by side
+        print("\n⚡ STEPS 2-5: Generating thumbnails and proxies in parallel...")
+        stages = [
+            (
+                "thumb",
+                "🖼️  STEP 2: Generating thumbnails...",
+                "Scripts/generate_thumbnails.py",
+                ["--force"],
+            ),
+            (
+                "heic",
+                "🖼️  STEP 3: Generating HEIC proxies...",
+                "Scripts/generate_heic_proxies.py",
+                None,
+            ),
+            (
+                "raw",
+                "🎞️  STEP 4: Generating RAW proxies...",
+                "Scripts/generate_raw_proxies.py",
+                None,
+            ),
+            (
+                "video",
+                "📹 STEP 5: Generating video proxies...",
+                "Scripts/generate_video_proxies.py",
+                None,
+            ),
+        ]
+        failure_messages = [
+            "⚠️ Thumbnail generation failed, but continuing...",
+            "⚠️ HEIC proxy generation failed, but continuing...",
+            "⚠️ RAW proxy generation failed, but continuing...",
+            "⚠️ Video proxy generation failed, but continuing...",
+        ]
+        pending = []
+        for stage in stages:
+            if is_done(stage[0]):
+                print(f"⏭️ {stage[1]} nothing new since the last run, skipping")
+            else:
+                pending.append(stage)
+        # Each script sizes its own pool to every core, so split the cores between
+        # the stages running together (video encodes single-threaded per worker)
+        share = str(max(1, (os.cpu_count() or 1) // max(1, len(pending))))
+        pending = [
+            (
+                label,
+                title,
+                script_name,
+                (args or [])
+                + ["--workers", share]
+                + (["--ffmpeg-threads", "1"] if label == "video" else []),
+            )
+            for label, title, script_name, args in pending
+        ]
+        labels = [stage[0] for stage in pending]
+        results = dict(zip(labels, self.run_scripts_parallel(pending)))
+        for (label, _, _, _), message in zip(stages, failure_messages):
+            if label not in results:
+                continue
+            if results[label]:
+                mark_done(label)
+            else:
+                print(message)
+        self._save_process_state(done)
 
         # Step 6: Extract Faces
-        print("\n👥 STEP 6: Extracting faces from all images...")
-        print("-" * 40)
-        face_extract_success = self.run_script(
-            "Scripts/face_recognizer_insightface.py", ["--extract"]
+        self._face_stats_cache = None  # Steps 6 and 7 change the people
+        self._section("👥 STEP 6: Extracting faces from all images...")
+        face_extract_success = run_stage(
+            "faces",
+            "Scripts/face_recognizer_insightface.py",
+            ["--extract"] + face_device_args,
         )
 
         if not face_extract_success:
             print("⚠️ Face extraction failed, but continuing...")
 
         # Step 7: Cluster New Faces
-        print("\n🔗 STEP 7: Adding new faces to existing clusters (iterative)...")
-        print("-" * 40)
-        cluster_success = self.run_script(
-            "Scripts/face_recognizer_insightface.py", ["--cluster-new-loop"]
+        self._section("🔗 STEP 7: Adding new faces to existing clusters (iterative)...")
+        cluster_success = run_stage(
+            "cluster", "Scripts/face_recognizer_insightface.py", ["--cluster-new-loop"]
         )
 
         if not cluster_success:
@@ -428,7 +992,7 @@ class PhotoManager:
 
         # Summary
         print("\n🎉 NEW IMAGE PROCESSING COMPLETE!")
-        print("=" * 60)
+        print(self._H)
         print("✅ Metadata extracted and database updated (including RAW detection)")
         print("✅ Orphaned HEIC proxies cleaned up")
         print("✅ Thumbnails generated for fast gallery loading")
@@ -443,30 +1007,154 @@ class PhotoManager:
         print("   • Create new galleries with the imported images (option 3)")
         print("   • Start gallery server to view results (option 8)")
 
+    def _server_pids_file(self):
+        return self.base_dir / ".gallery_pids.json"
+
+    def _load_server_pids(self):
+        """Servers started from this toolkit, as [{"name", "script", "pid"}]."""
+        try:
+            with open(self._server_pids_file()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _record_server(self, name, script, process):
+        """Remember a server's PID so stopping it doesn't have to search for it."""
+        servers = self._load_server_pids()
+        servers.append({"name": name, "script": script, "pid": process.pid})
+        pids_file = self._server_pids_file()
+        tmp_file = pids_file.with_name(pids_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(servers, f)
+        os.replace(tmp_file, pids_file)
+
+    def _start_server(self, name, script, cmd):
+        """Start a server in its own process group and record its PID."""
+        process = subprocess.Popen(
+            cmd,
+            cwd=str(self.base_dir),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,  # Its process group holds every server it spawns
+        )
+        self._record_server(name, script, process)
+        return process
+
+    def _stop_tracked_servers(self, timeout=2.0):
+        """Stop recorded servers: SIGTERM their process groups, SIGKILL after timeout.
+
+        Returns the names of the servers that were running.
+        """
+        servers = self._load_server_pids()
+        if not servers:
+            return []
+
+        # Only signal PIDs still running the recorded script; PIDs get reused
+        pid_list = ",".join(str(server["pid"]) for server in servers)
+        ps = subprocess.run(
+            ["ps", "-o", "pid=,command=", "-p", pid_list], capture_output=True, text=True
+        )
+        commands = dict(
+            line.strip().split(None, 1)
+            for line in ps.stdout.splitlines()
+            if len(line.split(None, 1)) == 2
+        )
+        running = [
+            s for s in servers if s["script"] in commands.get(str(s["pid"]), "")
+        ]
+
+        for server in running:
+            try:
+                os.killpg(server["pid"], signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+        deadline = time.monotonic() + timeout
+        alive = running
+        while alive:
+            still_alive = []
+            for server in alive:
+                try:
+                    os.waitpid(server["pid"], os.WNOHANG)  # Reap it if it's our child
+                except ChildProcessError:
+                    pass
+                try:
+                    os.killpg(server["pid"], 0)
+                    still_alive.append(server)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            alive = still_alive
+            if not alive:
+                break
+            if time.monotonic() > deadline:
+                for server in alive:
+                    try:
+                        os.killpg(server["pid"], signal.SIGKILL)
+                    except (ProcessLookupError, PermissionError):
+                        pass
+                break
+            time.sleep(0.05)
+
+        try:
+            self._server_pids_file().unlink()
+        except FileNotFoundError:
+            pass
+        return [server["name"] for server in running]
+
+    @staticmethod
+    def _port_in_use(port):
+        """Whether something is bound to port, checked by trying to bind it."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            sock.bind(("", port))
+            return False
+        except OSError:
+            return True
+        finally:
+            sock.close()
+
+    def _free_ports(self, ports):
+        """SIGTERM every process listening on ports, found with a single lsof call.
+
+        Returns the PIDs that were signalled.
+        """
+        result = subprocess.run(
+            ["lsof", "-t"] + [f"-i:{port}" for port in ports],
+            capture_output=True,
+            text=True,
+        )
+        killed = []
+        for pid in sorted(set(result.stdout.split()), key=int):
+            try:
+                os.kill(int(pid), signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                continue
+            killed.append(int(pid))
+        return killed
+
     def start_gallery_server(self):
         """Start all three servers: gallery web server, face API server, and gallery API server."""
-        print("\n🌐 START GALLERY SERVER")
-        print("-" * 40)
-        print("This will start:")
-        print("  • Face API Server (port 8001) - Face recognition")
-        print("  • Gallery API Server (port 8002) - Gallery management & image processing")
-        print("  • Gallery Web Server (port 8000) - Web interface")
-        print("You can then open http://localhost:8000 in your browser.")
-        print("Full functionality will be available with all three servers.")
+        self._section(
+            "🌐 START GALLERY SERVER",
+            "This will start:",
+            "  • Face API Server (port 8001) - Face recognition",
+            "  • Gallery API Server (port 8002) - Gallery management & image processing",
+            "  • Gallery Web Server (port 8000) - Web interface",
+            "You can then open http://localhost:8000 in your browser.",
+            "Full functionality will be available with all three servers.",
+        )
 
-        input("\nPress Enter to start servers...")
+        self._input("\nPress Enter to start servers...")
 
         try:
             # Use the updated startup script that handles all three servers
             print("🚀 Starting all servers...")
-            server_process = subprocess.Popen(
-                ["bash", str(self.base_dir / "Scripts" / "start_local_servers.sh")],
-                cwd=str(self.base_dir),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            server_process = self._start_server(
+                "All servers",
+                "start_local_servers.sh",
+                ["bash", self._scripts["Scripts/start_local_servers.sh"]],
             )
 
-            import time
             time.sleep(3)  # Give servers time to start
 
             print("\n🌐 All servers are now running!")
@@ -477,7 +1165,7 @@ class PhotoManager:
             print("👈 Press Ctrl+C in the server terminal to stop, then return here...")
 
             # Wait for user to acknowledge
-            input("\nPress Enter when you're done using the servers...")
+            self._input("\nPress Enter when you're done using the servers...")
 
         except Exception as e:
             print(f"❌ Error starting servers: {e}")
@@ -485,97 +1173,50 @@ class PhotoManager:
 
     def stop_gallery_server(self):
         """Stop all three servers: gallery, face API, and gallery API servers."""
-        print("\n🛑 STOP ALL SERVERS")
-        print("-" * 40)
-        print("This will stop:")
-        print("  • Face API Server (port 8001)")
-        print("  • Gallery API Server (port 8002)")
-        print("  • Gallery Web Server (port 8000)")
-        print("  • Any related HTTP servers")
+        self._section(
+            "🛑 STOP ALL SERVERS",
+            "This will stop:",
+            "  • Face API Server (port 8001)",
+            "  • Gallery API Server (port 8002)",
+            "  • Gallery Web Server (port 8000)",
+            "  • Any related HTTP servers",
+        )
 
         try:
             print("🛑 Stopping servers...")
 
-            # Stop face API server
-            result1 = subprocess.run(
-                ["pkill", "-f", "Scripts/face_api_server.py"], capture_output=True
-            )
-
-            # Stop gallery API server
-            result2 = subprocess.run(
-                ["pkill", "-f", "Scripts/gallery_api_server.py"], capture_output=True
-            )
-
-            # Stop gallery server startup script
-            result3 = subprocess.run(
-                ["pkill", "-f", "Scripts/start_gallery_server.sh"], capture_output=True
-            )
-
-            # Stop local servers script
-            result4 = subprocess.run(
-                ["pkill", "-f", "Scripts/start_local_servers.sh"], capture_output=True
-            )
-
-            # Stop any Python HTTP servers (from start_gallery_server.sh)
-            result5 = subprocess.run(
-                ["pkill", "-f", "python.*http.server"], capture_output=True
-            )
-
-            # More aggressive kill for processes using ports 8000, 8001, and 8002
-            import time
-
-            time.sleep(1)  # Give processes time to die gracefully
-
-            # Check and kill anything still using port 8000 (Gallery Web Server)
-            try:
-                lsof_result = subprocess.run(
-                    ["lsof", "-t", "-i:8000"], capture_output=True, text=True
-                )
-                if lsof_result.stdout.strip():
-                    pids = lsof_result.stdout.strip().split("\n")
-                    for pid in pids:
-                        subprocess.run(["kill", pid], capture_output=True)
-                        print(f"✅ Killed process {pid} using port 8000")
-            except:
-                pass
-
-            # Check and kill anything still using port 8001 (Face API Server)
-            try:
-                lsof_result = subprocess.run(
-                    ["lsof", "-t", "-i:8001"], capture_output=True, text=True
-                )
-                if lsof_result.stdout.strip():
-                    pids = lsof_result.stdout.strip().split("\n")
-                    for pid in pids:
-                        subprocess.run(["kill", pid], capture_output=True)
-                        print(f"✅ Killed process {pid} using port 8001")
-            except:
-                pass
-
-            # Check and kill anything still using port 8002 (Gallery API Server)
-            try:
-                lsof_result = subprocess.run(
-                    ["lsof", "-t", "-i:8002"], capture_output=True, text=True
+            # Servers started from this toolkit are stopped by PID, waiting only as
+            # long as they take to exit
+            stopped = self._stop_tracked_servers()
+            for name in stopped:
+                print(f"✅ {name} stopped")
+            stopped_any = bool(stopped)
+
+            if not stopped:
+                # Servers started some other way aren't recorded; find them by name,
+                # all patterns in one pkill call
+                result = subprocess.run(
+                    [
+                        "pkill",
+                        "-f",
+                        r"Scripts/(face_api_server\.py|gallery_api_server\.py"
+                        r"|start_gallery_server\.sh|start_local_servers\.sh)"
+                        r"|python.*http\.server",
+                    ],
+                    capture_output=True,
                 )
-                if lsof_result.stdout.strip():
-                    pids = lsof_result.stdout.strip().split("\n")
-                    for pid in pids:
-                        subprocess.run(["kill", pid], capture_output=True)
-                        print(f"✅ Killed process {pid} using port 8002")
-            except:
-                pass
-
-            # Check results
-            stopped_any = False
-            if result1.returncode == 0:
-                print("✅ Face API Server stopped")
-                stopped_any = True
-            if result2.returncode == 0:
-                print("✅ Gallery Server stopped")
-                stopped_any = True
-            if result3.returncode == 0:
-                print("✅ HTTP Server stopped")
-                stopped_any = True
+                if result.returncode == 0:
+                    print("✅ Running servers stopped")
+                    stopped_any = True
+
+            # Safety net: anything else still holding a server port (8000 gallery web,
+            # 8001 face API, 8002 gallery API). Probing the ports first means lsof
+            # only runs when one of them is actually taken
+            ports = (8000, 8001, 8002)
+            if any(self._port_in_use(port) for port in ports):
+                for pid in self._free_ports(ports):
+                    print(f"✅ Killed process {pid} using a server port")
+                    stopped_any = True
 
             if not stopped_any:
                 print("ℹ️ No servers were running")
@@ -590,15 +1231,16 @@ class PhotoManager:
 
     def restart_gallery_server(self):
         """Restart all servers with gallery list rebuild."""
-        print("\n🔄 RESTART ALL SERVERS")
-        print("-" * 40)
-        print("This will:")
-        print("  • Stop any running servers")
-        print("  • Rebuild main gallery list (galleries.json)")
-        print("  • Restart Face API, Gallery API, and Gallery Web servers")
-        print("  • Refresh available galleries in web interface")
+        self._section(
+            "🔄 RESTART ALL SERVERS",
+            "This will:",
+            "  • Stop any running servers",
+            "  • Rebuild main gallery list (galleries.json)",
+            "  • Restart Face API, Gallery API, and Gallery Web servers",
+            "  • Refresh available galleries in web interface",
+        )
 
-        input("\nPress Enter to restart servers...")
+        self._input("\nPress Enter to restart servers...")
 
         try:
             # Stop any running servers using the stop function
@@ -610,56 +1252,37 @@ class PhotoManager:
             # Rebuild galleries list using the dedicated script
             print("🔨 Rebuilding main gallery list...")
 
-            # Run the standalone rebuild script
-            result = subprocess.run(
-                [
-                    "python3",
-                    str(self.base_dir / "Scripts" / "rebuild_galleries_json.py"),
-                ],
-                cwd=str(self.base_dir),
-                capture_output=False,
-            )
-
-            if result.returncode == 0:
+            if self.rebuild_galleries_json():
                 print("✅ Galleries list rebuilt successfully!")
             else:
                 print("❌ Failed to rebuild galleries list")
                 return
 
-            # Small delay to ensure cleanup
-            import time
-
-            time.sleep(1)
-
             # Start servers again
             print("🚀 Starting servers...")
 
             # Start Face API Server in background
             print("🚀 Starting Face API Server...")
-            face_api_process = subprocess.Popen(
-                [sys.executable, str(self.base_dir / "Scripts" / "face_api_server.py")],
-                cwd=str(self.base_dir),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            face_api_process = self._start_server(
+                "Face API Server",
+                "face_api_server.py",
+                [sys.executable, self._scripts["Scripts/face_api_server.py"]],
             )
 
             # Give face API server time to start
-            import time
-
             time.sleep(2)
-            print("✅ Face API Server started (PID: {})".format(face_api_process.pid))
+            print(f"✅ Face API Server started (PID: {face_api_process.pid})")
 
             # Start Gallery Server in background
             print("🚀 Starting Gallery Web Server...")
-            gallery_process = subprocess.Popen(
-                ["bash", str(self.base_dir / "Scripts" / "start_gallery_server.sh")],
-                cwd=str(self.base_dir),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+            gallery_process = self._start_server(
+                "Gallery Web Server",
+                "start_gallery_server.sh",
+                ["bash", self._scripts["Scripts/start_gallery_server.sh"]],
             )
 
             time.sleep(2)  # Give it time to start
-            print("✅ Gallery Web Server started (PID: {})".format(gallery_process.pid))
+            print(f"✅ Gallery Web Server started (PID: {gallery_process.pid})")
 
             print("\n🔄 Servers restarted successfully!")
             print("📱 Open: http://localhost:8000/index-display.html")
@@ -670,30 +1293,41 @@ class PhotoManager:
         except Exception as e:
             print(f"❌ Error during restart: {e}")
 
+    def rebuild_galleries_json(self):
+        """Rebuild JSON/galleries.json; returns whether it succeeded.
+
+        The rebuild only scans Hard Link Galleries, so it runs in this process
+        rather than starting another interpreter, unless legacy_rebuild is set.
+        """
+        script = self._scripts["Scripts/rebuild_galleries_json.py"]
+        if self.legacy_rebuild:
+            result = subprocess.run(["python3", script], cwd=str(self.base_dir))
+            return result.returncode == 0
+
+        if self._galleries_module is None:
+            spec = importlib.util.spec_from_file_location(
+                "rebuild_galleries_json", script
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._galleries_module = module
+        return self._galleries_module.rebuild_galleries_json(base_dir=self.base_dir)
+
     def quick_rebuild_galleries(self):
         """Quick rebuild of galleries.json without restarting servers."""
-        print("\n🔨 QUICK REBUILD GALLERIES LIST")
-        print("-" * 40)
-        print("This will:")
-        print("  • Scan Hard Link Galleries directory")
-        print("  • Rebuild galleries.json with current galleries")
-        print("  • Update web interface gallery list")
-        print("  • Keep servers running (no restart needed)")
+        self._section(
+            "🔨 QUICK REBUILD GALLERIES LIST",
+            "This will:",
+            "  • Scan Hard Link Galleries directory",
+            "  • Rebuild galleries.json with current galleries",
+            "  • Update web interface gallery list",
+            "  • Keep servers running (no restart needed)",
+        )
 
-        input("\nPress Enter to rebuild galleries list...")
+        self._input("\nPress Enter to rebuild galleries list...")
 
         try:
-            # Run the standalone rebuild script
-            result = subprocess.run(
-                [
-                    "python3",
-                    str(self.base_dir / "Scripts" / "rebuild_galleries_json.py"),
-                ],
-                cwd=str(self.base_dir),
-                capture_output=False,
-            )
-
-            if result.returncode == 0:
+            if self.rebuild_galleries_json():
                 print("\n🎉 Galleries list rebuilt successfully!")
                 print("💡 Refresh your browser to see updated gallery list")
             else:
@@ -704,96 +1338,226 @@ class PhotoManager:
         except Exception as e:
             print(f"❌ Error during rebuild: {e}")
 
+    def _stop_face_worker(self):
+        if self._face_worker is None:
+            return
+        worker, self._face_worker = self._face_worker, None
+        if worker.poll() is None:
+            worker.stdin.close()
+            try:
+                worker.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                worker.terminate()
+
+    def _face_rpc(self, args, capture=False):
+        """Run a face_recognizer_insightface.py command in the face worker.
+
+        The worker keeps InsightFace and its models loaded, so only the first face
+        action of a session pays for loading them. Returns whether it succeeded; with
+        capture, the command's output is returned instead of printed if it does.
+        """
+        if args != ["--stats"]:
+            self._face_stats_cache = None  # Anything else may change the people
+        if self._face_worker is None or self._face_worker.poll() is not None:
+            cmd = self.script_command(
+                "Scripts/face_recognizer_insightface.py", ["--daemon"]
+            )
+            if not cmd:
+                return False
+            self._face_worker = subprocess.Popen(
+                cmd,
+                cwd=str(self.base_dir),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                # Messages printed outside a command reach the terminal as they're
+                # printed, not when a pipe-sized buffer fills
+                env=dict(os.environ, PYTHONUNBUFFERED="1"),
+            )
+
+        print(f"🚀 Running: face_recognizer_insightface.py {' '.join(args)}")
+        try:
+            request = {"args": args, "capture": capture}
+            self._face_worker.stdin.write(json.dumps(request) + "\n")
+            self._face_worker.stdin.flush()
+            # Anything else on the worker's stdout (library messages while the
+            # models load) is passed through until the reply line
+            for line in self._face_worker.stdout:
+                if line.startswith('{"rc"'):
+                    reply = json.loads(line)
+                    if not capture:
+                        return reply["rc"] == 0
+                    if reply["rc"] == 0:
+                        return reply["output"]
+                    sys.stdout.write(reply["output"])
+                    return None
+                sys.stdout.write(line)
+        except KeyboardInterrupt:
+            self._stop_face_worker()
+            print("\n⚠️ Interrupted by user")
+            return False
+        except OSError:
+            pass
+        self._stop_face_worker()
+        print("❌ Face recognition worker stopped unexpectedly")
+        return False
+
+    def _face_stats(self, max_age=60):
+        """The people statistics table, reused while under max_age seconds old.
+
+        Any other face command drops it, so labels and clusters show up at once.
+        """
+        now = time.monotonic()
+        if self._face_stats_cache is None or now - self._face_stats_cache[0] >= max_age:
+            output = self._face_rpc(["--stats"], capture=True)
+            if not output:
+                return ""
+            self._face_stats_cache = (now, output)
+        return self._face_stats_cache[1]
+
     def face_recognition_menu(self):
         """Face recognition submenu."""
+        handlers = {
+            "1": self.face_extract_embeddings,
+            "2": self.face_cluster_full,
+            "3": self.face_cluster_new,
+            "4": self.face_clustering_settings,
+            "5": self.face_label_people,
+            "6": self.face_statistics,
+            "7": self.face_api_server,
+        }
         while True:
-            print("\n👥 FACE RECOGNITION")
-            print("-" * 40)
-            print("1. Extract Face Embeddings")
-            print("2. Cluster Faces (Full Reset)")
-            print("3. Add New Faces to Clusters")
-            print("4. ⚙️  Configure Clustering Settings")
-            print("5. Label People")
-            print("6. View Statistics")
-            print("7. Start Face API Server (standalone)")
-            print("8. Back to main menu")
-            print()
-            print("💡 Tip: Use 'Start Gallery Server' (main menu option 11)")
-            print("   to automatically start both servers together.")
-
-            choice = input("\nChoice (1-8): ").strip()
-
-            if choice == "1":
-                print("\n🔍 EXTRACT FACE EMBEDDINGS")
-                print("-" * 40)
-                limit = input(
-                    "Number of images to process (or Enter for all): "
-                ).strip()
-                if limit:
-                    try:
-                        int(limit)  # Validate it's a number
-                        args = ["--extract", limit]
-                    except ValueError:
-                        print("❌ Invalid number")
-                        continue
-                else:
-                    args = ["--extract"]
-                self.run_script("Scripts/face_recognizer_insightface.py", args)
-
-            elif choice == "2":
-                print("\n🧠 CLUSTER FACES (Full Reset)")
-                print("-" * 40)
-                print("⚠️  This will reset all existing face groupings!")
-                if input("Continue? (y/N): ").lower() == "y":
-                    args = ["--cluster"]
-                    self.run_script("Scripts/face_recognizer_insightface.py", args)
-                else:
-                    print("❌ Clustering cancelled")
+            sys.stdout.write(_FACE_MENU)
 
-            elif choice == "3":
-                print("\n🔄 ADD NEW FACES TO CLUSTERS")
-                print("-" * 40)
-                print(
-                    "This preserves existing labels and adds new faces to known people."
-                )
-                args = ["--cluster-new"]
-                self.run_script("Scripts/face_recognizer_insightface.py", args)
-
-            elif choice == "4":
-                self.face_clustering_settings()
-
-            elif choice == "5":
-                print("\n🏷️  LABEL PEOPLE")
-                print("-" * 40)
-                print("First, view statistics to see person IDs:")
-                self.run_script("Scripts/face_recognizer_insightface.py", ["--stats"])
-                print("\nEnter label command:")
-                person_id = input("Person ID: ").strip()
-                name = input("Person Name: ").strip()
-                if person_id and name:
-                    args = ["--label", person_id, name]
-                    self.run_script("Scripts/face_recognizer_insightface.py", args)
-                else:
-                    print("❌ Both Person ID and Name are required")
+            choice = self._menu_input("\nChoice (1-8): ", [*handlers, "8"])
+            if choice == "8":
+                break
+            handler = handlers.get(choice)
+            if handler:
+                handler()
+            else:
+                print("❌ Invalid choice. Please enter 1-8.")
 
-            elif choice == "6":
-                print("\n📊 FACE RECOGNITION STATISTICS")
-                print("-" * 40)
-                self.run_script("Scripts/face_recognizer_insightface.py", ["--stats"])
+    def face_extract_embeddings(self):
+        """Extract face embeddings, optionally from a limited number of images."""
+        self._section("🔍 EXTRACT FACE EMBEDDINGS")
+        limit = self._input(
+            "Number of images to process (or Enter for all): ", "limit"
+        ).strip()
+        if limit:
+            try:
+                int(limit)  # Validate it's a number
+                args = ["--extract", limit]
+            except ValueError:
+                print("❌ Invalid number")
+                return
+        else:
+            args = ["--extract"]
+        args += self.ask_face_device()
+        self._face_rpc(args)
 
-            elif choice == "7":
-                print("\n🌐 Starting Face API Server (standalone)...")
-                print("This enables face detection in the gallery viewer.")
-                print("Note: Gallery server must be started separately.")
-                print("Press Ctrl+C to stop the server.")
+    def cuda_available(self):
+        """Whether onnxruntime can run InsightFace on an NVIDIA GPU here.
+
+        Checked once, in the interpreter the scripts run with.
+        """
+        if self._cuda is None:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    "import onnxruntime; print('CUDAExecutionProvider' in "
+                    "onnxruntime.get_available_providers())",
+                ],
+                capture_output=True,
+                text=True,
+            )
+            self._cuda = result.stdout.strip() == "True"
+        return self._cuda
 
-                input("\nPress Enter to start...")
-                self.run_script("Scripts/face_api_server.py")
+    def ask_face_device(self):
+        """--device args for face extraction; only asks when a GPU can be used."""
+        if self.cuda_available() and self._yn(
+            "Use the GPU (CUDA) for face extraction? (Y/n): ", default=True, key="cuda"
+        ):
+            return ["--device", "cuda"]
+        return []
+
+    def face_cluster_full(self):
+        """Recluster all faces from scratch."""
+        self._section(
+            "🧠 CLUSTER FACES (Full Reset)",
+            "⚠️  This will reset all existing face groupings!",
+        )
+        if self._yn("Continue? (y/N): ", key="continue"):
+            args = ["--cluster"]
+            self._face_rpc(args)
+        else:
+            print("❌ Clustering cancelled")
 
-            elif choice == "8":
-                break
-            else:
-                print("❌ Invalid choice. Please enter 1-8.")
+    def face_cluster_new(self):
+        """Add new faces to the existing clusters."""
+        self._section(
+            "🔄 ADD NEW FACES TO CLUSTERS",
+            "This preserves existing labels and adds new faces to known people.",
+        )
+        args = ["--cluster-new"]
+        self._face_rpc(args)
+
+    def face_label_people(self):
+        """Give a person ID a name."""
+        self._section("🏷️  LABEL PEOPLE", "First, view statistics to see person IDs:")
+        sys.stdout.write(self._face_stats())
+        print("\nEnter label command:")
+        person_id = self._input("Person ID: ", "person_id").strip()
+        name = self._input("Person Name: ", "name").strip()
+        if person_id and name:
+            args = ["--label", person_id, name]
+            self._face_rpc(args)
+        else:
+            print("❌ Both Person ID and Name are required")
+
+    def face_statistics(self):
+        """Show face recognition statistics."""
+        self._section("📊 FACE RECOGNITION STATISTICS")
+        sys.stdout.write(self._face_stats(max_age=0))
+
+    def face_api_server(self):
+        """Run the face API server in the foreground."""
+        print("\n🌐 Starting Face API Server (standalone)...")
+        print("This enables face detection in the gallery viewer.")
+        print("Note: Gallery server must be started separately.")
+        print("Press Ctrl+C to stop the server.")
+
+        self._input("\nPress Enter to start...")
+        self.run_script("Scripts/face_api_server.py")
+
+    def _face_settings_file(self):
+        # Also read by face_recognizer_insightface.py for its option defaults
+        return self.base_dir / "JSON" / "face_clustering.json"
+
+    def _load_face_settings(self):
+        """Saved face clustering settings over the script's own defaults."""
+        settings = {
+            "eps": 0.38,
+            "min_samples": 16,
+            "similarity_threshold": 0.6,
+            "min_samples_new": 30,
+            "max_iterations": 10,
+        }
+        try:
+            with open(self._face_settings_file()) as f:
+                settings.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+        return settings
+
+    def _save_face_settings(self, settings):
+        settings_file = self._face_settings_file()
+        tmp_file = settings_file.with_name(settings_file.name + ".tmp")
+        with open(tmp_file, "w") as f:
+            json.dump(settings, f, indent=2)
+        os.replace(tmp_file, settings_file)
 
     def face_clustering_settings(self):
         """Interactive configuration of face clustering parameters."""
@@ -802,21 +1566,11 @@ class PhotoManager:
         print("Configure parameters for face recognition clustering")
         print()
 
-        # Load current defaults from script
-        current_settings = {
-            "eps": 0.38,
-            "min_samples": 16,
-            "similarity_threshold": 0.6,
-            "min_samples_new": 30,
-            "max_iterations": 10,
-        }
+        current_settings = self._load_face_settings()
 
         print("📋 CURRENT SETTINGS:")
-        print(f"  • Clustering Sensitivity (eps): {current_settings['eps']}")
-        print(f"  • Min Samples per Person: {current_settings['min_samples']}")
-        print(f"  • Similarity Threshold: {current_settings['similarity_threshold']}")
-        print(f"  • Min Faces for New People: {current_settings['min_samples_new']}")
-        print(f"  • Max Iterations: {current_settings['max_iterations']}")
+        for key, label in _SETTING_LABELS.items():
+            print(f"  • {label}: {current_settings[key]}")
         print()
 
         # Interactive configuration
@@ -876,7 +1630,7 @@ class PhotoManager:
         for key, value in new_settings.items():
             old_value = current_settings[key]
             change = "→" if value != old_value else "✓"
-            print(f"  • {key.replace('_', ' ').title()}: {old_value} {change} {value}")
+            print(f"  • {_SETTING_LABELS[key]}: {old_value} {change} {value}")
 
         print("\n🚀 APPLY SETTINGS:")
         print("1. Test with current cluster operation")
@@ -895,99 +1649,120 @@ class PhotoManager:
                 "--min-samples",
                 str(new_settings["min_samples"]),
             ]
-            print(f"Running: face_recognizer_insightface.py {' '.join(args)}")
-            self.run_script("Scripts/face_recognizer_insightface.py", args)
+            self._face_rpc(args)
 
         elif choice == "2":
-            print("💾 Settings saved! (Feature coming in Phase 2)")
-            print("For now, remember these values for manual use.")
+            try:
+                self._save_face_settings({**current_settings, **new_settings})
+                print("💾 Settings saved to JSON/face_clustering.json")
+                print("Face clustering will use them from now on.")
+            except OSError as e:
+                print(f"❌ Error saving settings: {e}")
 
         elif choice == "3":
             print("❌ Settings cancelled")
 
         input("\nPress Enter to continue...")
 
-    def prompt_float_parameter(self, prompt, current_value, min_val, max_val):
-        """Prompt for a float parameter with validation."""
+    def _prompt_number(self, prompt, current_value, min_val, max_val, convert, invalid):
+        """Prompt until the answer converts and is in range; Enter keeps current_value."""
+        question = f"{prompt} [{current_value}]: "
+        out_of_range = f"❌ Value must be between {min_val} and {max_val}"
         while True:
+            response = input(question).strip()
+            if not response:
+                return current_value
             try:
-                response = input(f"{prompt} [{current_value}]: ").strip()
-                if not response:
-                    return current_value
-
-                value = float(response)
-                if min_val <= value <= max_val:
-                    return value
-                else:
-                    print(f"❌ Value must be between {min_val} and {max_val}")
-
+                value = convert(response)
             except ValueError:
-                print("❌ Please enter a valid number")
+                print(invalid)
+                continue
+            if min_val <= value <= max_val:
+                return value
+            print(out_of_range)
+
+    def prompt_float_parameter(self, prompt, current_value, min_val, max_val):
+        """Prompt for a float parameter with validation."""
+        return self._prompt_number(
+            prompt,
+            current_value,
+            min_val,
+            max_val,
+            float,
+            "❌ Please enter a valid number",
+        )
 
     def prompt_int_parameter(self, prompt, current_value, min_val, max_val):
         """Prompt for an integer parameter with validation."""
-        while True:
-            try:
-                response = input(f"{prompt} [{current_value}]: ").strip()
-                if not response:
-                    return current_value
-
-                value = int(response)
-                if min_val <= value <= max_val:
-                    return value
-                else:
-                    print(f"❌ Value must be between {min_val} and {max_val}")
-
-            except ValueError:
-                print("❌ Please enter a valid integer")
+        return self._prompt_number(
+            prompt,
+            current_value,
+            min_val,
+            max_val,
+            int,
+            "❌ Please enter a valid integer",
+        )
 
     def database_debug(self):
         """Database debugging and inspection."""
-        print("\n🔍 DATABASE DEBUG")
-        print("-" * 40)
-        print("This will show database statistics and help diagnose issues.")
+        self._section(
+            "🔍 DATABASE DEBUG",
+            "This will show database statistics and help diagnose issues.",
+        )
 
         self.run_script("Scripts/debug_db.py")
 
     def database_cleanup(self):
         """Database cleanup and maintenance."""
-        print("\n🛠️ DATABASE CLEANUP")
-        print("-" * 40)
-        print("This will help maintain your database by:")
-        print("  • Removing entries for deleted files")
-        print("  • Analyzing RAW file entries")
-        print("  • Optimizing database storage")
-        print("  • Providing detailed statistics")
-
-        input("\nPress Enter to start database maintenance...")
+        self._section(
+            "🛠️ DATABASE CLEANUP",
+            "This will help maintain your database by:",
+            "  • Removing entries for deleted files",
+            "  • Analyzing RAW file entries",
+            "  • Optimizing database storage",
+            "  • Providing detailed statistics",
+        )
+
+        self._input("\nPress Enter to start database maintenance...")
         self.run_script("Scripts/cleanup_database.py", ["--interactive"])
 
     def delete_culled(self):
         """Delete images marked as culled."""
-        print("\n🗑️ DELETE CULLED IMAGES")
-        print("-" * 40)
-        print("This will delete images by database ID from delete_list.json")
-        print("⚠️ WARNING: This action cannot be undone!")
-        print("Features:")
-        print("  • Works with RAW files and adjacent JPGs")
-        print("  • Removes from galleries and master location")
-        print("  • Cleans up proxy files")
-        print("  • Uses reliable database ID tracking")
+        self._section(
+            "🗑️ DELETE CULLED IMAGES",
+            "This will delete images by database ID from delete_list.json",
+            "⚠️ WARNING: This action cannot be undone!",
+            "Features:",
+            "  • Works with RAW files and adjacent JPGs",
+            "  • Removes from galleries and master location",
+            "  • Cleans up proxy files",
+            "  • Uses reliable database ID tracking",
+        )
 
-        if input("\nAre you absolutely sure? (y/N): ").lower().startswith("y"):
+        if self._yn("\nAre you absolutely sure? (y/N): "):
             self.run_script("Scripts/delete_all_culled_by_id.py")
         else:
             print("❌ Cancelled - no files deleted")
 
+    @staticmethod
+    def _fast_rmtree(path):
+        """Remove a directory tree, with rm -rf (it walks the tree in C) if present."""
+        rm = shutil.which("rm")
+        if rm:
+            subprocess.run([rm, "-rf", "--", str(path)], check=True)
+        else:
+            shutil.rmtree(path)
+
     def delete_galleries(self):
         """Delete galleries and update galleries.json."""
-        import json
-        import shutil
-        
-        print("\n🗂️ DELETE GALLERIES")
-        print("-" * 40)
-        print("This allows you to delete gallery folders and update the galleries list.")
-        print("⚠️ WARNING: This action cannot be undone!")
+        self._section(
+            "🗂️ DELETE GALLERIES",
+            "This allows you to delete gallery folders and update the galleries list.",
+        )
+        if send2trash:
+            print("⚠️ WARNING: Galleries not moved to the Trash can't be restored!")
+        else:
+            print("⚠️ WARNING: This action cannot be undone!")
         print("Features:")
         print("  • Removes hard link gallery folders completely")
         print("  • Updates JSON/galleries.json automatically")  
@@ -997,12 +1772,12 @@ class PhotoManager:
         
         # Load galleries list
         try:
-            with open(galleries_json_path, 'r') as f:
-                galleries = json.load(f)
+            data = galleries_json_path.read_bytes()
+            galleries = orjson.loads(data) if orjson else json.loads(data)
         except FileNotFoundError:
             print("❌ No galleries.json found. Run gallery server first.")
             return
-        except json.JSONDecodeError:
+        except ValueError:
             print("❌ Invalid galleries.json file.")
             return
             
@@ -1010,15 +1785,45 @@ class PhotoManager:
             print("📭 No galleries found.")
             return
             
-        print(f"\n📋 Found {len(galleries)} galleries:")
-        for i, gallery in enumerate(galleries, 1):
-            gallery_path = self.base_dir / gallery['jsonPath'].replace('/image_data.json', '')
-            size = f"({gallery['imageCount']} images)" if gallery['imageCount'] > 0 else "(empty)"
-            exists = "✅" if gallery_path.exists() else "❌ Missing"
-            print(f"  {i:2d}. {gallery['name']} {size} {exists}")
+        # Only the galleries matching the filter are listed and can be selected
+        name_filter = input("Filter by name (Enter for all): ").strip().lower()
+        view = [i for i, g in enumerate(galleries) if name_filter in g['name'].lower()]
+        if not view:
+            print(f"📭 No galleries match '{name_filter}'.")
+            return
+        # Folder of each listed gallery, relative to the base directory
+        folders = {i: galleries[i]['jsonPath'].replace('/image_data.json', '') for i in view}
+            
+        # Which gallery folders exist, from one listing of each parent folder (normally
+        # just Hard Link Galleries) rather than a stat per gallery
+        existing = set()
+        for parent in set(map(os.path.dirname, folders.values())):
+            try:
+                with os.scandir(self.base_dir / parent) as entries:
+                    existing.update(f"{parent}/{e.name}" for e in entries if e.is_dir())
+            except OSError:
+                pass
+        
+        # Listed a page at a time; the selection can be typed at any page
+        print(f"\n📋 Found {len(view)} galleries:")
+        selection = None
+        for start in range(0, len(view), self._GALLERY_PAGE):
+            for i in view[start:start + self._GALLERY_PAGE]:
+                gallery = galleries[i]
+                size = f"({gallery['imageCount']} images)" if gallery['imageCount'] > 0 else "(empty)"
+                exists = "✅" if folders[i] in existing else "❌ Missing"
+                print(f"  {i + 1:2d}. {gallery['name']} {size} {exists}")
+            if start + self._GALLERY_PAGE < len(view):
+                answer = input("Enter = next page, q = stop listing, or type the selection now: ").strip()
+                if answer.lower() == 'q':
+                    break
+                if answer:
+                    selection = answer
+                    break
         
-        print("\nEnter gallery numbers to delete (comma-separated, or 'all'):")
-        selection = input("Galleries to delete: ").strip()
+        if selection is None:
+            print("\nEnter gallery numbers to delete (e.g. 1,3,5-8, or 'all'):")
+            selection = input("Galleries to delete: ").strip()
         
         if not selection:
             print("❌ No selection made.")
@@ -1027,15 +1832,17 @@ class PhotoManager:
         galleries_to_delete = []
         
         if selection.lower() == 'all':
-            if input(f"\n⚠️ Delete ALL {len(galleries)} galleries? (y/N): ").lower().startswith('y'):
-                galleries_to_delete = list(range(len(galleries)))
+            if self._yn(f"\n⚠️ Delete ALL {len(view)} galleries listed? (y/N): "):
+                galleries_to_delete = view
+        elif _SELECTION_RE.match(selection):
+            for part in selection.split(','):
+                first, _, last = part.partition('-')
+                start, stop = int(first) - 1, int(last or first)
+                galleries_to_delete.extend(i for i in view if start <= i < stop)
+            galleries_to_delete = list(dict.fromkeys(galleries_to_delete))  # Each once
         else:
-            try:
-                indices = [int(x.strip()) - 1 for x in selection.split(',')]
-                galleries_to_delete = [i for i in indices if 0 <= i < len(galleries)]
-            except ValueError:
-                print("❌ Invalid input. Please enter numbers separated by commas.")
-                return
+            print("❌ Invalid input. Please enter numbers or ranges, like 1,3,5-8.")
+            return
         
         if not galleries_to_delete:
             print("❌ No valid galleries selected.")
@@ -1046,34 +1853,50 @@ class PhotoManager:
         for i in galleries_to_delete:
             print(f"  • {galleries[i]['name']} ({galleries[i]['imageCount']} images)")
         
+        to_trash = send2trash is not None and self._yn(
+            "\n🗑️ Move to Trash instead of deleting? (Y/n): ", default=True
+        )
+        remove = (lambda path: send2trash(str(path))) if to_trash else self._fast_rmtree
+        done = "Trashed" if to_trash else "Deleted"
+        
         if not input(f"\nType 'DELETE' to confirm: ").strip() == 'DELETE':
             print("❌ Cancelled - no galleries deleted")
             return
             
-        # Delete galleries
-        deleted_count = 0
-        remaining_galleries = []
+        # Delete galleries; removing each tree is I/O bound, so several go at once
+        def remove_gallery(i):
+            path = self.base_dir / folders[i]
+            if folders[i] not in existing or not path.exists():
+                return False  # Missing, or removed since the listing
+            remove(path)
+            return True
         
-        for i, gallery in enumerate(galleries):
-            if i in galleries_to_delete:
-                gallery_path = self.base_dir / gallery['jsonPath'].replace('/image_data.json', '')
+        deleted_count = 0
+        with ThreadPoolExecutor(max_workers=min(8, len(galleries_to_delete))) as pool:
+            futures = [pool.submit(remove_gallery, i) for i in galleries_to_delete]
+            for i, future in zip(galleries_to_delete, futures):
+                gallery = galleries[i]
                 try:
-                    if gallery_path.exists():
-                        shutil.rmtree(gallery_path)
-                        print(f"✅ Deleted: {gallery['name']}")
-                        deleted_count += 1
+                    if future.result():
+                        print(f"✅ {done}: {gallery['name']}")
                     else:
                         print(f"⚠️ Already gone: {gallery['name']}")
-                        deleted_count += 1
+                    deleted_count += 1
                 except Exception as e:
                     print(f"❌ Failed to delete {gallery['name']}: {e}")
-            else:
-                remaining_galleries.append(gallery)
         
-        # Update galleries.json
+        selected = set(galleries_to_delete)
+        remaining_galleries = [g for i, g in enumerate(galleries) if i not in selected]
+        
+        # Update galleries.json, replacing it in one step so it's never half-written
         try:
-            with open(galleries_json_path, 'w') as f:
-                json.dump(remaining_galleries, f, indent=2)
+            if orjson:
+                data = orjson.dumps(remaining_galleries, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(remaining_galleries, indent=2).encode()
+            tmp_file = galleries_json_path.with_name(galleries_json_path.name + ".tmp")
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, galleries_json_path)
             print(f"\n✅ Updated galleries.json ({len(remaining_galleries)} remaining)")
         except Exception as e:
             print(f"❌ Failed to update galleries.json: {e}")
@@ -1084,16 +1907,17 @@ class PhotoManager:
 
     def install_dependencies(self):
         """Install complete toolkit dependencies including RAW support."""
-        print("\n⚙️ INSTALL DEPENDENCIES")
-        print("-" * 40)
-        print("This will install all dependencies for the photo management toolkit:")
-        print("  • Python packages (PIL, SQLite, NumPy)")
-        print("  • Image processing tools (exiftool, ImageMagick)")
-        print("  • RAW processing tools (RawTherapee CLI)")
-        print("  • Face detection dependencies (OpenCV, dlib, MediaPipe, InsightFace)")
-        print("\nNote: Requires MacPorts and sudo access. May take several minutes.")
-
-        if input("\nProceed with installation? (y/N): ").lower().startswith("y"):
+        self._section(
+            "⚙️ INSTALL DEPENDENCIES",
+            "This will install all dependencies for the photo management toolkit:",
+            "  • Python packages (PIL, SQLite, NumPy)",
+            "  • Image processing tools (exiftool, ImageMagick)",
+            "  • RAW processing tools (RawTherapee CLI)",
+            "  • Face detection dependencies (OpenCV, dlib, MediaPipe, InsightFace)",
+            "\nNote: Requires MacPorts and sudo access. May take several minutes.",
+        )
+
+        if self._yn("\nProceed with installation? (y/N): "):
             self.run_script(
                 "Scripts/install_dependencies_macports_smart.sh", is_python=False
             )
@@ -1102,80 +1926,69 @@ class PhotoManager:
 
     def show_quick_start(self):
         """Show quick start guide."""
-        print("\n🚀 QUICK START GUIDE")
-        print("-" * 40)
-        print("For new users, follow these steps:")
-        print()
-        print("1. Setup Database (option 2)")
-        print("2. Extract Metadata from 'Master Photo Library' (option 1)")
-        print("3. Create a Virtual Gallery (option 3)")
-        print("4. Start Gallery Server to view photos (option 11)")
-        print()
-        print("Optional:")
-        print("• Install Dependencies for face detection (option 19)")
-        print("• Run Face Recognition to detect people (option 15)")
-        print("• Quick rebuild galleries list when needed (option 14)")
-        print()
-        input("Press Enter to return to main menu...")
+        self._section(
+            "🚀 QUICK START GUIDE",
+            "For new users, follow these steps:",
+            "",
+            "1. Setup Database (option 2)",
+            "2. Extract Metadata from 'Master Photo Library' (option 1)",
+            "3. Create a Virtual Gallery (option 3)",
+            "4. Start Gallery Server to view photos (option 11)",
+            "",
+            "Optional:",
+            "• Install Dependencies for face detection (option 20)",
+            "• Run Face Recognition to detect people (option 15)",
+            "• Quick rebuild galleries list when needed (option 14)",
+            "",
+        )
+        self._input("Press Enter to return to main menu...")
+
+    def run_config(self):
+        """Run the config's actions in order without prompting.
+
+        Returns False if an action isn't one that can run unattended.
+        """
+        actions = self.config.get("actions", [])
+        unknown = [action for action in actions if action not in HEADLESS_ACTIONS]
+        if unknown:
+            print(f"❌ Can't run from a config: {', '.join(unknown)}")
+            print(f"   Available: {', '.join(HEADLESS_ACTIONS)}")
+            return False
+        for action in actions:
+            self._action = action
+            getattr(self, action)()
+        return True
 
     def run(self):
         """Main program loop."""
         # Show quick start on first run
-        if input("Show quick start guide? (Y/n): ").lower() not in ["n", "no"]:
+        if self._yn("Show quick start guide? (Y/n): ", default=True):
             self.show_quick_start()
 
         while True:
             try:
                 self.show_main_menu()
-                choice = input("\nEnter choice (1-20): ").strip()
-
-                if choice == "1":
-                    self.extract_metadata()
-                elif choice == "2":
-                    self.setup_database()
-                elif choice == "3":
-                    self.create_gallery()
-                elif choice == "4":
-                    self.rebuild_gallery_json()
-                elif choice == "5":
-                    self.generate_thumbnails()
-                elif choice == "6":
-                    self.generate_heic_proxies()
-                elif choice == "7":
-                    self.generate_raw_proxies()
-                elif choice == "8":
-                    self.generate_video_proxies()
-                elif choice == "9":
-                    self.regenerate_raw_picks()
-                elif choice == "10":
-                    self.process_new_images()
-                elif choice == "11":
-                    self.start_gallery_server()
-                elif choice == "12":
-                    self.stop_gallery_server()
-                elif choice == "13":
-                    self.restart_gallery_server()
-                elif choice == "14":
-                    self.quick_rebuild_galleries()
-                elif choice == "15":
-                    self.face_recognition_menu()
-                elif choice == "16":
-                    self.database_debug()
-                elif choice == "17":
-                    self.database_cleanup()
-                elif choice == "18":
-                    self.delete_culled()
-                elif choice == "19":
-                    self.delete_galleries()
-                elif choice == "20":
-                    self.install_dependencies()
-                elif choice == "21":
+                choice = self._menu_input(
+                    f"\nEnter choice (1-{EXIT_CHOICE}): ",
+                    [str(n) for n in range(1, EXIT_CHOICE + 1)],
+                )
+                try:
+                    number = int(choice)
+                except ValueError:
+                    number = 0
+
+                if number == EXIT_CHOICE:
                     print("\n👋 Goodbye!")
                     break
+                handler = (
+                    self._actions[number - 1] if 0 < number < EXIT_CHOICE else None
+                )
+                if handler:
+                    handler()
                 else:
-                    print("❌ Invalid choice. Please enter 1-21.")
+                    print(f"❌ Invalid choice. Please enter 1-{EXIT_CHOICE}.")
 
-                if choice != "20":
+                if handler != self.install_dependencies:
                     input("\nPress Enter to continue...")
 
             except KeyboardInterrupt:
@@ -1187,5 +2000,23 @@ class PhotoManager:
 
 
 if __name__ == "__main__":
-    manager = PhotoManager()
+    parser = argparse.ArgumentParser(description="Photo Management Toolkit")
+    parser.add_argument(
+        "--config", help="JSON file of actions and answers to run without prompts"
+    )
+    parser.add_argument(
+        "--legacy-rebuild",
+        action="store_true",
+        help="Rebuild galleries.json in a separate process, as older versions did",
+    )
+    cli_args = parser.parse_args()
+
+    if cli_args.config:
+        with open(cli_args.config) as f:
+            manager = PhotoManager(
+                config=json.load(f), legacy_rebuild=cli_args.legacy_rebuild
+            )
+        sys.exit(0 if manager.run_config() else 1)
+
+    manager = PhotoManager(legacy_rebuild=cli_args.legacy_rebuild)
     manager.run()